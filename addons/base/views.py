@@ -18,6 +18,7 @@ from elasticsearch8 import exceptions as es_exceptions
 from rest_framework import status as http_status
 
 from api.caching.tasks import update_storage_usage_with_size
+from api.caching.utils import get_waterbutler_config_key, get_waterbutler_permission_key, waterbutler_auth_cache
 
 from addons.base import exceptions as addon_errors
 from addons.base.models import BaseStorageAddon
@@ -296,14 +297,32 @@ def _check_resource_permissions(resource, auth, action):
     """Check if the user has the required permission on the resource."""
     required_permission = _get_permission_for_action(action)
     _confirm_token_scope(resource, required_permission)
+    has_resource_permissions = _has_resource_permission(resource, auth, required_permission)
+
+    if not (has_resource_permissions or _check_hierarchical_permissions(resource, auth, action)):
+        raise HTTPError(http_status.HTTP_403_FORBIDDEN)
+    return True
+
+
+def _has_resource_permission(resource, auth, required_permission):
+    """Check the user's own permission on the resource, reusing a recent positive answer.
+    Only grants are cached, and never for view-only links; see `forget_waterbutler_auth`
+    for what drops them early.
+    """
+    key = None
+    if settings.WATERBUTLER_AUTH_CACHE_TIMEOUT and not auth.private_key:
+        key = get_waterbutler_permission_key(resource, auth.user, required_permission)
+        if waterbutler_auth_cache.get(key):
+            return True
+
     if required_permission == permissions.READ:
         has_resource_permissions = resource.can_view_files(auth=auth)
     else:
         has_resource_permissions = resource.can_edit(auth=auth)
 
-    if not (has_resource_permissions or _check_hierarchical_permissions(resource, auth, action)):
-        raise HTTPError(http_status.HTTP_403_FORBIDDEN)
-    return True
+    if has_resource_permissions and key:
+        waterbutler_auth_cache.set(key, True, settings.WATERBUTLER_AUTH_CACHE_TIMEOUT)
+    return has_resource_permissions
 
 
 def _get_permission_for_action(action):
@@ -336,7 +355,7 @@ def _get_token_scopes_from_cas(auth_header):
     client = cas.get_client()
     try:
         access_token = cas.parse_auth_header(auth_header)
-        cas_resp = client.profile(access_token)
+        cas_resp = cas.get_cached_profile(client, access_token)
     except cas.CasError as e:
         sentry.log_exception(e)
         raise HTTPError(http_status.HTTP_403_FORBIDDEN)
@@ -377,7 +396,7 @@ def _check_hierarchical_permissions(resource, auth, action):
 
 def _get_waterbutler_configs(resource, provider_name, file_version):
     try:
-        addon_settings = resource.serialize_waterbutler_settings(provider_name)
+        addon_settings = _serialize_waterbutler_config(resource, provider_name, 'settings')
     except AttributeError:  # No addon configured on resource for provider
         raise HTTPError(http_status.HTTP_400_BAD_REQUEST, 'Requested Provider unavailable')
     if file_version:
@@ -385,11 +404,27 @@ def _get_waterbutler_configs(resource, provider_name, file_version):
         addon_credentials = file_version.region.waterbutler_credentials
         addon_settings.update(file_version.region.waterbutler_settings)
     else:
-        addon_credentials = resource.serialize_waterbutler_credentials(provider_name)
+        addon_credentials = _serialize_waterbutler_config(resource, provider_name, 'credentials')
 
     return addon_settings, addon_credentials
 
 
+def _serialize_waterbutler_config(resource, provider_name, name):
+    """Call `serialize_waterbutler_settings` or `serialize_waterbutler_credentials` on the resource.
+    osfstorage results are cached; other providers may refresh their credentials at any time.
+    """
+    serialize = getattr(resource, f'serialize_waterbutler_{name}')
+    if not (settings.WATERBUTLER_AUTH_CACHE_TIMEOUT and provider_name == 'osfstorage'):
+        return serialize(provider_name)
+
+    key = get_waterbutler_config_key(resource, provider_name, name)
+    config = waterbutler_auth_cache.get(key)
+    if config is None:
+        config = serialize(provider_name)
+        waterbutler_auth_cache.set(key, config, settings.WATERBUTLER_AUTH_CACHE_TIMEOUT)
+    return config
+
+
 def _get_osfstorage_file_version_and_node(
     file_path: str,
     file_version_id: str = None
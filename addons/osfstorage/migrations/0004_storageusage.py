@@ -0,0 +1,33 @@
+# Generated by Django 4.2.26 on 2026-10-16 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+import osf.utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('addons_osfstorage', '0003_alter_nodesettings_owner_alter_usersettings_owner'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorageUsage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('target_object_id', models.PositiveIntegerField()),
+                ('total_size', models.BigIntegerField(default=0)),
+                ('reconciled', osf.utils.fields.NonNaiveDateTimeField(blank=True, null=True)),
+                ('region', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='addons_osfstorage.region')),
+                ('target_content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'unique_together': {('target_content_type', 'target_object_id', 'region')},
+            },
+        ),
+    ]
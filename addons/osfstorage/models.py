@@ -1,18 +1,24 @@
 import logging
 
 from django.apps import apps
-from django.db import models, connection
+from django.db import models, connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
 from psycopg2._psycopg import AsIs
 
 from addons.base.models import BaseNodeSettings, BaseStorageAddon, BaseUserSettings
-from osf.utils.fields import EncryptedJSONField
+from osf.utils.fields import EncryptedJSONField, NonNaiveDateTimeField
 from osf.utils.datetime_aware_jsonfield import DateTimeAwareJSONField
 from osf.exceptions import InvalidTagError, TagNotFoundError
 from framework.auth.core import Auth
 from osf.models.mixins import Loggable
 from osf.models import AbstractNode
-from osf.models.files import File, FileVersion, Folder, TrashedFileNode, BaseFileNode, BaseFileNodeManager
+from osf.models.base import BaseModel
+from osf.models.files import File, FileVersion, Folder, TrashedFileNode, BaseFileNode, BaseFileNodeManager, BaseFileVersionsThrough
 from osf.utils import permissions
 from website.files import exceptions
 from website.files import utils as files_utils
@@ -39,6 +45,17 @@ class OsfStorageFileNode(BaseFileNode):
 
     @property
     def materialized_path(self):
+        # Rows saved before the path was stored have it blank until backfill_osfstorage_paths runs
+        if self._materialized_path:
+            return self._materialized_path
+        return self._compute_materialized_path()
+
+    @materialized_path.setter
+    def materialized_path(self, val):
+        # raise Exception('Cannot set materialized path on OSFStorage as it is computed.')
+        logger.warning('Cannot set materialized path on OSFStorage because it\'s computed.')
+
+    def _compute_materialized_path(self):
         sql = """
             WITH RECURSIVE materialized_path_cte(parent_id, GEN_PATH) AS (
               SELECT
@@ -70,10 +87,10 @@ class OsfStorageFileNode(BaseFileNode):
                 path = path + '/'
             return path
 
-    @materialized_path.setter
-    def materialized_path(self, val):
-        # raise Exception('Cannot set materialized path on OSFStorage as it is computed.')
-        logger.warning('Cannot set materialized path on OSFStorage because it\'s computed.')
+    def _get_materialized_path_from_parent(self):
+        if self.parent_id is None:
+            return None if self.is_file else '/'
+        return self.parent.materialized_path + self.name + ('' if self.is_file else '/')
 
     @classmethod
     def get(cls, _id, target):
@@ -222,7 +239,7 @@ class OsfStorageFileNode(BaseFileNode):
 
     def save(self):
         self._path = ''
-        self._materialized_path = ''
+        self._materialized_path = self._get_materialized_path_from_parent()
         return super().save()
 
 
@@ -323,8 +340,21 @@ class OsfStorageFile(OsfStorageFileNode, File):
     def update_region_from_latest_version(self, destination_parent):
         most_recent_fileversion = self.versions.select_related('region').order_by('-created').first()
         if most_recent_fileversion and most_recent_fileversion.region != destination_parent.target.osfstorage_region:
+            previous_region_id = most_recent_fileversion.region_id
             most_recent_fileversion.region = destination_parent.target.osfstorage_region
             most_recent_fileversion.save()
+            if website_settings.ENABLE_STORAGE_USAGE_LEDGER and not self.deleted_on:
+                size = most_recent_fileversion.size or 0
+                StorageUsage.objects.record(self.target_content_type_id, self.target_object_id, previous_region_id, -size)
+                StorageUsage.objects.record(self.target_content_type_id, self.target_object_id, most_recent_fileversion.region_id, size)
+
+    def _update_node(self, recursive=True, save=True):
+        previous_target = (self.target_content_type_id, self.target_object_id)
+        super()._update_node(recursive=recursive, save=save)
+        current_target = (self.target_content_type_id, self.target_object_id)
+        if website_settings.ENABLE_STORAGE_USAGE_LEDGER and self.is_file and previous_target != current_target and not self.deleted_on:
+            StorageUsage.objects.record_file(self, sign=-1, target=previous_target)
+            StorageUsage.objects.record_file(self, target=current_target)
 
     def create_version(self, creator, location, metadata=None):
         latest_version = self.get_version()
@@ -427,6 +457,8 @@ class OsfStorageFile(OsfStorageFileNode, File):
 
     def delete(self, user=None, **kwargs):
         ret = super().delete(user, **kwargs)
+        if website_settings.ENABLE_STORAGE_USAGE_LEDGER:
+            StorageUsage.objects.record_file(self, sign=-1)
         self.update_search()
         return ret
 
@@ -519,6 +551,118 @@ class Region(models.Model):
         unique_together = ('_id', 'name')
 
 
+class StorageUsageQuerySet(models.QuerySet):
+
+    def for_target(self, target):
+        return self.filter(
+            target_content_type=ContentType.objects.get_for_model(target),
+            target_object_id=target.pk,
+        )
+
+    def total_for_target(self, target):
+        """Total osfstorage usage of a target in bytes, across regions, or None if the target
+        has not been reconciled into the ledger yet.
+        """
+        totals = self.for_target(target).aggregate(total=Sum('total_size'), regions=Count('id'))
+        if not totals['regions']:
+            return None
+        return max(totals['total'], 0)
+
+    def record(self, target_content_type_id, target_object_id, region_id, size):
+        """Apply a change of `size` bytes to a target's usage in a region. Targets are only
+        tracked once they have been reconciled; changes to untracked targets are dropped.
+        """
+        if not size:
+            return
+        rows = self.filter(target_content_type_id=target_content_type_id, target_object_id=target_object_id)
+        updated = rows.filter(region_id=region_id).update(total_size=F('total_size') + size, modified=timezone.now())
+        if not updated and rows.exists():
+            usage, _ = self.get_or_create(
+                target_content_type_id=target_content_type_id,
+                target_object_id=target_object_id,
+                region_id=region_id,
+            )
+            self.filter(id=usage.id).update(total_size=F('total_size') + size, modified=timezone.now())
+
+    def record_file(self, file_node, sign=1, target=None):
+        """Add (or, with `sign=-1`, remove) every version of a file to its target's usage.
+
+        :param tuple target: (content type id, object id) to record against, if not the file's current target
+        """
+        target_content_type_id, target_object_id = target or (file_node.target_content_type_id, file_node.target_object_id)
+        region_sizes = BaseFileVersionsThrough.objects.filter(
+            basefilenode=file_node,
+        ).values('fileversion__region_id').annotate(size=Sum('fileversion__size'))
+        for region_size in region_sizes:
+            self.record(target_content_type_id, target_object_id, region_size['fileversion__region_id'], sign * (region_size['size'] or 0))
+
+    def reconcile(self, target):
+        """Recompute a target's usage per region from its file versions and store it,
+        starting to track the target if it was not tracked yet.
+        """
+        from api.caching.tasks import compute_storage_usage_by_region
+
+        usage_by_region = compute_storage_usage_by_region(target)
+        content_type = ContentType.objects.get_for_model(target)
+        with transaction.atomic():
+            existing = {
+                usage.region_id: usage
+                for usage in self.select_for_update().filter(target_content_type=content_type, target_object_id=target.pk)
+            }
+            # Always keep a row for the target's own region so it reads as tracked even without files
+            region_ids = set(existing) | set(usage_by_region)
+            if not region_ids:
+                node_settings = target.get_addon('osfstorage') if hasattr(target, 'get_addon') else None
+                region_ids.add(node_settings.region_id if node_settings else None)
+            for region_id in region_ids:
+                total_size = usage_by_region.get(region_id, 0)
+                usage = existing.get(region_id)
+                if usage is None:
+                    usage = self.model(target_content_type=content_type, target_object_id=target.pk, region_id=region_id)
+                usage.total_size = total_size
+                usage.reconciled = timezone.now()
+                usage.save()
+        return sum(usage_by_region.values())
+
+
+class StorageUsage(BaseModel):
+    """Running total of osfstorage bytes used by a target in a region.
+
+    Kept up to date as file versions are added and as files are deleted, restored or moved
+    between targets, so storage limit checks don't need to recount every file version. The
+    `reconcile_storage_usage` management command recomputes the totals from scratch and is
+    what starts tracking a target.
+    """
+    target_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    target_object_id = models.PositiveIntegerField()
+    target = GenericForeignKey('target_content_type', 'target_object_id')
+
+    region = models.ForeignKey(Region, null=True, blank=True, on_delete=models.CASCADE)
+    total_size = models.BigIntegerField(default=0)
+    reconciled = NonNaiveDateTimeField(null=True, blank=True)
+
+    objects = StorageUsageQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('target_content_type', 'target_object_id', 'region')
+
+
+@receiver(post_save, sender=BaseFileVersionsThrough)
+def record_storage_usage_for_version(sender, instance, created, **kwargs):
+    if not created or not website_settings.ENABLE_STORAGE_USAGE_LEDGER:
+        return
+    file_node = instance.basefilenode
+    if file_node.provider != 'osfstorage' or file_node.deleted_on:
+        return
+    version = instance.fileversion
+    StorageUsage.objects.record(
+        file_node.target_content_type_id,
+        file_node.target_object_id,
+        version.region_id,
+        version.size or 0,
+    )
+
+
 class UserSettings(BaseUserSettings):
     default_region = models.ForeignKey(Region, null=True, on_delete=models.CASCADE)
 
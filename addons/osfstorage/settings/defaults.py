@@ -36,3 +36,9 @@ MAX_UPLOAD_SIZE = 5 * 1024  # 5 GB
 
 # Max file size permitted by frontend in megabytes for verified users
 HIGH_MAX_UPLOAD_SIZE = 5 * 1024  # 5 GB
+
+# Number of children fetched per query when streaming a folder listing to WaterButler
+CHILDREN_PAGE_SIZE = 1000
+
+# Largest page of children WaterButler may request at once
+CHILDREN_MAX_PAGE_SIZE = 10000
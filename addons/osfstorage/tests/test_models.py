@@ -8,7 +8,7 @@ from importlib import import_module
 from django.conf import settings as django_conf_settings
 
 from framework.auth import Auth
-from addons.osfstorage.models import OsfStorageFile, OsfStorageFileNode, OsfStorageFolder
+from addons.osfstorage.models import OsfStorageFile, OsfStorageFileNode, OsfStorageFolder, StorageUsage
 from osf.models import BaseFileNode, NotificationTypeEnum
 from osf.exceptions import ValidationError
 from osf.utils.permissions import WRITE, ADMIN
@@ -303,6 +303,30 @@ class TestOsfstorageFileNode(StorageTestCase):
         child = self.node_settings.get_root().append_folder('Cloud').append_file('Carp')
         assert '/Cloud/Carp' == child.materialized_path
 
+    def test_materialized_path_is_stored(self):
+        child = self.node_settings.get_root().append_folder('Cloud').append_file('Carp')
+        assert OsfStorageFileNode.objects.filter(_materialized_path='/Cloud/Carp').get() == child
+
+    def test_materialized_path_falls_back_when_not_stored(self):
+        child = self.node_settings.get_root().append_folder('Cloud').append_file('Carp')
+        models.BaseFileNode.objects.filter(id__in=[child.id, child.parent.id]).update(_materialized_path='')
+        child.reload()
+        assert '/Cloud/Carp' == child.materialized_path
+
+    def test_materialized_path_rewritten_on_folder_move(self):
+        folder = self.node_settings.get_root().append_folder('Cloud')
+        nested = folder.append_folder('Carp')
+        child = nested.append_file('Tuna')
+        move_to = self.node_settings.get_root().append_folder('Sea')
+
+        folder.move_under(move_to, name='Sky')
+        nested.reload()
+        child.reload()
+
+        assert '/Sea/Sky/' == folder._materialized_path
+        assert '/Sea/Sky/Carp/' == nested._materialized_path
+        assert '/Sea/Sky/Carp/Tuna' == child._materialized_path
+
     def test_copy(self):
         to_copy = self.node_settings.get_root().append_file('Carp')
         copy_to = self.node_settings.get_root().append_folder('Cloud')
@@ -953,3 +977,73 @@ class TestOsfStorageCheckout(StorageTestCase):
         self.file.target.remove_contributors([self.user], save=True)
         self.file.reload()
         assert self.file.checkout is None
+
+
+@pytest.mark.django_db
+@mock.patch('website.settings.ENABLE_STORAGE_USAGE_LEDGER', True)
+class TestStorageUsageLedger(StorageTestCase):
+
+    def add_file(self, name, size, parent=None):
+        file = (parent or self.node_settings.get_root()).append_file(name)
+        file.add_version(factories.FileVersionFactory(size=size, region=self.node_settings.region))
+        return file
+
+    def test_untracked_target_is_not_recorded(self):
+        self.add_file('untracked', 100)
+        assert StorageUsage.objects.total_for_target(self.node) is None
+
+    def test_reconcile_starts_tracking(self):
+        self.add_file('one', 100)
+        self.add_file('two', 20)
+
+        assert StorageUsage.objects.reconcile(self.node) == 120
+        assert StorageUsage.objects.total_for_target(self.node) == 120
+        assert self.node.storage_usage == 120
+
+    def test_reconcile_without_files(self):
+        assert StorageUsage.objects.reconcile(self.node) == 0
+        assert StorageUsage.objects.total_for_target(self.node) == 0
+
+    def test_new_versions_and_deletes_are_recorded(self):
+        StorageUsage.objects.reconcile(self.node)
+
+        file = self.add_file('one', 100)
+        file.add_version(factories.FileVersionFactory(size=50, region=self.node_settings.region))
+        assert StorageUsage.objects.total_for_target(self.node) == 150
+
+        file.delete()
+        assert StorageUsage.objects.total_for_target(self.node) == 0
+
+        trashed = models.TrashedFileNode.load(file._id)
+        trashed.restore()
+        assert StorageUsage.objects.total_for_target(self.node) == 150
+
+    def test_deleting_a_folder_records_its_files(self):
+        StorageUsage.objects.reconcile(self.node)
+        folder = self.node_settings.get_root().append_folder('Cloud')
+        self.add_file('one', 100, parent=folder)
+        self.add_file('two', 20, parent=folder)
+        assert StorageUsage.objects.total_for_target(self.node) == 120
+
+        folder.delete()
+        assert StorageUsage.objects.total_for_target(self.node) == 0
+
+    def test_move_between_targets(self):
+        new_project = ProjectFactory()
+        StorageUsage.objects.reconcile(self.node)
+        StorageUsage.objects.reconcile(new_project)
+
+        folder = self.node_settings.get_root().append_folder('Carp')
+        self.add_file('A dee um', 100, parent=folder)
+
+        folder.move_under(new_project.get_addon('osfstorage').get_root())
+        assert StorageUsage.objects.total_for_target(self.node) == 0
+        assert StorageUsage.objects.total_for_target(new_project) == 100
+
+    def test_reconcile_corrects_drift(self):
+        StorageUsage.objects.reconcile(self.node)
+        self.add_file('one', 100)
+        StorageUsage.objects.for_target(self.node).update(total_size=12345)
+
+        StorageUsage.objects.reconcile(self.node)
+        assert StorageUsage.objects.total_for_target(self.node) == 100
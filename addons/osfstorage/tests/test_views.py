@@ -176,6 +176,68 @@ class TestGetMetadataHook(HookTestCase):
         assert res_date_modified == expected_date_modified
         assert res_date_created == expected_date_created
 
+    def test_children_paginated(self):
+        root = self.node_settings.get_root()
+        names = [f'file{i}' for i in range(5)]
+        for name in names:
+            create_record_with_version(name, self.node_settings)
+
+        seen = []
+        cursor = None
+        while True:
+            view_kwargs = {'fid': root._id, 'user_id': self.user._id, 'limit': 2}
+            if cursor:
+                view_kwargs['cursor'] = cursor
+            res = self.send_hook('osfstorage_get_children', view_kwargs, {}, self.node)
+            assert len(res.json['data']) <= 2
+            seen.extend(child['name'] for child in res.json['data'])
+            cursor = res.json['next']
+            if not cursor:
+                break
+
+        assert seen == names
+
+    def test_children_invalid_cursor(self):
+        res = self.send_hook(
+            'osfstorage_get_children',
+            {'fid': self.node_settings.get_root()._id, 'user_id': self.user._id, 'limit': 2, 'cursor': 'nope'},
+            {},
+            self.node,
+            expect_errors=True,
+        )
+        assert res.status_code == 400
+
+    @mock.patch('addons.osfstorage.settings.CHILDREN_PAGE_SIZE', 2)
+    def test_children_streamed(self):
+        for name in ['a', 'b', 'c']:
+            create_record_with_version(name, self.node_settings)
+        self.node_settings.get_root().append_folder('d')
+
+        res = self.send_hook(
+            'osfstorage_get_children',
+            {'fid': self.node_settings.get_root()._id, 'user_id': self.user._id, 'stream': 'true'},
+            {},
+            self.node
+        )
+        assert [child['name'] for child in res.json] == ['a', 'b', 'c', 'd']
+        assert [child['kind'] for child in res.json] == ['file', 'file', 'file', 'folder']
+
+    def test_children_uses_version_pointers(self):
+        record = create_record_with_version('pointed', self.node_settings, size=10)
+        newer = factories.FileVersionFactory(size=20)
+        record.add_version(newer)
+        record.reload()
+        assert record.latest_version == newer
+
+        res = self.send_hook(
+            'osfstorage_get_children',
+            {'fid': self.node_settings.get_root()._id, 'user_id': self.user._id},
+            {},
+            self.node
+        )
+        assert res.json[0]['size'] == 20
+        assert res.json[0]['version'] == 2
+
     def test_osf_storage_root(self):
         auth = Auth(self.project.creator)
         result = osf_storage_root(self.node_settings.config, self.node_settings, auth)
@@ -1,4 +1,7 @@
 from rest_framework import status as http_status
+import base64
+import binascii
+import json
 import logging
 
 from django.core.exceptions import ValidationError
@@ -6,7 +9,9 @@ from django.db import IntegrityError
 from django.db import connection
 from django.db import transaction
 
-from flask import request
+from flask import request, Response, stream_with_context
+
+from api.base.utils import is_truthy
 
 from framework.auth import Auth
 from framework.exceptions import HTTPError
@@ -183,115 +188,189 @@ def osfstorage_get_metadata(file_node, **kwargs):
     return file_node.serialize(version=version, include_full=True)
 
 
+# Read the documentation on FileVersion's fields before reading this query. Children are
+# ordered by (name, id) so that they can be paged through with a keyset cursor.
+CHILDREN_SQL = """
+    SELECT F.name, F.id, CASE
+        WHEN F.type = 'osf.osfstoragefile' THEN
+            json_build_object(
+                'id', F._id
+                , 'path', '/' || F._id
+                , 'name', F.name
+                , 'kind', 'file'
+                , 'size', LATEST_VERSION.size
+                , 'downloads',  COALESCE(DOWNLOAD_COUNT, 0)
+                , 'version', (SELECT COUNT(*) FROM osf_basefileversionsthrough WHERE osf_basefileversionsthrough.basefilenode_id = F.id)
+                , 'contentType', LATEST_VERSION.content_type
+                , 'modified', LATEST_VERSION.created
+                , 'created', EARLIEST_VERSION.created
+                , 'checkout', CHECKOUT_GUID
+                , 'md5', LATEST_VERSION.metadata ->> 'md5'
+                , 'sha256', LATEST_VERSION.metadata ->> 'sha256'
+                , 'latestVersionSeen', SEEN_LATEST_VERSION.case
+            )
+        ELSE
+            json_build_object(
+                'id', F._id
+                , 'path', '/' || F._id || '/'
+                , 'name', F.name
+                , 'kind', 'folder'
+            )
+        END
+    FROM osf_basefilenode AS F
+    -- The version pointers are only missing for files that predate them, so only those fall
+    -- back to sorting their versions
+    LEFT JOIN osf_fileversion AS LATEST_VERSION ON LATEST_VERSION.id = COALESCE(F.latest_version_id, (
+        SELECT osf_fileversion.id FROM osf_fileversion
+        JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
+        WHERE osf_basefileversionsthrough.basefilenode_id = F.id
+        ORDER BY created DESC
+        LIMIT 1
+    ))
+    LEFT JOIN osf_fileversion AS EARLIEST_VERSION ON EARLIEST_VERSION.id = COALESCE(F.earliest_version_id, (
+        SELECT osf_fileversion.id FROM osf_fileversion
+        JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
+        WHERE osf_basefileversionsthrough.basefilenode_id = F.id
+        ORDER BY created ASC
+        LIMIT 1
+    ))
+    LEFT JOIN LATERAL (
+        SELECT _id from osf_guid
+        WHERE object_id = F.checkout_id
+        AND content_type_id = %(user_content_type_id)s
+        LIMIT 1
+    ) CHECKOUT_GUID ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT P.total AS DOWNLOAD_COUNT FROM osf_pagecounter AS P
+        WHERE P.resource_id = %(guid_id)s
+        AND P.file_id = F.id
+        AND P.action = 'download'
+        AND P.version ISNULL
+        LIMIT 1
+    ) DOWNLOAD_COUNT ON TRUE
+    LEFT JOIN LATERAL (
+      SELECT EXISTS(
+        SELECT (1) FROM osf_fileversionusermetadata
+          INNER JOIN osf_fileversion ON osf_fileversionusermetadata.file_version_id = osf_fileversion.id
+          INNER JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
+          WHERE osf_fileversionusermetadata.user_id = %(user_pk)s
+          AND osf_basefileversionsthrough.basefilenode_id = F.id
+        LIMIT 1
+      )
+    ) SEEN_FILE ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT CASE WHEN SEEN_FILE.exists
+        THEN
+            CASE WHEN EXISTS(
+              SELECT (1) FROM osf_fileversionusermetadata
+              WHERE osf_fileversionusermetadata.file_version_id = LATEST_VERSION.id
+              AND osf_fileversionusermetadata.user_id = %(user_pk)s
+              LIMIT 1
+            )
+            THEN
+              json_build_object('user', %(user_id)s, 'seen', TRUE)
+            ELSE
+              json_build_object('user', %(user_id)s, 'seen', FALSE)
+            END
+        ELSE
+          NULL
+        END
+    ) SEEN_LATEST_VERSION ON TRUE
+    WHERE parent_id = %(parent_id)s
+    AND (NOT F.type IN ('osf.trashedfilenode', 'osf.trashedfile', 'osf.trashedfolder'))
+    AND (%(after_id)s::INTEGER IS NULL OR (F.name, F.id) > (%(after_name)s, %(after_id)s))
+    ORDER BY F.name, F.id
+    LIMIT %(limit)s
+"""
+
+
+def _encode_children_cursor(name, id):
+    return base64.urlsafe_b64encode(json.dumps([name, id]).encode()).decode()
+
+
+def _decode_children_cursor(cursor):
+    try:
+        name, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPError(http_status.HTTP_400_BAD_REQUEST, data={'message_long': 'Invalid cursor.'})
+    if not isinstance(name, str) or not isinstance(id, int):
+        raise HTTPError(http_status.HTTP_400_BAD_REQUEST, data={'message_long': 'Invalid cursor.'})
+    return name, id
+
+
+def _fetch_children(params, after=None, limit=None):
+    """Returns up to `limit` (name, id, serialized child) rows that sort after `after`."""
+    after_name, after_id = after or (None, None)
+    with connection.cursor() as cursor:
+        cursor.execute(CHILDREN_SQL, dict(params, after_name=after_name, after_id=after_id, limit=limit))
+        return cursor.fetchall()
+
+
+def _stream_children(params):
+    """Yields the children as a JSON list, a page at a time, so huge folders never have to be
+    held in memory all at once.
+    """
+    yield '['
+    after = None
+    first = True
+    while True:
+        rows = _fetch_children(params, after=after, limit=osf_storage_settings.CHILDREN_PAGE_SIZE)
+        for name, id, child in rows:
+            if not first:
+                yield ','
+            yield json.dumps(child)
+            first = False
+        if len(rows) < osf_storage_settings.CHILDREN_PAGE_SIZE:
+            break
+        after = rows[-1][:2]
+    yield ']'
+
+
 @must_be_signed
 @decorators.autoload_filenode(must_be='folder')
 def osfstorage_get_children(file_node, **kwargs):
+    """Lists a folder's children.
+
+    By default returns every child as a single JSON list. Passing `stream` streams that same
+    list in pages instead of building it up in memory. Passing `limit` (and the `cursor` from
+    the previous page) returns one page, `{"data": [...], "next": cursor or null}`.
+    """
     from django.contrib.contenttypes.models import ContentType
     from osf.models.preprint import Preprint
     user_id = request.args.get('user_id')
     user_content_type_id = ContentType.objects.get_for_model(OSFUser).id
     user_pk = OSFUser.objects.filter(guids___id=user_id, guids___id__isnull=False).values_list('pk', flat=True).first()
-    guid_id = file_node.target.get_guid().id if isinstance(file_node.target, Preprint) else file_node.target.guids.first().id,
+    guid_id = file_node.target.get_guid().id if isinstance(file_node.target, Preprint) else file_node.target.guids.first().id
+    params = {
+        'user_content_type_id': user_content_type_id,
+        'guid_id': guid_id,
+        'user_pk': user_pk,
+        'user_id': user_id,
+        'parent_id': file_node.id,
+    }
 
-    with connection.cursor() as cursor:
-        # Read the documentation on FileVersion's fields before reading this code
-        cursor.execute("""
-            SELECT json_agg(CASE
-                WHEN F.type = 'osf.osfstoragefile' THEN
-                    json_build_object(
-                        'id', F._id
-                        , 'path', '/' || F._id
-                        , 'name', F.name
-                        , 'kind', 'file'
-                        , 'size', LATEST_VERSION.size
-                        , 'downloads',  COALESCE(DOWNLOAD_COUNT, 0)
-                        , 'version', (SELECT COUNT(*) FROM osf_basefileversionsthrough WHERE osf_basefileversionsthrough.basefilenode_id = F.id)
-                        , 'contentType', LATEST_VERSION.content_type
-                        , 'modified', LATEST_VERSION.created
-                        , 'created', EARLIEST_VERSION.created
-                        , 'checkout', CHECKOUT_GUID
-                        , 'md5', LATEST_VERSION.metadata ->> 'md5'
-                        , 'sha256', LATEST_VERSION.metadata ->> 'sha256'
-                        , 'latestVersionSeen', SEEN_LATEST_VERSION.case
-                    )
-                ELSE
-                    json_build_object(
-                        'id', F._id
-                        , 'path', '/' || F._id || '/'
-                        , 'name', F.name
-                        , 'kind', 'folder'
-                    )
-                END
-            )
-            FROM osf_basefilenode AS F
-            LEFT JOIN LATERAL (
-                SELECT * FROM osf_fileversion
-                JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
-                WHERE osf_basefileversionsthrough.basefilenode_id = F.id
-                ORDER BY created DESC
-                LIMIT 1
-            ) LATEST_VERSION ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT * FROM osf_fileversion
-                JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
-                WHERE osf_basefileversionsthrough.basefilenode_id = F.id
-                ORDER BY created ASC
-                LIMIT 1
-            ) EARLIEST_VERSION ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT _id from osf_guid
-                WHERE object_id = F.checkout_id
-                AND content_type_id = %s
-                LIMIT 1
-            ) CHECKOUT_GUID ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT P.total AS DOWNLOAD_COUNT FROM osf_pagecounter AS P
-                WHERE P.resource_id = %s
-                AND P.file_id = F.id
-                AND P.action = 'download'
-                AND P.version ISNULL
-                LIMIT 1
-            ) DOWNLOAD_COUNT ON TRUE
-            LEFT JOIN LATERAL (
-              SELECT EXISTS(
-                SELECT (1) FROM osf_fileversionusermetadata
-                  INNER JOIN osf_fileversion ON osf_fileversionusermetadata.file_version_id = osf_fileversion.id
-                  INNER JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
-                  WHERE osf_fileversionusermetadata.user_id = %s
-                  AND osf_basefileversionsthrough.basefilenode_id = F.id
-                LIMIT 1
-              )
-            ) SEEN_FILE ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT CASE WHEN SEEN_FILE.exists
-                THEN
-                    CASE WHEN EXISTS(
-                      SELECT (1) FROM osf_fileversionusermetadata
-                      WHERE osf_fileversionusermetadata.file_version_id = LATEST_VERSION.fileversion_id
-                      AND osf_fileversionusermetadata.user_id = %s
-                      LIMIT 1
-                    )
-                    THEN
-                      json_build_object('user', %s, 'seen', TRUE)
-                    ELSE
-                      json_build_object('user', %s, 'seen', FALSE)
-                    END
-                ELSE
-                  NULL
-                END
-            ) SEEN_LATEST_VERSION ON TRUE
-            WHERE parent_id = %s
-            AND (NOT F.type IN ('osf.trashedfilenode', 'osf.trashedfile', 'osf.trashedfolder'))
-        """, [
-            user_content_type_id,
-            guid_id,
-            user_pk,
-            user_pk,
-            user_id,
-            user_id,
-            file_node.id
-        ])
-        return cursor.fetchone()[0] or []
+    if is_truthy(request.args.get('stream')):
+        return Response(stream_with_context(_stream_children(params)), mimetype='application/json')
+
+    limit = request.args.get('limit')
+    if limit is None:
+        return [child for _, _, child in _fetch_children(params)]
+
+    try:
+        limit = min(int(limit), osf_storage_settings.CHILDREN_MAX_PAGE_SIZE)
+    except ValueError:
+        raise HTTPError(http_status.HTTP_400_BAD_REQUEST, data={'message_long': 'Invalid limit.'})
+    if limit < 1:
+        raise HTTPError(http_status.HTTP_400_BAD_REQUEST, data={'message_long': 'Invalid limit.'})
+    cursor = request.args.get('cursor')
+    after = _decode_children_cursor(cursor) if cursor else None
+
+    rows = _fetch_children(params, after=after, limit=limit + 1)
+    next_cursor = _encode_children_cursor(*rows[limit - 1][:2]) if len(rows) > limit else None
+    return {
+        'data': [child for _, _, child in rows[:limit]],
+        'next': next_cursor,
+    }
 
 
 @must_be_signed
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.26 on 2026-10-16 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('addons_wiki', '0003_alter_nodesettings_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wikiversion',
+            name='rendered_html',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wikiversion',
+            name='rendered_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='wikipage',
+            name='current_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='addons_wiki.wikiversion'),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE addons_wiki_wikipage AS P
+            SET current_version_id = V.id
+            FROM (
+                SELECT DISTINCT ON (wiki_page_id) id, wiki_page_id
+                FROM addons_wiki_wikiversion
+                ORDER BY wiki_page_id, created DESC
+            ) AS V
+            WHERE V.wiki_page_id = P.id
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
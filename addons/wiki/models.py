@@ -1,11 +1,13 @@
 import datetime
 import functools
+import hashlib
+import json
 import logging
 
 import markdown
+import pygments
 import pytz
 from django.db.models.expressions import F
-from django.db.models.aggregates import Max
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from framework.auth.core import Auth
@@ -92,6 +94,24 @@ def build_wiki_url(node, label, base, end):
     return f'/{node._id}/wiki/{label}/'
 
 
+# Bump when build_html_output or WikiVersion.html change what they produce
+WIKI_RENDERER_VERSION = 1
+
+
+def get_render_key(node):
+    """Fingerprint of everything besides content that goes into a version's rendered HTML.
+    Stored HTML with a different key is rendered again.
+    """
+    render_settings = json.dumps([
+        WIKI_RENDERER_VERSION,
+        markdown.__version__,
+        pygments.__version__,
+        settings.WIKI_WHITELIST,
+        node._id,
+    ], sort_keys=True, default=sorted)
+    return hashlib.sha256(render_settings.encode('utf-8')).hexdigest()
+
+
 class WikiVersionNodeManager(models.Manager):
 
     def get_for_node(self, node, name=None, version=None, id=None):
@@ -113,6 +133,29 @@ class WikiVersionNodeManager(models.Manager):
                 return None
         return WikiVersion.load(id)
 
+    def render_many(self, versions, node):
+        """Return the cleaned HTML of many versions of the node's wiki pages, rendering only those
+        without up-to-date stored HTML and storing the results in a single query.
+        """
+        render_key = get_render_key(node)
+        rendered = []
+        stale = []
+        for version in versions:
+            if version.rendered_key != render_key:
+                html = version.render_html(node)
+                if html is not None:
+                    version.rendered_html = html
+                    version.rendered_key = render_key
+                    stale.append(version)
+                else:
+                    html = render_content(version.content, node=node)
+                rendered.append(html)
+            else:
+                rendered.append(version.rendered_html)
+        if stale:
+            WikiVersion.objects.bulk_update(stale, ['rendered_html', 'rendered_key'])
+        return rendered
+
 
 class WikiVersion(ObjectIDMixin, BaseModel):
     objects = WikiVersionNodeManager()
@@ -121,13 +164,38 @@ class WikiVersion(ObjectIDMixin, BaseModel):
     wiki_page = models.ForeignKey('WikiPage', null=True, blank=True, on_delete=models.CASCADE, related_name='versions')
     content = models.TextField(default='', blank=True)
     identifier = models.IntegerField(default=1)
+    # Output of `html`, valid while `rendered_key` matches `get_render_key` for the node
+    rendered_html = models.TextField(null=True, blank=True)
+    rendered_key = models.CharField(max_length=64, null=True, blank=True)
 
     @property
     def is_current(self):
-        return not self.wiki_page.deleted and self.id == self.wiki_page.versions.order_by('-created').first().id
+        if self.wiki_page.deleted:
+            return False
+        if self.wiki_page.current_version_id:
+            return self.id == self.wiki_page.current_version_id
+        return self.id == self.wiki_page.versions.order_by('-created').first().id
 
     def html(self, node):
         """The cleaned HTML of the page"""
+        render_key = get_render_key(node)
+        if self.rendered_key == render_key:
+            return self.rendered_html
+
+        html = self.render_html(node)
+        if html is None:
+            logger.warning('Returning unlinkified content.')
+            return render_content(self.content, node=node)
+
+        self.rendered_html = html
+        self.rendered_key = render_key
+        if self.pk:
+            # Versions never change once written, so skip save() and its search/spam side effects
+            WikiVersion.objects.filter(pk=self.pk).update(rendered_html=html, rendered_key=render_key)
+        return html
+
+    def render_html(self, node):
+        """Render and linkify the page, or return None if it can't be linkified."""
         html_output = build_html_output(self.content, node=node)
         try:
             return sanitize_html(
@@ -138,8 +206,7 @@ class WikiVersion(ObjectIDMixin, BaseModel):
                 filters=[partial(LinkifyFilter, callbacks=[nofollow])]
             )
         except TypeError:
-            logger.warning('Returning unlinkified content.')
-            return render_content(self.content, node=node)
+            return None
 
     def raw_text(self, node):
         """ The raw text of the page, suitable for using in a test search"""
@@ -172,10 +239,13 @@ class WikiVersion(ObjectIDMixin, BaseModel):
         return self.content
 
     def save(self, *args, **kwargs):
+        first_save = not self.pk  # also true for clones
         rv = super().save(*args, **kwargs)
         if self.wiki_page.node:
             self.wiki_page.node.update_search()
         self.wiki_page.modified = self.created
+        if first_save:
+            self.wiki_page.current_version = self
         self.wiki_page.save()
         self.check_spam()
         return rv
@@ -254,8 +324,8 @@ class WikiPageNodeManager(models.Manager):
         return WikiPage.load(id)
 
     def get_wiki_pages_latest(self, node):
-        wiki_page_ids = node.wikis.filter(deleted__isnull=True).values_list('id', flat=True)
-        return WikiVersion.objects.annotate(name=F('wiki_page__page_name'), newest_version=Max('wiki_page__versions__identifier')).filter(identifier=F('newest_version'), wiki_page__id__in=wiki_page_ids)
+        current_version_ids = node.wikis.filter(deleted__isnull=True).values('current_version_id')
+        return WikiVersion.objects.annotate(name=F('wiki_page__page_name')).filter(id__in=current_version_ids)
 
     def include_wiki_settings(self, node):
         """Check if node meets requirements to make publicly editable."""
@@ -268,6 +338,8 @@ class WikiPage(GuidMixin, BaseModel):
     user = models.ForeignKey('osf.OSFUser', null=True, blank=True, on_delete=models.CASCADE)
     node = models.ForeignKey('osf.AbstractNode', null=True, blank=True, on_delete=models.CASCADE, related_name='wikis')
     deleted = NonNaiveDateTimeField(blank=True, null=True, db_index=True)
+    # Newest version, kept up to date by WikiVersion.save
+    current_version = models.ForeignKey('WikiVersion', null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
 
     class Meta:
         indexes = [
@@ -328,6 +400,8 @@ class WikiPage(GuidMixin, BaseModel):
 
     @property
     def current_version_number(self):
+        if self.current_version_id:
+            return self.current_version.identifier
         return self.versions.order_by('-created').values_list('identifier', flat=True).first() or 0
 
     @property
@@ -340,6 +414,8 @@ class WikiPage(GuidMixin, BaseModel):
             if not ret:
                 raise VersionNotFoundError(version)
             return ret
+        elif self.current_version_id:
+            return self.current_version
         else:
             return self.versions.order_by('-created').first()
 
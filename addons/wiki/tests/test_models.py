@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 import pytz
 import datetime
@@ -48,6 +50,56 @@ class TestWikiPageModel:
         page.save()
         assert ver1.is_current is False
 
+    def test_current_version_pointer(self):
+        user = UserFactory()
+        node = NodeFactory()
+        page = WikiPage(page_name='foo', node=node)
+        page.save()
+        page.update(user=user, content='draft1')
+        ver2 = page.update(user=user, content='draft2')
+
+        page.reload()
+        assert page.current_version == ver2
+        assert page.current_version_number == 2
+        assert list(WikiPage.objects.get_wiki_pages_latest(node)) == [ver2]
+
+    def test_html_is_stored(self):
+        user = UserFactory()
+        node = NodeFactory()
+        page = WikiPage(page_name='foo', node=node)
+        page.save()
+        version = page.update(user=user, content='# hello [[bar]]')
+
+        html = version.html(node)
+        assert f'/{node._id}/wiki/bar/' in html
+        version.reload()
+        assert version.rendered_html == html
+        with mock.patch('addons.wiki.models.build_html_output') as mock_build:
+            assert version.html(node) == html
+        assert not mock_build.called
+
+    def test_html_is_rendered_again_for_other_node(self):
+        user = UserFactory()
+        node = NodeFactory()
+        page = WikiPage(page_name='foo', node=node)
+        page.save()
+        version = page.update(user=user, content='[[bar]]')
+        version.html(node)
+
+        fork = NodeFactory()
+        assert f'/{fork._id}/wiki/bar/' in version.html(fork)
+
+    def test_render_many(self):
+        user = UserFactory()
+        node = NodeFactory()
+        page = WikiPage(page_name='foo', node=node)
+        page.save()
+        versions = [page.update(user=user, content=f'# draft {i}') for i in range(3)]
+
+        rendered = WikiVersion.objects.render_many(versions, node)
+        assert rendered == [version.html(node) for version in versions]
+        assert all(version.rendered_key for version in WikiVersion.objects.filter(wiki_page=page))
+
 
 class TestWikiPage(OsfTestCase):
 
@@ -4,10 +4,11 @@ import datetime
 import typing
 
 import elasticsearch8.dsl as esdsl
+from django.http import Http404, HttpResponseNotFound, StreamingHttpResponse
 from rest_framework import generics, exceptions as drf_exceptions
 from rest_framework.serializers import Serializer
 from rest_framework.settings import api_settings as drf_settings
-from api.base.settings.defaults import REPORT_FILENAME_FORMAT
+from api.base.settings.defaults import MAX_SIZE_OF_ES_QUERY, REPORT_FILENAME_FORMAT
 
 if typing.TYPE_CHECKING:
     from rest_framework import serializers
@@ -15,6 +16,7 @@ if typing.TYPE_CHECKING:
 from api.base.filters import FilterMixin
 from api.base.views import JSONAPIBaseView
 from api.metrics.renderers import (
+    MetricsReportsRenderer,
     MetricsReportsCsvRenderer,
     MetricsReportsTsvRenderer,
     MetricsReportsJsonRenderer,
@@ -71,12 +73,35 @@ class ElasticsearchListView(FilterMixin, JSONAPIBaseView, generics.ListAPIView,
 
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
+    def list(self, request, *args, **kwargs):
+        # csv/tsv downloads stream every matching report instead of one (capped) page
+        if isinstance(request.accepted_renderer, MetricsReportsRenderer):
+            return self.stream_file(request.accepted_renderer)
+        return super().list(request, *args, **kwargs)
+
+    def stream_file(self, renderer: MetricsReportsRenderer) -> StreamingHttpResponse | HttpResponseNotFound:
+        _search = self.filter_queryset(self.get_queryset())
+        _serialized_reports = (
+            _jsonapi_resource['attributes']
+            for _hits in self.__iter_hit_chunks(_search)
+            for _jsonapi_resource in self.get_serializer(_hits, many=True).data
+        )
+        try:
+            _csv_lines = renderer.stream(_serialized_reports)
+        except Http404 as e:
+            # (a plain response, since the csv/tsv renderer can't render an error)
+            return HttpResponseNotFound(str(e))
+        return StreamingHttpResponse(
+            _csv_lines,
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+
     def finalize_response(self, request, response, *args, **kwargs):
         # Call the parent method to finalize the response first
         response = super().finalize_response(request, response, *args, **kwargs)
         # Check if this is a direct download request or file renderer classes, set to the Content-Disposition header
         # so filename and attachment for browser download
-        if isinstance(request.accepted_renderer, self.FILE_RENDERER_CLASSES):
+        if isinstance(request.accepted_renderer, self.FILE_RENDERER_CLASSES) and response.status_code == 200:
             self.set_content_disposition(response, request.accepted_renderer)
 
         return response
@@ -139,6 +164,22 @@ class ElasticsearchListView(FilterMixin, JSONAPIBaseView, generics.ListAPIView,
     ###
     # private methods
 
+    def __iter_hit_chunks(self, search: esdsl.Search | list):
+        '''iterate over every hit in chunks, paging with search_after in a point in time
+        (so the sort order holds and deep pages cost no more than the first)
+        '''
+        if not isinstance(search, esdsl.Search):
+            if search:
+                yield list(search)
+            return
+        with search.extra(size=MAX_SIZE_OF_ES_QUERY).point_in_time() as _search:
+            while True:
+                _response = _search.execute()
+                if not _response.hits:
+                    return
+                yield list(_response.hits)
+                _search = _search.search_after()
+
     def __add_sort(self, search: esdsl.Search) -> esdsl.Search:
         _elastic_sort = self.__get_elastic_sort()
         return (search if _elastic_sort is None else search.sort(_elastic_sort))
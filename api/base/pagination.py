@@ -1,7 +1,11 @@
+import base64
+import binascii
+import json
 from collections import OrderedDict
 from django.urls import reverse
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
 from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
-from django.db.models import QuerySet
+from django.db.models import Q, QuerySet
 
 from rest_framework import pagination
 from rest_framework.exceptions import NotFound
@@ -9,6 +13,7 @@ from rest_framework.response import Response
 from rest_framework.utils.urls import (
     replace_query_param, remove_query_param,
 )
+from api.base.exceptions import InvalidQueryStringError
 from api.base.serializers import is_anonymized
 from api.base.settings import MAX_PAGE_SIZE, MAX_SIZE_OF_ES_QUERY
 from api.base.utils import absolute_reverse
@@ -28,6 +33,12 @@ class JSONAPIPagination(pagination.PageNumberPagination):
     page_size_query_param = 'page[size]'
     max_page_size = MAX_PAGE_SIZE
 
+    # Passing `page[cursor]` (empty to start from the beginning) switches to keyset pagination,
+    # which seeks past the last row seen instead of using OFFSET and skips the total count.
+    cursor_query_param = 'page[cursor]'
+    cursor_default_ordering = ('-modified',)
+    cursor_page = None
+
     def page_number_query(self, url, page_number):
         """
         Builds uri and adds page param.
@@ -68,6 +79,8 @@ class JSONAPIPagination(pagination.PageNumberPagination):
         return self.page_number_query(url, page_number)
 
     def get_response_dict_deprecated(self, data, url):
+        if self.cursor_page is not None:
+            return self.get_cursor_response_dict_deprecated(data, url)
         return OrderedDict([
             ('data', data),
             (
@@ -87,6 +100,8 @@ class JSONAPIPagination(pagination.PageNumberPagination):
         ])
 
     def get_response_dict(self, data, url):
+        if self.cursor_page is not None:
+            return self.get_cursor_response_dict(data, url)
         return OrderedDict([
             ('data', data),
             (
@@ -163,9 +178,169 @@ class JSONAPIPagination(pagination.PageNumberPagination):
             self.request = request
             return list(self.page)
 
+        elif self.cursor_query_param in request.query_params:
+            return self.paginate_queryset_by_cursor(queryset, request)
+
         else:
             return super().paginate_queryset(queryset, request, view=None)
 
+    def paginate_queryset_by_cursor(self, queryset, request):
+        """
+        Keyset pagination of queryset. Returns the page of results following (or, for a
+        reversed cursor, preceding) the position encoded in the `page[cursor]` param.
+        """
+        if not isinstance(queryset, QuerySet):
+            raise InvalidQueryStringError(
+                detail='Cursor pagination is not supported for this endpoint.',
+                parameter=self.cursor_query_param,
+            )
+
+        self.request = request
+        self.cursor_ordering = self.get_cursor_ordering(queryset)
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(queryset.model, request.query_params[self.cursor_query_param])
+
+        ordering = self.cursor_ordering
+        if reverse:
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(ordering, position))
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            self.cursor_has_previous, self.cursor_has_next = has_more, position is not None
+        else:
+            self.cursor_has_previous, self.cursor_has_next = position is not None, has_more
+
+        self.cursor_page = results
+        return results
+
+    def get_cursor_ordering(self, queryset):
+        """
+        Ordering used for keyset pagination: the queryset's ordering (as applied by the view
+        and the `sort` param), made total by adding the primary key as a tiebreaker.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or self.cursor_default_ordering)
+        for field in ordering:
+            name = field.lstrip('-') if isinstance(field, str) else None
+            if name is None or '__' in name or (name != 'pk' and not self._get_cursor_field(queryset.model, name)):
+                raise InvalidQueryStringError(
+                    detail='Cursor pagination does not support the ordering of this endpoint.',
+                    parameter=self.cursor_query_param,
+                )
+        if not any(field.lstrip('-') in ('pk', queryset.model._meta.pk.name) for field in ordering):
+            ordering.append('-pk' if ordering and ordering[0].startswith('-') else 'pk')
+        return ordering
+
+    def _get_cursor_field(self, model, name):
+        if name == 'pk':
+            return model._meta.pk
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        return field if field.concrete and not field.many_to_many else None
+
+    def get_keyset_filter(self, ordering, position):
+        """
+        Builds `(a > x) OR (a = x AND b > y) OR ...`, flipping each comparison for descending
+        fields, so rows are selected strictly after `position` in `ordering`. NULLs sort as
+        Postgres sorts them: last when ascending, first when descending.
+        """
+        keyset_filter = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            descending = field.startswith('-')
+            if value is None:
+                after = Q(**{f'{name}__isnull': False}) if descending else None
+                equal_to = Q(**{f'{name}__isnull': True})
+            else:
+                if descending:
+                    after = Q(**{f'{name}__lt': value})
+                else:
+                    after = Q(**{f'{name}__gt': value}) | Q(**{f'{name}__isnull': True})
+                equal_to = Q(**{name: value})
+            if after is not None:
+                keyset_filter |= equal & after
+            equal &= equal_to
+        return keyset_filter
+
+    def get_cursor_position(self, obj):
+        position = []
+        for field in self.cursor_ordering:
+            name = field.lstrip('-')
+            position.append(obj.pk if name == 'pk' else getattr(obj, self._get_cursor_field(type(obj), name).attname))
+        return position
+
+    def encode_cursor(self, position, reverse=False):
+        # Dates are serialized in full; DjangoJSONEncoder would truncate microseconds and make
+        # the cursor skip or repeat rows
+        payload = json.dumps(
+            {'p': position, 'r': reverse},
+            default=lambda value: value.isoformat() if hasattr(value, 'isoformat') else str(value),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, model, cursor):
+        """
+        Returns `(position, reverse)` for an opaque cursor, or `(None, False)` for an empty one.
+        """
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            reverse = bool(payload['r'])
+            if len(payload['p']) != len(self.cursor_ordering):
+                raise ValueError
+            position = [
+                self._get_cursor_field(model, field.lstrip('-')).to_python(value)
+                for field, value in zip(self.cursor_ordering, payload['p'])
+            ]
+        except (binascii.Error, ValueError, KeyError, TypeError, DjangoValidationError):
+            raise InvalidQueryStringError(detail='Invalid cursor.', parameter=self.cursor_query_param)
+        return position, reverse
+
+    def cursor_query(self, url, cursor):
+        url = remove_query_param(self.request.build_absolute_uri(url), '_')
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_cursor_links(self, url):
+        next_link = previous_link = None
+        if self.cursor_has_next and self.cursor_page:
+            next_link = self.cursor_query(url, self.encode_cursor(self.get_cursor_position(self.cursor_page[-1])))
+        if self.cursor_has_previous and self.cursor_page:
+            previous_link = self.cursor_query(url, self.encode_cursor(self.get_cursor_position(self.cursor_page[0]), reverse=True))
+        return OrderedDict([
+            ('self', self.cursor_query(url, self.request.query_params[self.cursor_query_param])),
+            ('first', self.cursor_query(url, '')),
+            ('last', None),
+            ('prev', previous_link),
+            ('next', next_link),
+        ])
+
+    def get_cursor_response_dict_deprecated(self, data, url):
+        links = self.get_cursor_links(url)
+        links.pop('self')
+        links['meta'] = OrderedDict([('per_page', self.get_page_size(self.request))])
+        return OrderedDict([
+            ('data', data),
+            ('links', links),
+        ])
+
+    def get_cursor_response_dict(self, data, url):
+        return OrderedDict([
+            ('data', data),
+            ('meta', OrderedDict([('per_page', self.get_page_size(self.request))])),
+            ('links', self.get_cursor_links(url)),
+        ])
+
 
 class JSONAPINoPagination(pagination.BasePagination):
     '''do not accept page params nor paginate the queryset, but (for consistency with
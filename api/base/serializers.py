@@ -723,11 +723,11 @@ class RelationshipField(ser.Field):
                 field_counts_requested = self.process_related_counts_parameters(show_related_counts, value)
 
                 if utils.is_truthy(show_related_counts):
-                    meta[key] = functional.rapply(meta_data[key], _url_val, obj=value, serializer=self.parent, request=self.context['request'])
+                    meta[key] = self.get_related_count(meta_data[key], value)
                 elif utils.is_falsy(show_related_counts):
                     continue
                 elif self.field_name in field_counts_requested:
-                    meta[key] = functional.rapply(meta_data[key], _url_val, obj=value, serializer=self.parent, request=self.context['request'])
+                    meta[key] = self.get_related_count(meta_data[key], value)
                 else:
                     continue
             elif key == 'projects_in_common':
@@ -740,6 +740,18 @@ class RelationshipField(ser.Field):
                 meta[key] = functional.rapply(meta_data[key], _url_val, obj=value, serializer=self.parent, request=self.context['request'])
         return meta
 
+    def get_related_count(self, meta_value, value):
+        """
+        Returns the count computed for the whole page by the serializer's `prefetch_related_counts`, if there is
+        one; otherwise calls the serializer's count method for this object.
+        """
+        serializer = self.parent.parent if getattr(self.parent, 'field', None) else self.parent
+        if isinstance(meta_value, str) and getattr(value, 'pk', None) is not None:
+            prefetched = getattr(serializer, 'prefetched_related_counts', {}).get(meta_value)
+            if prefetched is not None:
+                return prefetched.get(value.pk, 0)
+        return functional.rapply(meta_value, _url_val, obj=value, serializer=self.parent, request=self.context['request'])
+
     def lookup_attribute(self, obj, lookup_field):
         """
         Returns attribute from target object unless attribute surrounded in angular brackets where it returns the lookup field.
@@ -1345,6 +1357,15 @@ class JSONAPIListSerializer(ser.ListSerializer):
                 self.child.to_esi_representation(item, envelope=None) for item in data
             ]
         else:
+            data = list(data)
+            # Let embeds resolve for the whole page at once rather than item by item
+            for embed in self.context.get('embed', {}).values():
+                prefetch = getattr(embed, 'prefetch', None)
+                if prefetch:
+                    prefetch(data)
+            prefetch_related_counts = getattr(self.child, 'prefetch_related_counts', None)
+            if prefetch_related_counts:
+                prefetch_related_counts(data)
             ret = [
                 self.child.to_representation(item, envelope=envelope) for item in data
             ]
@@ -1445,6 +1466,10 @@ class JSONAPISerializer(BaseAPISerializer):
     """
     writeable_method_fields = frozenset([])
 
+    # Maps the name of a `related_meta` count method to the name of a method that computes the same
+    # count for a whole page of objects at once, returning a dict of {pk: count}
+    related_count_batches = {}
+
     # Don't serialize relationships that use these views
     # when viewing thru an anonymous VOL
     views_to_hide_if_anonymous = {
@@ -1463,6 +1488,30 @@ class JSONAPISerializer(BaseAPISerializer):
             return list_cls(*args, **kwargs)
         return JSONAPIListSerializer(*args, **kwargs)
 
+    def prefetch_related_counts(self, items):
+        """Compute the relationship counts requested with the `related_counts` query param for a page
+        of `items`, with one grouped query per relationship listed in `related_count_batches`.
+        """
+        self.prefetched_related_counts = {}
+        request = self.context['request']
+        show_related_counts = request.query_params.get('related_counts', False)
+        if (
+            not items or not self.related_count_batches or utils.is_falsy(show_related_counts)
+            or (request.parser_context.get('kwargs') or {}).get('is_embedded')
+        ):
+            return
+
+        fields_requested = None if utils.is_truthy(show_related_counts) else set(show_related_counts.split(','))
+        for field_name, field in self.fields.items():
+            field = getattr(field, 'field', field)
+            if fields_requested is not None and field_name not in fields_requested:
+                continue
+            for meta in (getattr(field, 'related_meta', None), getattr(field, 'self_meta', None)):
+                count_method = (meta or {}).get('count')
+                batch_method = self.related_count_batches.get(count_method)
+                if batch_method and count_method not in self.prefetched_related_counts:
+                    self.prefetched_related_counts[count_method] = getattr(self, batch_method)(items)
+
     def invalid_embeds(self, fields, embeds):
         fields_check = fields[:]
         for index, field in enumerate(fields_check):
@@ -350,6 +350,9 @@ MONTHLY_USAGE_REPORT_EPOCH = '2026-05'  # cannot create monthly usage reports be
 WAFFLE_CACHE_NAME = 'waffle_cache'
 STORAGE_USAGE_CACHE_NAME = 'storage_usage'
 STORAGE_USAGE_MAX_ENTRIES = 10000000
+CAS_TOKEN_CACHE_NAME = 'cas_token'
+WATERBUTLER_AUTH_CACHE_NAME = 'waterbutler_auth'
+METADATA_RECORD_CACHE_NAME = 'metadata_record'
 
 
 CACHES = {
@@ -376,6 +379,23 @@ CACHES = {
     WAFFLE_CACHE_NAME: {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     },
+    # per process; point at a shared backend (like 'redis') before enabling CAS_TOKEN_CACHE_TIMEOUT
+    CAS_TOKEN_CACHE_NAME: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # per process; point at a shared backend (like 'redis') before enabling WATERBUTLER_AUTH_CACHE_TIMEOUT
+    WATERBUTLER_AUTH_CACHE_NAME: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    METADATA_RECORD_CACHE_NAME: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
 }
 
 EGAP_PROVIDER_NAME = 'EGAP'
@@ -170,22 +170,23 @@ def default_node_list_queryset(model_cls):
     return model_cls.objects.filter(is_deleted=False)
 
 
-def default_node_permission_queryset(user, model_cls):
+def default_node_permission_queryset(user, model_cls, include_implicit=False):
     """
     Return nodes that are either public or you have perms because you're a contributor.
-    Implicit admin permissions not included here (NodeList, UserNodes, for example, don't factor this in.)
+    Implicit admin permissions are only included if include_implicit is True
+    (NodeList, UserNodes, for example, don't factor this in.)
     """
     Node = apps.get_model('osf', 'Node')
     Registration = apps.get_model('osf', 'Registration')
     assert model_cls in {Node, Registration}
-    return model_cls.objects.get_nodes_for_user(user, include_public=True)
+    return model_cls.objects.get_nodes_for_user(user, include_public=True, include_implicit=include_implicit)
 
 
-def default_node_list_permission_queryset(user, model_cls, **annotations):
+def default_node_list_permission_queryset(user, model_cls, include_implicit=False, **annotations):
     # **DO NOT** change the order of the querysets below.
     # If get_roots() is called on default_node_list_qs & default_node_permission_qs,
     # Django's aliasing will break and the resulting QS will be empty and you will be sad.
-    qs = default_node_permission_queryset(user, model_cls) & default_node_list_queryset(model_cls)
+    qs = default_node_permission_queryset(user, model_cls, include_implicit=include_implicit) & default_node_list_queryset(model_cls)
     if annotations:
         qs = qs.annotate(**annotations)
     return qs.filter(deleted=None)
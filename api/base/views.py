@@ -7,6 +7,7 @@ from django.db import transaction
 from django.db.models import F, Q, When, Case
 from django.http import JsonResponse
 from django.contrib.contenttypes.models import ContentType
+from django.urls import NoReverseMatch, Resolver404
 from rest_framework import generics
 from rest_framework import permissions as drf_permissions
 from rest_framework import status
@@ -46,6 +47,11 @@ from waffle import sample_is_active
 
 class JSONAPIBaseView(generics.GenericAPIView):
 
+    # List views that can resolve an embed for a whole page of parents at once set this to
+    # the name of the foreign key on their rows that points back at the embedding parent,
+    # and implement `get_embed_batch_queryset`.
+    embed_batch_field = None
+
     def __init__(self, **kwargs):
         assert getattr(self, 'view_name', None), 'Must specify view_name on view.'
         assert getattr(self, 'view_category', None), 'Must specify view_category on view.'
@@ -135,8 +141,63 @@ class JSONAPIBaseView(generics.GenericAPIView):
 
             return ret
 
+        def prefetch(items):
+            """Resolve this embed for every item of a page with one query per embedded view,
+            instead of letting each item's sub-view run its own queryset.
+            """
+            if not hasattr(field, 'resolve'):
+                # Not an embeddable field; the serializer reports it as an invalid embed
+                return
+
+            batch_parents = defaultdict(list)
+            for item in items:
+                try:
+                    v, view_args, view_kwargs = field.resolve(item, field_name, self.request)
+                except (NoReverseMatch, Resolver404):
+                    continue
+                view_cls = getattr(v, 'cls', None)
+                if view_cls and view_cls.embed_batch_field and issubclass(view_cls, ListModelMixin):
+                    batch_parents[view_cls].append(item)
+
+            if not hasattr(self.request._request, '_embed_batches'):
+                self.request._request._embed_batches = {}
+            batches = self.request._request._embed_batches
+
+            for view_cls, parents in batch_parents.items():
+                view = view_cls()
+                view.args = ()
+                view.kwargs = {'is_embedded': True}
+                view.request = self.request
+
+                parents_by_pk = {parent.pk: parent for parent in parents}
+                rows = defaultdict(list)
+                for row in view.get_embed_batch_queryset(parents):
+                    parent = parents_by_pk[getattr(row, f'{view_cls.embed_batch_field}_id')]
+                    # Avoid a query per row when the row refers back to its parent
+                    setattr(row, view_cls.embed_batch_field, parent)
+                    rows[parent.pk].append(row)
+
+                for parent in parents:
+                    batches[(view_cls, parent.pk)] = rows[parent.pk]
+
+        partial.prefetch = prefetch
         return partial
 
+    def get_embed_batch_queryset(self, parents):
+        """Return the rows of this list view for all of `parents`, ordered as the view would
+        order them. Required when `embed_batch_field` is set.
+        """
+        raise NotImplementedError('Must define get_embed_batch_queryset when embed_batch_field is set')
+
+    def get_embedded_batch(self, parent):
+        """Return the rows prefetched for `parent` by a batched embed, or None if this view
+        is not being embedded from a page that was prefetched.
+        """
+        if not self.kwargs.get('is_embedded'):
+            return None
+        batches = getattr(self.request._request, '_embed_batches', {})
+        return batches.get((type(self), parent.pk))
+
     def get_serializer_context(self):
         """Inject request into the serializer context. Additionally, inject partial functions
         (request, object -> embed items) if the query string contains embeds.  Allows
@@ -516,12 +577,21 @@ class BaseContributorList(JSONAPIBaseView, generics.ListAPIView, ListFilterMixin
     DEFAULT_OPERATORS = ('eq', 'ne', 'exact')
 
     ordering = ('-user__modified',)
+    embed_batch_field = 'node'
 
     def get_default_queryset(self):
         node = self.get_node()
+        batch = self.get_embedded_batch(node)
+        if batch is not None:
+            return batch
 
         return node.contributor_set.all().prefetch_related('user__guids')
 
+    def get_embed_batch_queryset(self, parents):
+        return Contributor.objects.filter(
+            node__in=parents,
+        ).select_related('user').prefetch_related('user__guids').order_by('node_id', '_order')
+
     def get_queryset(self):
         queryset = self.get_queryset_from_request()
         # If bulk request, queryset only contains contributors in request
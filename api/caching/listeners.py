@@ -1,10 +1,37 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
 from api.caching.tasks import ban_url
+from api.caching.utils import forget_waterbutler_auth
 from framework.postcommit_tasks.handlers import enqueue_postcommit_task
 
 # unused for now
-# from django.dispatch import receiver
-# from django.db.models.signals import post_save
 # @receiver(post_save)
 def ban_object_from_cache(sender, instance, **kwargs):
     if hasattr(instance, 'absolute_api_v2_url'):
         enqueue_postcommit_task(ban_url, (instance,), {}, celery=False, once_per_request=True)
+
+
+@receiver(m2m_changed, sender='osf.osfuser_groups')
+def forget_waterbutler_auth_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Contributor and admin permissions are group memberships, so any change to a user's
+    groups drops that user's cached WaterButler permission decisions.
+    """
+    if action in ('post_add', 'post_remove'):
+        forget_waterbutler_auth(user_ids=pk_set if reverse else [instance.pk])
+    elif action == 'pre_clear':
+        forget_waterbutler_auth(user_ids=instance.user_set.values_list('id', flat=True) if reverse else [instance.pk])
+
+
+@receiver(post_save, sender='osf.NodeGroupObjectPermission')
+@receiver(post_delete, sender='osf.NodeGroupObjectPermission')
+@receiver(post_save, sender='osf.PreprintGroupObjectPermission')
+@receiver(post_delete, sender='osf.PreprintGroupObjectPermission')
+def forget_waterbutler_auth_on_permission_change(sender, instance, **kwargs):
+    forget_waterbutler_auth(resource=instance.content_object)
+
+
+@receiver(post_save, sender='addons_osfstorage.NodeSettings')
+def forget_waterbutler_auth_on_storage_change(sender, instance, **kwargs):
+    if instance.owner_id:
+        forget_waterbutler_auth(resource=instance.owner)
@@ -1,3 +1,7 @@
 NEVER_TIMEOUT = None  # for django caches setting None as a timeout value means the cache never times out.
 
 STORAGE_USAGE_KEY = 'storage_usage:{target_id}'
+
+WATERBUTLER_AUTH_GENERATION_KEY = 'waterbutler_auth:{kind}:{id}'
+WATERBUTLER_PERMISSION_KEY = 'waterbutler_auth:permission:{user_generation}:{resource_generation}:{user_id}:{resource_id}:{permission}'
+WATERBUTLER_CONFIG_KEY = 'waterbutler_auth:config:{resource_generation}:{resource_id}:{provider}:{name}'
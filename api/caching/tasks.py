@@ -1,9 +1,14 @@
+from collections import Counter, defaultdict
 import logging
+import re
+import threading
+import time
 from urllib.parse import urlparse
 
 from django.apps import apps
 from django.db import connection
 from django.db.models import Sum
+from gevent.pool import Pool
 import requests
 
 from api.caching.utils import storage_usage_cache
@@ -24,93 +29,147 @@ def get_varnish_servers():
     return settings.VARNISH_SERVERS
 
 
-def get_bannable_urls(instance):
+def get_bannable_paths(instance):
+    """Return the API paths to ban for ``instance`` and the hostname they are served under."""
     from osf.models import Comment
-    bannable_urls = []
-    parsed_absolute_url = {}
 
     if not hasattr(instance, 'absolute_api_v2_url'):
         logger.warning(f'Tried to ban {instance.__class__}:{instance} but it didn\'t have an absolute_api_v2_url method')
         return [], ''
 
-    for host in get_varnish_servers():
-        # add instance url
-        varnish_parsed_url = urlparse(host)
-        parsed_absolute_url = urlparse(instance.absolute_api_v2_url)
-        url_string = '{scheme}://{netloc}{path}.*'.format(
-            scheme=varnish_parsed_url.scheme,
-            netloc=varnish_parsed_url.netloc,
-            path=parsed_absolute_url.path,
-        )
-        bannable_urls.append(url_string)
-        if isinstance(instance, Comment):
-            try:
-                parsed_target_url = urlparse(instance.target.referent.absolute_api_v2_url)
-            except AttributeError:
-                # some referents don't have an absolute_api_v2_url
-                # I'm looking at you NodeWikiPage
-                # Note: NodeWikiPage has been deprecated. Is this an issue with WikiPage/WikiVersion?
-                pass
-            else:
-                url_string = '{scheme}://{netloc}{path}.*'.format(
-                    scheme=varnish_parsed_url.scheme,
-                    netloc=varnish_parsed_url.netloc,
-                    path=parsed_target_url.path,
-                )
-                bannable_urls.append(url_string)
+    parsed_absolute_url = urlparse(instance.absolute_api_v2_url)
+    bannable_paths = [parsed_absolute_url.path]
+    if isinstance(instance, Comment):
+        try:
+            bannable_paths.append(urlparse(instance.target.referent.absolute_api_v2_url).path)
+        except AttributeError:
+            # some referents don't have an absolute_api_v2_url
+            # I'm looking at you NodeWikiPage
+            # Note: NodeWikiPage has been deprecated. Is this an issue with WikiPage/WikiVersion?
+            pass
+
+        try:
+            bannable_paths.append(urlparse(instance.root_target.referent.absolute_api_v2_url).path)
+        except AttributeError:
+            # some root_targets don't have an absolute_api_v2_url
+            pass
+
+    return bannable_paths, parsed_absolute_url.hostname
+
+
+class BanCoalescer:
+    """Collects bannable paths from every ``ban_url`` call in this process and sends them
+    to the varnish servers together.
+
+    The first caller to add paths to an empty batch waits ``window`` seconds for other
+    callers (the rest of the request's postcommit tasks, or other requests) to add theirs,
+    then flushes the whole batch. If that flush hasn't started ``timeout`` seconds after the
+    window closed, the leader is taken to have stalled and the next caller flushes instead.
+    Paths are combined into regex bans of up to ``batch_size`` paths each and every server is
+    banned concurrently. Per-server counters are kept in ``metrics``.
+    """
 
+    def __init__(self, window=None, batch_size=None, timeout=None):
+        self.window = settings.VARNISH_BAN_COALESCE_WINDOW if window is None else window
+        self.batch_size = settings.VARNISH_BAN_BATCH_SIZE if batch_size is None else batch_size
+        self.timeout = settings.VARNISH_BAN_TIMEOUT if timeout is None else timeout
+        self.metrics = defaultdict(Counter)
+        self._pending = defaultdict(set)
+        self._started = None
+        self._lock = threading.Lock()
+
+    def add(self, hostname, paths):
+        """Queue ``paths`` for banning. Returns True if this caller should flush the batch."""
+        now = time.monotonic()
+        with self._lock:
+            leader = not self._pending
+            if not leader and now - self._started > self.window + self.timeout:
+                pending = sum(len(paths) for paths in self._pending.values())
+                logger.warning(f'Flushing {pending} varnish bans left pending for {now - self._started:.1f}s')
+                leader = True
+            if leader:
+                self._started = now
+            self._pending[hostname].update(paths)
+        return leader
+
+    def ban(self, hostname, paths):
+        if not paths:
+            return
+        if self.add(hostname, paths):
             try:
-                parsed_root_target_url = urlparse(instance.root_target.referent.absolute_api_v2_url)
-            except AttributeError:
-                # some root_targets don't have an absolute_api_v2_url
-                pass
+                if self.window:
+                    time.sleep(self.window)
+            finally:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(set)
+        bans = [
+            (hostname, self.get_ban_patterns(sorted(paths)))
+            for hostname, paths in pending.items()
+        ]
+        servers = get_varnish_servers()
+        if not bans or not servers:
+            return
+        pool = Pool(len(servers))
+        for server in servers:
+            pool.spawn(self.ban_server, server, bans)
+        pool.join()
+
+    def get_ban_patterns(self, paths):
+        """Split ``paths`` into regex patterns of at most ``batch_size`` alternatives.
+        A single path is returned unchanged so it can be sent as a plain ban URL.
+        """
+        patterns = []
+        for i in range(0, len(paths), self.batch_size):
+            chunk = paths[i:i + self.batch_size]
+            if len(chunk) == 1:
+                patterns.append(chunk[0])
             else:
-                url_string = '{scheme}://{netloc}{path}.*'.format(
-                    scheme=varnish_parsed_url.scheme,
-                    netloc=varnish_parsed_url.netloc,
-                    path=parsed_root_target_url.path,
-                )
-                bannable_urls.append(url_string)
+                patterns.append('^(?:{})'.format('|'.join(re.escape(path) for path in chunk)))
+        return patterns
+
+    def ban_server(self, server, bans):
+        varnish_parsed_url = urlparse(server)
+        started = time.monotonic()
+        metrics = self.metrics[varnish_parsed_url.netloc]
+        failed = 0
+        for hostname, patterns in bans:
+            for pattern in patterns:
+                headers = {'Host': hostname}
+                if pattern.startswith('^'):
+                    # Combined bans can't be expressed as a URL; the VCL reads the regex from the header
+                    url_to_ban = f'{varnish_parsed_url.scheme}://{varnish_parsed_url.netloc}/'
+                    headers[settings.VARNISH_BAN_PATTERN_HEADER] = f'{pattern}.*'
+                else:
+                    url_to_ban = f'{varnish_parsed_url.scheme}://{varnish_parsed_url.netloc}{pattern}.*'
+                try:
+                    response = requests.request('BAN', url_to_ban, timeout=self.timeout, headers=headers)
+                except Exception as ex:
+                    failed += 1
+                    logger.error(f'Banning {pattern} on {server} failed: {ex}')
+                    continue
+                if not response.ok:
+                    failed += 1
+                    logger.error(f'Banning {pattern} on {server} failed: {response.text}')
+        elapsed = time.monotonic() - started
+        sent = sum(len(patterns) for _, patterns in bans)
+        metrics['bans'] += sent
+        metrics['failures'] += failed
+        metrics['milliseconds'] += int(elapsed * 1000)
+        logger.info(f'Sent {sent} bans to {server} in {elapsed * 1000:.0f}ms ({failed} failed)')
+
 
-    return bannable_urls, parsed_absolute_url.hostname
+ban_coalescer = BanCoalescer()
 
 
 # this task is not runnable with celery as instance is not json serializable
 @app.task(max_retries=5, default_retry_delay=60)
 def ban_url(instance):
-    # TODO: Refactor; Pull url generation into postcommit_task handling so we only ban urls once per request
-    timeout = 0.3  # 300ms timeout for bans
     if settings.ENABLE_VARNISH:
-        bannable_urls, hostname = get_bannable_urls(instance)
-
-        for url_to_ban in set(bannable_urls):
-            try:
-                response = requests.request(
-                    'BAN', url_to_ban, timeout=timeout, headers=dict(
-                        Host=hostname,
-                    ),
-                )
-            except Exception as ex:
-                logger.error(
-                    'Banning {} failed: {}'.format(
-                        url_to_ban,
-                        ex.message,
-                    ),
-                )
-            else:
-                if not response.ok:
-                    logger.error(
-                        'Banning {} failed: {}'.format(
-                            url_to_ban,
-                            response.text,
-                        ),
-                    )
-                else:
-                    logger.info(
-                        'Banning {} succeeded'.format(
-                            url_to_ban,
-                        ),
-                    )
+        bannable_paths, hostname = get_bannable_paths(instance)
+        ban_coalescer.ban(hostname, bannable_paths)
 
 
 @app.task(max_retries=5, default_retry_delay=10)
@@ -124,42 +183,67 @@ def update_storage_usage_cache(target_id, target_guid, per_page=_DEFAULT_FILEVER
 
 
 def compute_storage_usage_total(target_obj, per_page=_DEFAULT_FILEVERSION_PAGE_SIZE):
+    return sum(compute_storage_usage_by_region(target_obj, per_page=per_page).values())
+
+
+def compute_storage_usage_by_region(target_obj, per_page=_DEFAULT_FILEVERSION_PAGE_SIZE):
+    """Sum the sizes of a target's live osfstorage file versions per region, walking the
+    file/version links in pages keyed on their id rather than with OFFSET.
+
+    :return dict: region id -> bytes
+    """
     from django.contrib.contenttypes.models import ContentType
     sql = """
-        SELECT count(size), sum(size) from
-        (SELECT size FROM osf_basefileversionsthrough AS obfnv
+        SELECT file_page.region_id, count(file_page.id), sum(file_page.size), max(file_page.id) from
+        (SELECT obfnv.id, version.region_id, version.size FROM osf_basefileversionsthrough AS obfnv
         LEFT JOIN osf_basefilenode file ON obfnv.basefilenode_id = file.id
         LEFT JOIN osf_fileversion version ON obfnv.fileversion_id = version.id
         WHERE file.provider = 'osfstorage'
         AND file.deleted_on IS NULL
         AND file.target_object_id=%(target_pk)s
         AND file.target_content_type_id=%(target_content_type_pk)s
-        ORDER BY version.id
-        LIMIT %(per_page)s OFFSET %(offset)s
+        AND obfnv.id > %(last_id)s
+        ORDER BY obfnv.id
+        LIMIT %(per_page)s
     ) file_page
+    GROUP BY file_page.region_id
     """
-    last_count = 1  # initialize non-zero
-    offset = 0
-    storage_usage_total = 0
+    last_id = 0
+    usage_by_region = {}
     content_type_pk = ContentType.objects.get_for_model(target_obj).pk
     with connection.cursor() as cursor:
-        while last_count:
+        while True:
             cursor.execute(
                 sql, {
                     'target_pk': target_obj.pk,
                     'target_content_type_pk': content_type_pk,
                     'per_page': per_page,
-                    'offset': offset,
+                    'last_id': last_id,
                 },
             )
-            this_count, size_sum = cursor.fetchall()[0]
-            storage_usage_total += int(size_sum or 0)
-            last_count = (this_count or 0)
-            offset += last_count
-    return storage_usage_total
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            for region_id, _, size_sum, max_id in rows:
+                usage_by_region[region_id] = usage_by_region.get(region_id, 0) + int(size_sum or 0)
+                last_id = max(last_id, max_id)
+    return usage_by_region
+
+
+def get_storage_usage_from_ledger(target_obj):
+    """Usage recorded for the target in the osfstorage ledger, or None if the ledger is
+    disabled or the target is not tracked by it.
+    """
+    if not settings.ENABLE_STORAGE_USAGE_LEDGER:
+        return None
+    StorageUsage = apps.get_model('addons_osfstorage.StorageUsage')
+    return StorageUsage.objects.total_for_target(target_obj)
 
 
 def get_storage_usage_total(target_obj):
+    _storage_usage_total = get_storage_usage_from_ledger(target_obj)
+    if _storage_usage_total is not None:
+        return _storage_usage_total
     if not settings.ENABLE_STORAGE_USAGE_CACHE:
         return compute_storage_usage_total(target_obj)
     _cache_key = cache_settings.STORAGE_USAGE_KEY.format(target_id=target_obj._id)
@@ -0,0 +1,80 @@
+from unittest import mock
+
+import pytest
+
+from api.caching.tasks import BanCoalescer
+
+
+@pytest.fixture()
+def varnish_servers():
+    servers = ['http://varnish-1:8080', 'http://varnish-2:8080']
+    with mock.patch('api.caching.tasks.get_varnish_servers', return_value=servers):
+        yield servers
+
+
+@pytest.fixture()
+def mock_ban():
+    with mock.patch('api.caching.tasks.requests.request') as mock_request:
+        mock_request.return_value.ok = True
+        yield mock_request
+
+
+class TestBanCoalescer:
+
+    def test_single_paths_are_sent_as_urls(self, varnish_servers, mock_ban):
+        coalescer = BanCoalescer(window=0, batch_size=1, timeout=0.3)
+        coalescer.add('api.osf.io', ['/v2/nodes/abcde/', '/v2/nodes/fghij/'])
+        coalescer.add('api.osf.io', ['/v2/nodes/abcde/'])
+        coalescer.flush()
+
+        urls = sorted(call[0][1] for call in mock_ban.call_args_list)
+        assert urls == [
+            'http://varnish-1:8080/v2/nodes/abcde/.*',
+            'http://varnish-1:8080/v2/nodes/fghij/.*',
+            'http://varnish-2:8080/v2/nodes/abcde/.*',
+            'http://varnish-2:8080/v2/nodes/fghij/.*',
+        ]
+        assert coalescer.metrics['varnish-1:8080']['bans'] == 2
+        assert coalescer.metrics['varnish-2:8080']['failures'] == 0
+
+    @mock.patch('website.settings.VARNISH_BAN_PATTERN_HEADER', 'X-Ban-Url')
+    def test_paths_are_combined(self, varnish_servers, mock_ban):
+        coalescer = BanCoalescer(window=0, batch_size=10, timeout=0.3)
+        coalescer.add('api.osf.io', ['/v2/nodes/abcde/', '/v2/nodes/fghij/'])
+        coalescer.flush()
+
+        assert mock_ban.call_count == 2
+        for call in mock_ban.call_args_list:
+            assert call[0][1].endswith(':8080/')
+            assert call[1]['headers'] == {
+                'Host': 'api.osf.io',
+                'X-Ban-Url': '^(?:/v2/nodes/abcde/|/v2/nodes/fghij/).*',
+            }
+
+    def test_flush_empties_the_batch(self, varnish_servers, mock_ban):
+        coalescer = BanCoalescer(window=0, batch_size=1, timeout=0.3)
+        assert coalescer.add('api.osf.io', ['/v2/nodes/abcde/'])
+        assert not coalescer.add('api.osf.io', ['/v2/nodes/fghij/'])
+        coalescer.flush()
+        mock_ban.reset_mock()
+
+        coalescer.flush()
+        assert not mock_ban.called
+
+    def test_stalled_batch_is_flushed_by_next_caller(self, varnish_servers, mock_ban):
+        coalescer = BanCoalescer(window=0, batch_size=1, timeout=0.3)
+        assert coalescer.add('api.osf.io', ['/v2/nodes/abcde/'])
+        assert not coalescer.add('api.osf.io', ['/v2/nodes/fghij/'])
+        # the leader never got round to flushing
+        coalescer._started -= 1
+
+        coalescer.ban('api.osf.io', ['/v2/nodes/klmno/'])
+        assert mock_ban.call_count == 6
+
+    def test_failures_are_counted(self, varnish_servers, mock_ban):
+        mock_ban.side_effect = Exception('timed out')
+        coalescer = BanCoalescer(window=0, batch_size=1, timeout=0.3)
+        coalescer.ban('api.osf.io', ['/v2/nodes/abcde/'])
+
+        assert coalescer.metrics['varnish-1:8080']['failures'] == 1
+        assert coalescer.metrics['varnish-2:8080']['failures'] == 1
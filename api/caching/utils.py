@@ -1,4 +1,52 @@
+import uuid
+
 from django.core.cache import caches
 from django.conf import settings
 
+from api.caching import settings as cache_settings
+
 storage_usage_cache = caches[settings.STORAGE_USAGE_CACHE_NAME]
+waterbutler_auth_cache = caches[settings.WATERBUTLER_AUTH_CACHE_NAME]
+
+
+def _new_generation():
+    # Unique per bump; a generation lost to eviction then can't line up with stale keys again
+    return uuid.uuid4().hex
+
+
+def get_waterbutler_auth_generation(kind, id):
+    key = cache_settings.WATERBUTLER_AUTH_GENERATION_KEY.format(kind=kind, id=id)
+    return waterbutler_auth_cache.get_or_set(key, _new_generation, cache_settings.NEVER_TIMEOUT)
+
+
+def get_waterbutler_permission_key(resource, user, permission):
+    """Key for a cached WaterButler permission decision. Keys include the current generation
+    of both the resource and the user, so that bumping either drops the decision.
+    """
+    user_id = user.pk if user else None
+    return cache_settings.WATERBUTLER_PERMISSION_KEY.format(
+        user_generation=get_waterbutler_auth_generation('user', user_id),
+        resource_generation=get_waterbutler_auth_generation('resource', resource._id),
+        user_id=user_id,
+        resource_id=resource._id,
+        permission=permission,
+    )
+
+
+def get_waterbutler_config_key(resource, provider, name):
+    return cache_settings.WATERBUTLER_CONFIG_KEY.format(
+        resource_generation=get_waterbutler_auth_generation('resource', resource._id),
+        resource_id=resource._id,
+        provider=provider,
+        name=name,
+    )
+
+
+def forget_waterbutler_auth(resource=None, user_ids=()):
+    """Drop cached WaterButler permission decisions and settings for a resource and/or users."""
+    if resource is not None and resource._id:
+        key = cache_settings.WATERBUTLER_AUTH_GENERATION_KEY.format(kind='resource', id=resource._id)
+        waterbutler_auth_cache.set(key, _new_generation(), cache_settings.NEVER_TIMEOUT)
+    for user_id in user_ids:
+        key = cache_settings.WATERBUTLER_AUTH_GENERATION_KEY.format(kind='user', id=user_id)
+        waterbutler_auth_cache.set(key, _new_generation(), cache_settings.NEVER_TIMEOUT)
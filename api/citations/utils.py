@@ -1,3 +1,4 @@
+import functools
 import os
 import re
 from rest_framework import status as http_status
@@ -12,6 +13,8 @@ from framework.auth import utils
 from osf.models.citation import CitationStyle
 from website.settings import CITATION_STYLES_PATH, BASE_PATH, CUSTOM_CITATIONS
 
+STYLE_CACHE_SIZE = 128
+
 
 def clean_up_common_errors(cit):
     cit = re.sub(r'\.+', '.', cit)
@@ -42,28 +45,34 @@ def process_name(node, user):
     }
 
 
-def render_citation(node, style='apa'):
-    """Given a node, return a citation"""
-    reformat_styles = ['apa', 'chicago-author-date', 'modern-language-association']
-    csl = node.csl
-    data = [csl]
-
-    bib_source = CiteProcJSON(data)
-
+@functools.lru_cache(maxsize=STYLE_CACHE_SIZE)
+def get_citation_style(style):
+    """Parse a CSL style once per process, resolving dependent styles to their parent."""
     custom = CUSTOM_CITATIONS.get(style, False)
     path = os.path.join(BASE_PATH, 'static', custom) if custom else os.path.join(CITATION_STYLES_PATH, style)
 
     try:
-        bib_style = CitationStylesStyle(path, validate=False)
+        return CitationStylesStyle(path, validate=False)
     except ValueError:
         citation_style = CitationStyle.load(style)
         if citation_style is not None and citation_style.has_parent_style:
             parent_style = citation_style.parent_style
             parent_path = os.path.join(CITATION_STYLES_PATH, parent_style)
-            bib_style = CitationStylesStyle(parent_path, validate=False)
+            return CitationStylesStyle(parent_path, validate=False)
         else:
             raise ValueError(f'Unable to find a dependent or independent parent style related to {style}.csl')
 
+
+def render_citation(node, style='apa'):
+    """Given a node, return a citation"""
+    reformat_styles = ['apa', 'chicago-author-date', 'modern-language-association']
+    csl = node.csl
+    data = [csl]
+
+    bib_source = CiteProcJSON(data)
+
+    bib_style = get_citation_style(style)
+
     bibliography = CitationStylesBibliography(bib_style, bib_source, formatter.plain)
 
     citation = Citation([CitationItem(node._id)])
@@ -99,6 +108,17 @@ def render_citation(node, style='apa'):
 
     return cit
 
+
+def render_citations(nodes, style='apa'):
+    """Given nodes or preprints, return a dict of their _ids to citations in one style.
+
+    The style is parsed once for all of them. Each citation is still rendered in a bibliography
+    of its own: sharing one would disambiguate entries against each other (e.g. "2016a", "2016b")
+    and change what each citation reads compared to `render_citation`.
+    """
+    get_citation_style(style)  # Fail before rendering anything if the style doesn't exist
+    return {node._id: render_citation(node, style) for node in nodes}
+
 def add_period_to_title(cit):
     title_split = cit.split('”')  # quote is ” (\xe2\x80\x9d) not normal "
     if len(title_split) == 2 and title_split[0][-1] != '.':
@@ -3,6 +3,7 @@ from rest_framework import permissions as drf_permissions, exceptions
 from framework.auth.oauth_scopes import CoreScopes
 
 from api.base import permissions as base_permissions
+from api.base.annotations import make_current_user_permission_annotations
 from api.base.pagination import DraftRegistrationContributorPagination
 from api.draft_registrations.permissions import (
     DraftContributorDetailPermissions,
@@ -28,7 +29,7 @@ from api.nodes.views import (
 )
 from api.nodes.permissions import ContributorOrPublic, AdminDeletePermissions
 from api.subjects.views import SubjectRelationshipBaseView, BaseResourceSubjectsList
-from osf.models import DraftRegistrationContributor
+from osf.models import DraftRegistration, DraftRegistrationContributor
 
 class DraftRegistrationMixin(DraftMixin):
     """
@@ -70,7 +71,9 @@ class DraftRegistrationList(NodeDraftRegistrationsList):
         if user.is_anonymous:
             raise exceptions.NotAuthenticated()
         # Returns DraftRegistrations for which a user is a contributor
-        return user.draft_registrations_active
+        return user.draft_registrations_active.annotate(
+            **make_current_user_permission_annotations(user, DraftRegistration),
+        )
 
 class DraftRegistrationDetail(NodeDraftRegistrationDetail, DraftRegistrationMixin):
     permission_classes = (
@@ -172,12 +175,22 @@ class DraftContributorsList(NodeContributorsList, DraftRegistrationMixin):
     view_category = 'draft_registrations'
     view_name = 'draft-registration-contributors'
     serializer_class = DraftRegistrationContributorsSerializer
+    embed_batch_field = 'draft_registration'
 
     def get_default_queryset(self):
         # Overrides NodeContributorsList
         draft = self.get_draft()
+        batch = self.get_embedded_batch(draft)
+        if batch is not None:
+            return batch
         return draft.draftregistrationcontributor_set.all().prefetch_related('user__guids')
 
+    # Overrides NodeContributorsList
+    def get_embed_batch_queryset(self, parents):
+        return DraftRegistrationContributor.objects.filter(
+            draft_registration__in=parents,
+        ).select_related('user').prefetch_related('user__guids').order_by('draft_registration_id', '_order')
+
     # overrides NodeContributorsList
     def get_serializer_class(self):
         if self.request.method in ('PUT', 'PATCH', 'DELETE'):
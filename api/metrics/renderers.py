@@ -1,5 +1,6 @@
 import csv
 import io
+import itertools
 import json
 from django.http import Http404
 
@@ -48,19 +49,32 @@ class MetricsReportsRenderer(renderers.BaseRenderer):
             jsonapi_resource['attributes']
             for jsonapi_resource in json_response['data']
         )
+        return ''.join(self.stream(serialized_reports))
+
+    def stream(self, serialized_reports):
+        """Yield the csv a row at a time, with the header taken from the first report.
+
+        Raises Http404 (before yielding anything) if there are no reports.
+        """
+        serialized_reports = iter(serialized_reports)
         try:
             first_row = next(serialized_reports)
         except StopIteration:
             raise Http404('<h1>none found</h1>')
+        return self._stream_rows(first_row, serialized_reports)
+
+    def _stream_rows(self, first_row, serialized_reports):
         csv_fieldnames = list(get_nested_keys(first_row))
-        csv_filecontent = io.StringIO(newline='')
-        csv_writer = csv.writer(csv_filecontent, dialect=self.CSV_DIALECT)
-        csv_writer.writerow(csv_fieldnames)
-        for serialized_report in (first_row, *serialized_reports):
-            csv_writer.writerow(
-                get_csv_row(csv_fieldnames, serialized_report),
-            )
-        return csv_filecontent.getvalue()
+        csv_line = io.StringIO(newline='')
+        csv_writer = csv.writer(csv_line, dialect=self.CSV_DIALECT)
+        for row in itertools.chain(
+            [csv_fieldnames],
+            (get_csv_row(csv_fieldnames, report) for report in itertools.chain([first_row], serialized_reports)),
+        ):
+            csv_writer.writerow(row)
+            yield csv_line.getvalue()
+            csv_line.seek(0)
+            csv_line.truncate()
 
 
 class MetricsReportsCsvRenderer(MetricsReportsRenderer):
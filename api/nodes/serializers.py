@@ -1,6 +1,7 @@
 import functools
 
 from django.db import connection
+from django.db.models import Count
 from packaging.version import Version
 
 from api.base.exceptions import (
@@ -37,8 +38,9 @@ from addons.base.exceptions import InvalidAuthError, InvalidFolderError
 from addons.osfstorage.models import Region
 from osf.exceptions import NodeStateError
 from osf.models import (
-    Comment, DraftRegistration, ExternalAccount,
+    Comment, Contributor, DraftRegistration, ExternalAccount,
     RegistrationSchema, AbstractNode, PrivateLink, Preprint,
+    NodeLog, NodeRelation,
     RegistrationProvider, NodeLicense, DraftNode,
     Registration, Node, OSFUser,
 )
@@ -75,6 +77,17 @@ class NodeTagField(ser.Field):
         return data
 
 
+def _count_by(queryset, group_field, count_field='id'):
+    """
+    Returns {group_field value: number of distinct count_field values} for the rows of queryset
+    """
+    return dict(
+        queryset.order_by().values(group_field)
+        .annotate(count=Count(count_field, distinct=True))
+        .values_list(group_field, 'count'),
+    )
+
+
 def get_or_add_license_to_serializer_context(serializer, node):
     """
     Returns license, and adds license to serializer context with format
@@ -256,6 +269,21 @@ class NodeSerializer(TaxonomizableSerializerMixin, JSONAPISerializer):
         'wikis',
     ]
 
+    related_count_batches = {
+        'get_node_count': 'batch_node_count',
+        'get_collection_count': 'batch_collection_count',
+        'get_contrib_count': 'batch_contrib_count',
+        'get_logs_count': 'batch_logs_count',
+        'get_pointers_count': 'batch_pointers_count',
+        'get_wiki_page_count': 'batch_wiki_page_count',
+        'get_node_links_count': 'batch_node_links_count',
+        'get_registration_links_count': 'batch_registration_links_count',
+        'get_view_only_links_count': 'batch_view_only_links_count',
+        'get_linked_by_nodes_count': 'batch_linked_by_nodes_count',
+        'get_linked_by_registrations_count': 'batch_linked_by_registrations_count',
+        'get_forks_count': 'batch_forks_count',
+    }
+
     id = IDField(source='_id', read_only=True)
     type = TypeField()
 
@@ -566,8 +594,13 @@ class NodeSerializer(TaxonomizableSerializerMixin, JSONAPISerializer):
             user_perms = obj.get_permissions(user)[::-1]
 
         user_perms = user_perms or default_perm
-        if not user_perms and user in getattr(obj, 'parent_admin_users', []):
-            user_perms = [osf_permissions.READ]
+        if not user_perms:
+            if hasattr(obj, 'has_parent_admin'):
+                is_parent_admin = obj.has_parent_admin
+            else:
+                is_parent_admin = user in getattr(obj, 'parent_admin_users', [])
+            if is_parent_admin:
+                user_perms = [osf_permissions.READ]
         return user_perms
 
     def get_current_user_can_comment(self, obj):
@@ -578,7 +611,7 @@ class NodeSerializer(TaxonomizableSerializerMixin, JSONAPISerializer):
             if obj.comment_level == 'public':
                 return auth.logged_in and (
                     obj.is_public or
-                    (auth.user and obj.has_read)
+                    (auth.user and (obj.has_read or getattr(obj, 'has_parent_admin', False)))
                 )
             return obj.has_read or False
         else:
@@ -739,6 +772,140 @@ class NodeSerializer(TaxonomizableSerializerMixin, JSONAPISerializer):
     def get_forks_count(self, obj):
         return obj.forks.exclude(type='osf.registration').exclude(is_deleted=True).count()
 
+    # Page-wide versions of the count methods above, see `related_count_batches`
+
+    def batch_logs_count(self, nodes):
+        return _count_by(NodeLog.objects.filter(node__in=nodes), 'node_id')
+
+    def batch_collection_count(self, nodes):
+        nodes_by_guid = {node._id: node.pk for node in nodes}
+        counts = _count_by(CollectionSubmission.objects.filter(guid___id__in=nodes_by_guid), 'guid___id')
+        return {nodes_by_guid[guid]: count for guid, count in counts.items()}
+
+    def batch_node_count(self, nodes):
+        auth = get_user_auth(self.context['request'])
+        user_id = getattr(auth.user, 'id', None)
+        node_ids = [node.id for node in nodes]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH RECURSIVE parents AS (
+                  SELECT child_id AS node_id, parent_id
+                  FROM osf_noderelation
+                  WHERE child_id = ANY(%s) AND is_node_link IS FALSE
+                UNION ALL
+                  SELECT parents.node_id, osf_noderelation.parent_id
+                  FROM parents JOIN osf_noderelation ON parents.parent_id = osf_noderelation.child_id
+                  WHERE osf_noderelation.is_node_link IS FALSE
+                ), admin_nodes AS (
+                    SELECT G.content_object_id AS node_id
+                    FROM auth_permission AS P
+                    INNER JOIN osf_nodegroupobjectpermission AS G ON (P.id = G.permission_id)
+                    INNER JOIN osf_osfuser_groups AS UG ON (G.group_id = UG.group_id)
+                    WHERE (P.codename = 'admin_node'
+                           AND (G.content_object_id IN (
+                                SELECT parent_id
+                                FROM parents
+                           ) OR G.content_object_id = ANY(%s))
+                           AND UG.osfuser_id = %s)
+                ), has_admin AS (
+                    SELECT node_id FROM admin_nodes
+                  UNION
+                    SELECT parents.node_id
+                    FROM parents JOIN admin_nodes ON parents.parent_id = admin_nodes.node_id
+                )
+                SELECT parent_id, COUNT(DISTINCT child_id)
+                FROM
+                  osf_noderelation
+                JOIN osf_abstractnode ON osf_noderelation.child_id = osf_abstractnode.id
+                LEFT JOIN osf_privatelink_nodes ON osf_abstractnode.id = osf_privatelink_nodes.abstractnode_id
+                LEFT JOIN osf_privatelink ON osf_privatelink_nodes.privatelink_id = osf_privatelink.id
+                WHERE parent_id = ANY(%s) AND is_node_link IS FALSE
+                AND osf_abstractnode.is_deleted IS FALSE
+                AND (
+                  osf_abstractnode.is_public
+                  OR parent_id IN (SELECT node_id FROM has_admin)
+                  OR (SELECT EXISTS(
+                      SELECT P.codename
+                      FROM auth_permission AS P
+                      INNER JOIN osf_nodegroupobjectpermission AS G ON (P.id = G.permission_id)
+                      INNER JOIN osf_osfuser_groups AS UG ON (G.group_id = UG.group_id)
+                      WHERE (P.codename = 'read_node'
+                             AND G.content_object_id = osf_abstractnode.id
+                             AND UG.osfuser_id = %s)
+                      )
+                  )
+                  OR (
+                    osf_abstractnode.type = 'osf.registration'
+                    AND osf_abstractnode.moderation_state IN ('pending', 'pending_withdraw', 'embargo', 'pending_embargo_termination')
+                    AND EXISTS (
+                        SELECT 1
+                        FROM auth_permission AS P2
+                        INNER JOIN osf_abstractprovidergroupobjectpermission AS G2 ON (P2.id = G2.permission_id)
+                        INNER JOIN osf_osfuser_groups AS UG2 ON (G2.group_id = UG2.group_id)
+                        WHERE P2.codename = 'view_submissions'
+                          AND G2.content_object_id = osf_abstractnode.provider_id
+                          AND UG2.osfuser_id = %s
+                    )
+                  )
+                  OR (osf_privatelink.key = %s AND osf_privatelink.is_deleted = FALSE)
+                )
+                GROUP BY parent_id;
+            """, [node_ids, node_ids, user_id, node_ids, user_id, user_id, auth.private_key],
+            )
+
+            return dict(cursor.fetchall())
+
+    def batch_contrib_count(self, nodes):
+        return _count_by(Contributor.objects.filter(node__in=nodes), 'node_id')
+
+    def batch_pointers_count(self, nodes):
+        return _count_by(NodeRelation.objects.filter(parent__in=nodes, is_node_link=True), 'parent_id', 'child_id')
+
+    def batch_wiki_page_count(self, nodes):
+        WikiPage = apps.get_model('addons_wiki.WikiPage')
+        return _count_by(WikiPage.objects.filter(node__in=nodes, deleted__isnull=True), 'node_id')
+
+    def _batch_linked_count(self, nodes, linked_nodes):
+        auth = get_user_auth(self.context['request'])
+        viewable = linked_nodes.filter(is_deleted=False).can_view(auth.user, auth.private_link)
+        return _count_by(
+            NodeRelation.objects.filter(parent__in=nodes, is_node_link=True, child__in=viewable.values('id')),
+            'parent_id', 'child_id',
+        )
+
+    def batch_node_links_count(self, nodes):
+        return self._batch_linked_count(
+            nodes, AbstractNode.objects.exclude(type='osf.collection').exclude(type='osf.registration'),
+        )
+
+    def batch_registration_links_count(self, nodes):
+        return self._batch_linked_count(nodes, AbstractNode.objects.filter(type='osf.registration'))
+
+    def _count_view_only_links(self, nodes):
+        return _count_by(PrivateLink.objects.filter(nodes__in=nodes, is_deleted=False), 'nodes')
+
+    def batch_view_only_links_count(self, nodes):
+        return self._count_view_only_links([node for node in nodes if not node.is_spammy])
+
+    def batch_linked_by_nodes_count(self, nodes):
+        return _count_by(
+            NodeRelation.objects.filter(child__in=nodes, is_node_link=True, parent__is_deleted=False, parent__type='osf.node'),
+            'child_id',
+        )
+
+    def batch_linked_by_registrations_count(self, nodes):
+        return _count_by(
+            NodeRelation.objects.filter(child__in=nodes, is_node_link=True, parent__type='osf.registration', parent__retraction__isnull=True),
+            'child_id',
+        )
+
+    def batch_forks_count(self, nodes):
+        return _count_by(
+            AbstractNode.objects.filter(forked_from__in=nodes).exclude(type='osf.registration').exclude(is_deleted=True),
+            'forked_from_id',
+        )
+
     def get_unread_comments_count(self, obj):
         user = get_user_auth(self.context['request']).user
         node_comments = Comment.find_n_unread(user=user, node=obj, page='node')
@@ -49,6 +49,7 @@ from api.base.throttling import (
     FilesRateThrottle,
     FilesBurstRateThrottle,
 )
+from api.base.annotations import make_current_user_permission_annotations
 from api.base.utils import default_node_list_permission_queryset
 from api.base.utils import get_object_or_error, is_bulk_request, get_user_auth, is_truthy
 from api.base.versioning import DRAFT_REGISTRATION_SERIALIZERS_UPDATE_VERSION
@@ -268,7 +269,11 @@ class NodeList(JSONAPIBaseView, bulk_views.BulkUpdateJSONAPIView, bulk_views.Bul
 
     # overrides NodesFilterMixin
     def get_default_queryset(self):
-        return default_node_list_permission_queryset(user=self.request.user, model_cls=Node)
+        return default_node_list_permission_queryset(
+            user=self.request.user,
+            model_cls=Node,
+            **make_current_user_permission_annotations(self.request.user, Node),
+        )
 
     # overrides ListBulkCreateJSONAPIView, BulkUpdateJSONAPIView
     def get_queryset(self):
@@ -661,8 +666,14 @@ class NodeBibliographicContributorsList(BaseContributorList, NodeMixin):
 
     def get_default_queryset(self):
         contributors = super().get_default_queryset()
+        if isinstance(contributors, list):
+            # Rows prefetched by a batched embed are already limited to bibliographic contributors
+            return contributors
         return contributors.filter(visible=True)
 
+    def get_embed_batch_queryset(self, parents):
+        return super().get_embed_batch_queryset(parents).filter(visible=True)
+
 
 class NodeDraftRegistrationsList(JSONAPIBaseView, generics.ListCreateAPIView, NodeMixin):
     """
@@ -699,7 +710,9 @@ class NodeDraftRegistrationsList(JSONAPIBaseView, generics.ListCreateAPIView, No
         node = self.get_node()
         if user.is_anonymous:
             raise exceptions.NotAuthenticated()
-        return user.draft_registrations_active.filter(branched_from=node)
+        return user.draft_registrations_active.filter(branched_from=node).annotate(
+            **make_current_user_permission_annotations(user, DraftRegistration),
+        )
 
 
 class NodeDraftRegistrationDetail(JSONAPIBaseView, generics.RetrieveUpdateDestroyAPIView, DraftMixin):
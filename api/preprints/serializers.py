@@ -292,6 +292,14 @@ class PreprintSerializer(TaxonomizableSerializerMixin, MetricsSerializerMixin, J
         return f'https://doi.org/{obj.article_doi}' if obj.article_doi else None
 
     def get_current_user_permissions(self, obj):
+        if hasattr(obj, 'has_admin'):
+            if obj.has_admin:
+                return [osf_permissions.ADMIN, osf_permissions.WRITE, osf_permissions.READ]
+            elif obj.has_write:
+                return [osf_permissions.WRITE, osf_permissions.READ]
+            elif obj.has_read:
+                return [osf_permissions.READ]
+            return []
         user = self.context['request'].user
         return obj.get_permissions(user)[::-1]
 
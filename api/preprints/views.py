@@ -21,6 +21,7 @@ from osf.utils.workflows import DefaultStates, ReviewStates
 from api.actions.permissions import ReviewActionPermission
 from api.actions.serializers import ReviewActionSerializer
 from api.actions.views import get_review_actions_queryset
+from api.base.annotations import make_current_user_permission_annotations
 from api.base.pagination import PreprintContributorPagination
 from api.base.exceptions import Conflict, Gone
 from api.base.views import JSONAPIBaseView, WaterButlerMixin
@@ -204,7 +205,10 @@ class PreprintList(JSONAPIBaseView, generics.ListCreateAPIView, PreprintFilterMi
         auth = get_user_auth(self.request)
         auth_user = getattr(auth, 'user', None)
         # Permissions on the list objects are handled by the query
-        return self.preprints_queryset(Preprint.objects.all(), auth_user)
+        return self.preprints_queryset(
+            Preprint.objects.annotate(**make_current_user_permission_annotations(auth_user, Preprint)),
+            auth_user,
+        )
 
     # overrides ListAPIView
     def get_queryset(self):
@@ -461,11 +465,21 @@ class PreprintContributorsList(PreprintOldVersionsImmutableMixin, NodeContributo
     view_category = 'preprints'
     view_name = 'preprint-contributors'
     serializer_class = PreprintContributorsSerializer
+    embed_batch_field = 'preprint'
 
     def get_default_queryset(self):
         preprint = self.get_preprint()
+        batch = self.get_embedded_batch(preprint)
+        if batch is not None:
+            return batch
         return preprint.preprintcontributor_set.all().prefetch_related('user__guids')
 
+    # overrides NodeContributorsList
+    def get_embed_batch_queryset(self, parents):
+        return PreprintContributor.objects.filter(
+            preprint__in=parents,
+        ).select_related('user').prefetch_related('user__guids').order_by('preprint_id', '_order')
+
     # overrides NodeContributorsList
     def get_serializer_class(self):
         """
@@ -555,8 +569,14 @@ class PreprintBibliographicContributorsList(PreprintContributorsList):
 
     def get_default_queryset(self):
         contributors = super().get_default_queryset()
+        if isinstance(contributors, list):
+            # Rows prefetched by a batched embed are already limited to bibliographic contributors
+            return contributors
         return contributors.filter(visible=True)
 
+    def get_embed_batch_queryset(self, parents):
+        return super().get_embed_batch_queryset(parents).filter(visible=True)
+
     def post(self, request, *args, **kwargs):
         raise MethodNotAllowed(method=request.method)
 
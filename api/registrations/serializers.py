@@ -548,6 +548,9 @@ class RegistrationSerializer(NodeSerializer):
     def get_view_only_links_count(self, obj):
         return obj.private_links.filter(is_deleted=False).count()
 
+    def batch_view_only_links_count(self, registrations):
+        return self._count_view_only_links(registrations)
+
     def get_total_comments_count(self, obj):
         return obj.comment_set.filter(page='node', is_deleted=False).count()
 
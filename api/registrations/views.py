@@ -14,6 +14,7 @@ from osf.utils.permissions import WRITE_NODE
 from osf.utils.workflows import ApprovalStates
 
 from api.base import permissions as base_permissions
+from api.base.annotations import make_current_user_permission_annotations
 from api.base import generic_bulk_views as bulk_views
 from api.base.exceptions import Gone
 from api.base.filters import ListFilterMixin
@@ -170,6 +171,7 @@ class RegistrationList(JSONAPIBaseView, generics.ListCreateAPIView, bulk_views.B
             model_cls=Registration,
             revision_state=annotations.REVISION_STATE,
             **resource_annotations.make_open_practice_badge_annotations(),
+            **make_current_user_permission_annotations(self.request.user, Registration),
         )
 
     def is_blacklisted(self):
@@ -311,6 +313,9 @@ class RegistrationContributorsList(BaseContributorList, bulk_views.BulkUpdateJSO
 
     def get_default_queryset(self):
         node = self.get_resource()
+        batch = self.get_embedded_batch(node)
+        if batch is not None:
+            return batch
         return node.contributor_set.all().prefetch_related('user__guids')
 
     def get_queryset(self):
@@ -75,22 +75,25 @@ def retry_shtrove_request(self_celery_task, _response):
     except Exception as e:
         log_exception(e)
         if _response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
-            retry_after = _response.headers.get('Retry-After')
-            try:
-                countdown = int(retry_after)
-            except (TypeError, ValueError):
-                retries = getattr(self_celery_task.request, 'retries', 0)
-                countdown = get_exponential_backoff_interval(
-                    factor=4,
-                    retries=retries,
-                    maximum=2 * 60,
-                    full_jitter=True,
-                )
-            raise self_celery_task.retry(exc=e, countdown=countdown)
+            raise self_celery_task.retry(exc=e, countdown=_retry_after_countdown(self_celery_task, _response))
 
         raise self_celery_task.retry(exc=e)
 
 
+def _retry_after_countdown(self_celery_task, _response) -> int:
+    retry_after = _response.headers.get('Retry-After')
+    try:
+        return int(retry_after)
+    except (TypeError, ValueError):
+        retries = getattr(self_celery_task.request, 'retries', 0)
+        return get_exponential_backoff_interval(
+            factor=4,
+            retries=retries,
+            maximum=2 * 60,
+            full_jitter=True,
+        )
+
+
 def cedar_record_to_turtle(referent, cedar_record):
     graph = Graph()
     iri = referent.get_semantic_iri()
@@ -214,6 +217,97 @@ def task__update_share(self, guid: str, is_backfill=False, osfmap_partition_name
         _resource.mark_indexing_success()
 
 
+@celery_app.task(
+    bind=True,
+    acks_late=True,
+    max_retries=4,
+    retry_backoff=True,
+)
+def task__update_share_chunk(self, guids: list[str], chunk_label=''):
+    """
+    Backfill SHARE/trove current metadata records for a chunk of osf-guid-identified objects,
+    all over one http session (for recataloguing many items without a task per item)
+
+    items that fail are marked not indexed and handed to task__update_share (with its retries);
+    when trove asks to slow down, the rest of the chunk is retried later (or, once the chunk
+    is out of retries, handed to task__update_share item by item)
+    """
+    _osfid_instances = _load_guids_by_osfid(guids)
+    _sent_count = 0
+    _failed_osfids = []
+    with requests.Session() as _session:
+        for _index, _osfid in enumerate(guids):
+            _osfid_instance = _osfid_instances.get(_osfid)
+            if _osfid_instance is None or _osfid_instance.referent is None:
+                logger.warning(f'task__update_share_chunk skipping unknown osfguid "{_osfid}"')
+                continue
+            _osfid_instance.referent.mark_indexing_failed()
+            try:
+                _failed_response = _pls_update_all_trove_records(_osfid_instance, session=_session)
+            except Exception as e:
+                log_exception(e)
+                _failed_osfids.append(_osfid)
+                continue
+            if _failed_response is None:
+                _sent_count += 1
+            elif _failed_response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                if self.request.retries < self.max_retries:
+                    _enqueue_update_share_retries(_failed_osfids)
+                    raise self.retry(
+                        kwargs={'guids': guids[_index:], 'chunk_label': chunk_label},
+                        countdown=_retry_after_countdown(self, _failed_response),
+                    )
+                # out of chunk retries; the rest of the chunk is retried one by one
+                _failed_osfids.extend(guids[_index:])
+                break
+            else:
+                _failed_osfids.append(_osfid)
+    _enqueue_update_share_retries(_failed_osfids)
+    logger.info(
+        f'Sent metadata records for {chunk_label or "chunk"}:'
+        f' {_sent_count} succeeded, {len(_failed_osfids)} left to retry one by one'
+    )
+    return {'sent': _sent_count, 'failed': _failed_osfids}
+
+
+def _load_guids_by_osfid(osfids) -> dict:
+    return apps.get_model('osf.Guid').load_many(osfids)
+
+
+def _pls_update_all_trove_records(osfid_instance, *, session):
+    """
+    send (or delete) every trove record for the item, in order, like a chain of task__update_share
+
+    returns the first failed response (or None, after marking the item indexed)
+    """
+    osf_item = osfid_instance.referent
+    if _should_delete_indexcard(osf_item):
+        _response = pls_delete_trove_record(osf_item, osfmap_partition=OsfmapPartition.MAIN, session=session)
+        return None if _response.ok else _response
+    _osfmap_partition = OsfmapPartition.MAIN
+    while _osfmap_partition is not None:
+        _response = pls_send_trove_record(
+            osf_item,
+            is_backfill=True,
+            osfmap_partition=_osfmap_partition,
+            session=session,
+        )
+        if not _response.ok:
+            return _response
+        _osfmap_partition = _next_osfmap_partition(_osfmap_partition)
+    _schedule_cedar_record_updates(osfid_instance)
+    osf_item.mark_indexing_success()
+    return None
+
+
+def _enqueue_update_share_retries(osfids):
+    for _osfid in osfids:
+        task__update_share.apply_async(
+            kwargs={'guid': _osfid, 'is_backfill': True},
+            queue=settings.CeleryConfig.task_low_queue,
+        )
+
+
 @celery_app.task
 def task__reindex_failed_or_not_indexed_resource_into_share(resource_type: str, start_id: int = 0, chunk_count: int = 200, chunk_size: int = 500):
     from osf.management.commands.recatalog_metadata import recatalog
@@ -247,12 +341,20 @@ def get_not_indexed_guids_for_resource_with_no_indexed_guid(resource_type: str,
     return resource_model.objects.filter(query)
 
 
-def pls_send_trove_record(osf_item, *, is_backfill: bool, osfmap_partition: OsfmapPartition):
+def pls_send_trove_record(
+    osf_item,
+    *,
+    is_backfill: bool,
+    osfmap_partition: OsfmapPartition,
+    session: requests.Session | None = None,
+):
     try:
         _iri = osf_item.get_semantic_iri()
     except (AttributeError, ValueError):
         raise ValueError(f'could not get iri for {osf_item}')
-    _basket = pls_get_magic_metadata_basket(osf_item)
+    # always gather afresh: the push may be for a change to something related,
+    # which cached metadata (keyed on the item's own changes) would miss
+    _basket = pls_get_magic_metadata_basket(osf_item, reuse_gathered=False)
     _serializer = get_metadata_serializer(
         format_key='turtle',
         basket=_basket,
@@ -270,7 +372,7 @@ def pls_send_trove_record(osf_item, *, is_backfill: bool, osfmap_partition: Osfm
         _expiration_date = osfmap_partition.get_expiration_date(_basket)
         if _expiration_date is not None:
             _queryparams['expiration_date'] = str(_expiration_date)
-    return requests.post(
+    return (session or requests).post(
         shtrove_ingest_url(),
         params=_queryparams,
         headers={
@@ -281,8 +383,8 @@ def pls_send_trove_record(osf_item, *, is_backfill: bool, osfmap_partition: Osfm
     )
 
 
-def pls_delete_trove_record(osf_item, osfmap_partition: OsfmapPartition):
-    return requests.delete(
+def pls_delete_trove_record(osf_item, osfmap_partition: OsfmapPartition, session: requests.Session | None = None):
+    return (session or requests).delete(
         shtrove_ingest_url(),
         params={
             'record_identifier': _shtrove_record_identifier(osf_item, osfmap_partition),
@@ -11,6 +11,7 @@ from rest_framework.throttling import UserRateThrottle
 
 from api.addons.views import AddonSettingsMixin
 from api.base import permissions as base_permissions
+from api.base.annotations import make_current_user_permission_annotations
 from api.users.permissions import UserMessagePermissions
 from api.base.exceptions import Conflict, UserGone
 from api.base.filters import ListFilterMixin, PreprintFilterMixin
@@ -93,6 +94,7 @@ from osf.models import (
     ExternalAccount,
     Guid,
     AbstractNode,
+    DraftRegistration,
     Preprint,
     Node,
     Registration,
@@ -391,7 +393,9 @@ class UserPreprints(JSONAPIBaseView, generics.ListAPIView, UserMixin, PreprintFi
         target_user = self.get_user(check_permissions=False)
 
         # Permissions on the list objects are handled by the query
-        default_qs = Preprint.objects.filter(_contributors__guids___id=target_user._id).exclude(machine_state='initial')
+        default_qs = Preprint.objects.filter(_contributors__guids___id=target_user._id).exclude(machine_state='initial').annotate(
+            **make_current_user_permission_annotations(auth_user, Preprint),
+        )
         return self.preprints_queryset(default_qs, auth_user, allow_contribs=False, latest_only=True)
 
     def get_queryset(self):
@@ -481,6 +485,7 @@ class UserRegistrations(JSONAPIBaseView, generics.ListAPIView, UserMixin, NodesF
             model_cls=Registration,
             revision_state=registration_annotations.REVISION_STATE,
             **resource_annotations.make_open_practice_badge_annotations(),
+            **make_current_user_permission_annotations(current_user, Registration),
         )
         # OSF group members not copied to registration.  Only registration contributors need to be checked here.
         return qs.filter(contributor__user__id=user.id)
@@ -514,7 +519,9 @@ class UserDraftRegistrations(JSONAPIBaseView, generics.ListAPIView, UserMixin):
         user = self.get_user()
         # Returns DraftRegistrations for which the user is a contributor, and the user can view
         drafts = user.draft_registrations_active
-        return get_objects_for_user(user, 'read_draft_registration', drafts, with_superuser=False)
+        return get_objects_for_user(user, 'read_draft_registration', drafts, with_superuser=False).annotate(
+            **make_current_user_permission_annotations(self.request.user, DraftRegistration),
+        )
 
 
 class UserInstitutionsRelationship(JSONAPIBaseView, generics.RetrieveDestroyAPIView, UserMixin):
@@ -51,3 +51,45 @@ class TestJSONAPIPagination(ApiTestCase):
         assert 'meta' not in links
         assert 'total' in meta
         assert 'per_page' in meta
+
+
+class TestJSONAPICursorPagination(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.url = '/{}nodes/?version=2.1&page[size]=4&page[cursor]='.format(
+            settings.API_BASE)
+        self.user = factories.AuthUserFactory()
+        self.projects = [factories.ProjectFactory(creator=self.user) for i in range(0, 11)]
+
+    def test_cursor_pagination_walks_every_node_once(self):
+        seen = []
+        url = self.url
+        pages = 0
+        while url:
+            res = self.app.get(url, auth=self.user.auth)
+            assert res.status_code == 200
+            assert 'total' not in res.json['meta']
+            assert res.json['meta']['per_page'] == 4
+            seen.extend(node['id'] for node in res.json['data'])
+            url = res.json['links']['next']
+            pages += 1
+
+        assert pages == 3
+        assert len(seen) == len(set(seen))
+        assert set(seen) == {project._id for project in self.projects}
+
+    def test_cursor_pagination_prev_link(self):
+        first_page = self.app.get(self.url, auth=self.user.auth)
+        assert first_page.json['links']['prev'] is None
+
+        second_page = self.app.get(first_page.json['links']['next'], auth=self.user.auth)
+        res = self.app.get(second_page.json['links']['prev'], auth=self.user.auth)
+        assert res.status_code == 200
+        assert [node['id'] for node in res.json['data']] == [node['id'] for node in first_page.json['data']]
+
+    def test_cursor_pagination_invalid_cursor(self):
+        res = self.app.get(f'{self.url}notacursor', auth=self.user.auth, expect_errors=True)
+        assert res.status_code == 400
+        assert res.json['errors'][0]['source']['parameter'] == 'page[cursor]'
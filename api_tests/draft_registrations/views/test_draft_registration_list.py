@@ -73,6 +73,24 @@ class TestDraftRegistrationListTopLevelEndpoint:
         draft.add_contributor(user_admin_contrib, permissions=ADMIN)
         return draft
 
+    def test_draft_list_embed_contributors(
+            self, app, user, draft_registration, url_draft_registrations
+    ):
+        other_draft = DraftRegistrationFactory(initiator=user)
+        res = app.get(f'{url_draft_registrations}?embed=contributors', auth=user.auth)
+        assert res.status_code == 200
+        embedded = {
+            draft['id']: [contrib['id'] for contrib in draft['embeds']['contributors']['data']]
+            for draft in res.json['data']
+        }
+        assert embedded == {
+            draft._id: [
+                f'{draft._id}-{contrib.user._id}'
+                for contrib in draft.draftregistrationcontributor_set.order_by('_order')
+            ]
+            for draft in (draft_registration, other_draft)
+        }
+
     def test_read_only_contributor_can_view_draft_list(
             self, app, user_read_contrib, draft_registration, url_draft_registrations
     ):
@@ -5,6 +5,7 @@ from io import StringIO
 from urllib.parse import urlencode
 
 import pytest
+from unittest import mock
 
 from api.base.settings.defaults import API_BASE, REPORT_FILENAME_FORMAT
 from osf_tests.factories import (
@@ -333,6 +334,31 @@ class TestInstitutionUserMetricList:
                 # Sort both expected and actual rows (ignoring the header) before comparison
                 assert sorted(response_rows[1:]) == sorted(expected_data)
 
+    @pytest.mark.parametrize('format_type', ['csv', 'tsv'])
+    def test_csv_tsv_streams_every_page(self, app, url, institutional_admin, institution, format_type):
+        for i in range(7):
+            _report_factory(
+                '2024-08',
+                institution,
+                user_id=f'u_stream_{i}',
+                storage_byte_count=i,
+            )
+        MonthlyInstitutionalUserReport.refresh()
+
+        # fetch from elasticsearch three reports at a time
+        with mock.patch('api.base.elasticsearch_dsl_views.MAX_SIZE_OF_ES_QUERY', 3):
+            resp = app.get(f'{url}?format={format_type}&sort=storage_byte_count', auth=institutional_admin.auth)
+        assert resp.status_code == 200
+        rows = list(csv.reader(StringIO(resp.text), dialect=csv.excel if format_type == 'csv' else csv.excel_tab))
+        storage_column = rows[0].index('storage_byte_count')
+        assert [row[storage_column] for row in rows[1:]] == [str(i) for i in range(7)]
+
+    @pytest.mark.parametrize('format_type', ['csv', 'tsv'])
+    def test_csv_tsv_without_reports(self, app, url, institutional_admin, format_type):
+        resp = app.get(f'{url}?format={format_type}', auth=institutional_admin.auth, expect_errors=True)
+        assert resp.status_code == 404
+        assert 'Content-Disposition' not in resp.headers
+
     def test_get_report_format_table_json(self, app, url, institutional_admin, institution):
         _report_factory(
             '2024-08',
@@ -1,8 +1,11 @@
 import functools
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from api.base.settings.defaults import API_BASE
 from framework.auth.core import Auth
+from osf.models import Node
 from osf_tests.factories import (
     ProjectFactory,
     AuthUserFactory
@@ -155,3 +158,32 @@ class TestNodeEmbeds:
         res = app.get(url, auth=write_contrib_one.auth)
         assert res.status_code == 200
         assert res.json['data']['embeds']['contributors']['meta']['total_bibliographic'] == 3
+
+    def test_node_list_embed_contributors_is_batched(
+            self, app, user, root_node, child_one, child_two):
+        url = f'/{API_BASE}nodes/?embed=contributors&filter[root]={root_node._id}'
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = app.get(url, auth=user.auth)
+        assert res.status_code == 200
+
+        embedded = {
+            node['id']: [contrib['id'] for contrib in node['embeds']['contributors']['data']]
+            for node in res.json['data']
+        }
+        assert {root_node._id, child_one._id, child_two._id}.issubset(embedded)
+        expected = {
+            node._id: [
+                f'{node._id}-{contrib.user._id}'
+                for contrib in node.contributor_set.order_by('_order')
+            ]
+            for node in Node.objects.filter(guids___id__in=embedded.keys())
+        }
+        assert embedded == expected
+
+        # Contributors for the whole page are loaded by a single query
+        contributor_queries = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith('SELECT') and 'FROM "osf_contributor"' in query['sql'] and '"osf_contributor"."node_id" IN' in query['sql']
+        ]
+        assert len(contributor_queries) == 1
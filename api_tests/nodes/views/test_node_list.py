@@ -259,6 +259,47 @@ class TestNodeList:
         res = app.get(url_public, auth=superuser.auth)
         assert permissions.READ not in res.json['data'][0]['attributes']['current_user_permissions']
 
+    def test_current_user_permissions_match_node_permissions(self, app, user, non_contrib, url, public_project):
+        write_project = ProjectFactory(is_public=True, creator=non_contrib)
+        write_project.add_contributor(user, permissions=permissions.WRITE, auth=Auth(non_contrib))
+        implicit_child = NodeFactory(parent=public_project, creator=non_contrib, is_public=True)
+        res = app.get(f'{url}?version=2.11&page[size]={MAX_PAGE_SIZE}', auth=user.auth)
+        assert res.status_code == 200
+
+        current_user_permissions = {
+            node['id']: node['attributes']['current_user_permissions']
+            for node in res.json['data']
+        }
+        assert current_user_permissions[public_project._id] == [permissions.ADMIN, permissions.WRITE, permissions.READ]
+        assert current_user_permissions[write_project._id] == [permissions.WRITE, permissions.READ]
+        assert current_user_permissions[implicit_child._id] == [permissions.READ]
+
+    def test_related_counts_match_node_detail(self, app, user, non_contrib, url, public_project, private_project):
+        NodeFactory(parent=public_project, creator=user, is_public=True)
+        NodeFactory(parent=public_project, creator=user, is_public=False)
+        public_project.add_node_link(private_project, auth=Auth(user))
+        public_project.fork_node(auth=Auth(user))
+
+        def related_counts(node_json):
+            return {
+                name: relationship['links']['related']['meta']['count']
+                for name, relationship in node_json['relationships'].items()
+                if 'count' in relationship.get('links', {}).get('related', {}).get('meta', {})
+            }
+
+        for auth in (user.auth, non_contrib.auth, None):
+            res = app.get(f'{url}?related_counts=true&filter[id]={public_project._id}', auth=auth)
+            assert res.status_code == 200
+            list_counts = related_counts(res.json['data'][0])
+
+            res = app.get(f'{url}{public_project._id}/?related_counts=true', auth=auth)
+            assert res.status_code == 200
+            assert list_counts == related_counts(res.json['data'])
+
+        res = app.get(f'{url}?related_counts=children,forks&filter[id]={public_project._id}', auth=user.auth)
+        counts = related_counts(res.json['data'][0])
+        assert counts == {'children': 2, 'forks': 1}
+
     def test_legacy_host_for_htmls(self, app, url, public_project):
         settings.DOMAIN = 'https://staging3.osf.io'
         current_domain_response = app.get(url).json['data']
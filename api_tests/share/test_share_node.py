@@ -20,7 +20,8 @@ from website import settings
 from website.project.tasks import on_node_updated
 
 from framework.auth.core import Auth
-from api.share.utils import shtrove_ingest_url
+from api.share.utils import shtrove_ingest_url, task__update_share_chunk
+from osf.metadata.osf_gathering import OsfmapPartition
 from ._utils import (
     expect_ingest_request,
     mock_share_responses,
@@ -199,6 +200,65 @@ class TestNodeShare:
                 registration.save()
             assert registration.title not in settings.DO_NOT_INDEX_LIST['titles']
 
+    def test_update_share_sends_fresh_metadata(self, node, user):
+        with (
+            patch.object(settings, 'METADATA_CACHE_TIMEOUT', 60),
+            mock_share_responses() as _mock_share_responses,
+        ):
+            on_node_updated(node._id, user._id, False, {'is_public'})
+            node.creator.fullname = 'Freshly Renamed'
+            node.creator.save()  # changes the node's metadata without touching the node
+            on_node_updated(node._id, user._id, False, {'is_public'})
+            _last_main_ingest = [
+                _call for _call in _mock_share_responses.calls
+                if _call.request.url.startswith(shtrove_ingest_url())
+                and 'is_supplementary' not in _call.request.url
+            ][-1]
+        assert 'Freshly Renamed' in _last_main_ingest.request.body.decode()
+
+    def test_update_share_chunk(self, node, registration):
+        with mock_share_responses() as _mock_share_responses:
+            _result = task__update_share_chunk([node._id, registration._id, 'nopes'])
+            _ingest_calls = [
+                _call for _call in _mock_share_responses.calls
+                if _call.request.url.startswith(shtrove_ingest_url())
+            ]
+        assert _result == {'sent': 2, 'failed': []}
+        assert len(_ingest_calls) == 2 * len(OsfmapPartition)
+        node.refresh_from_db()
+        registration.refresh_from_db()
+        assert node.has_been_indexed
+        assert registration.has_been_indexed
+
+    def test_update_share_chunk_failure(self, node, registration):
+        with (
+            mock_share_responses() as _mock_share_responses,
+            patch('api.share.utils.task__update_share') as _mock_update_share,
+        ):
+            _mock_share_responses.replace(responses.POST, shtrove_ingest_url(), status=400)
+            _result = task__update_share_chunk([node._id, registration._id])
+        assert _result == {'sent': 0, 'failed': [node._id, registration._id]}
+        assert [
+            _call.kwargs['kwargs']['guid']
+            for _call in _mock_update_share.apply_async.mock_calls
+        ] == [node._id, registration._id]
+        node.refresh_from_db()
+        assert not node.has_been_indexed
+
+    def test_update_share_chunk_out_of_retries(self, node, registration):
+        with (
+            mock_share_responses() as _mock_share_responses,
+            patch('api.share.utils.task__update_share') as _mock_update_share,
+            patch.object(task__update_share_chunk, 'max_retries', 0),
+        ):
+            _mock_share_responses.replace(responses.POST, shtrove_ingest_url(), status=429)
+            _result = task__update_share_chunk([node._id, registration._id])
+        assert _result == {'sent': 0, 'failed': [node._id, registration._id]}
+        assert [
+            _call.kwargs['kwargs']['guid']
+            for _call in _mock_update_share.apply_async.mock_calls
+        ] == [node._id, registration._id]
+
     @responses.activate
     def test_skips_no_settings(self, node, user):
         on_node_updated(node._id, user._id, False, {'is_public'})
@@ -64,6 +64,10 @@ def override_settings():
     website_settings.SENDGRID_API_KEY = None
     # or try to contact a SHARE
     website_settings.SHARE_ENABLED = False
+    # or reuse CAS answers, permission decisions or metadata records from another test
+    website_settings.CAS_TOKEN_CACHE_TIMEOUT = 0
+    website_settings.WATERBUTLER_AUTH_CACHE_TIMEOUT = 0
+    website_settings.METADATA_CACHE_TIMEOUT = 0
     # Set this here instead of in SILENT_LOGGERS, in case developers
     # call setLevel in local.py
 
@@ -1,8 +1,13 @@
+from collections import Counter
 from furl import furl
 
+from django.conf import settings as django_settings
+from django.core.cache import caches
 from django.utils import timezone
 from rest_framework import status as http_status
+import hashlib
 import json
+import uuid
 from urllib.parse import quote
 
 from lxml import etree
@@ -55,6 +60,42 @@ class CasResponse:
         self.attributes = attributes or {}
 
 
+# Hit/miss counts for the bearer token cache, kept per process
+token_cache_metrics = Counter()
+
+TOKEN_CACHE_GENERATION_KEY = 'cas_token:generation'
+
+
+def get_token_cache():
+    return caches[django_settings.CAS_TOKEN_CACHE_NAME]
+
+
+def new_token_cache_generation():
+    # Random rather than a counter, so an evicted generation never brings back older entries
+    return uuid.uuid4().hex
+
+
+def get_token_cache_key(access_token):
+    """Key a cached introspection by a hash of the token, so raw tokens are never stored as keys.
+    Keys include the cache generation so that revoking a whole application can drop every entry.
+    """
+    generation = get_token_cache().get_or_set(TOKEN_CACHE_GENERATION_KEY, new_token_cache_generation, None)
+    token_hash = hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+    return f'cas_token:{generation}:{token_hash}'
+
+
+def forget_token(access_token):
+    """Drop the cached introspection for a single token."""
+    if settings.CAS_TOKEN_CACHE_TIMEOUT:
+        get_token_cache().delete(get_token_cache_key(access_token))
+
+
+def forget_all_tokens():
+    """Drop every cached introspection by moving on to a new cache generation."""
+    if settings.CAS_TOKEN_CACHE_TIMEOUT:
+        get_token_cache().set(TOKEN_CACHE_GENERATION_KEY, new_token_cache_generation(), None)
+
+
 class CasClient:
     """HTTP client for the CAS server."""
 
@@ -182,14 +223,19 @@ class CasClient:
             resp.attributes.update(data['attributes'])
         resp.attributes['accessToken'] = access_token
         resp.attributes['accessTokenScope'] = set(data.get('scope', []))
+        if data.get('expires_in') is not None:
+            resp.attributes['accessTokenExpiresIn'] = int(data['expires_in'])
         return resp
 
     def revoke_application_tokens(self, client_id, client_secret):
         """Revoke all tokens associated with a given CAS client_id"""
+        forget_all_tokens()
         return self.revoke_tokens(payload={'client_id': client_id, 'client_secret': client_secret})
 
     def revoke_tokens(self, payload):
         """Revoke a tokens based on payload"""
+        if 'token' in payload:
+            forget_token(payload['token'])
         url = self.get_auth_token_revocation_url()
 
         resp = requests.post(url, data=payload)
@@ -199,6 +245,74 @@ class CasClient:
             self._handle_error(resp)
 
 
+def get_cached_profile(client, access_token):
+    """
+    Same as `client.profile`, but reuse a recent answer from CAS for the same token.
+
+    Successful lookups are kept for `CAS_TOKEN_CACHE_TIMEOUT` seconds, or until the token expires
+    if CAS says so sooner. Tokens that CAS rejects
+    with a 4xx are kept for `CAS_TOKEN_NEGATIVE_CACHE_TIMEOUT` seconds and raise the same
+    CasHTTPError again; server errors are never cached. Revoking a token through CasClient
+    drops its entry.
+
+    :param CasClient client: client to ask on a miss.
+    :param str access_token: CAS access_token.
+    :rtype: CasResponse
+    :raises: CasError if an unexpected response is returned.
+    """
+    if not settings.CAS_TOKEN_CACHE_TIMEOUT:
+        return client.profile(access_token)
+
+    cache = get_token_cache()
+    key = get_token_cache_key(access_token)
+    cached = cache.get(key)
+    if cached is not None:
+        if cached['authenticated']:
+            token_cache_metrics['hits'] += 1
+            return CasResponse(
+                authenticated=True,
+                user=cached['user'],
+                attributes=dict(cached['attributes'], accessToken=access_token),
+            )
+        token_cache_metrics['negative_hits'] += 1
+        raise CasHTTPError(
+            code=cached['code'],
+            message=cached['message'],
+            headers={},
+            content=cached['content'],
+        )
+
+    token_cache_metrics['misses'] += 1
+    try:
+        resp = client.profile(access_token)
+    except CasHTTPError as e:
+        if 400 <= e.code < 500 and settings.CAS_TOKEN_NEGATIVE_CACHE_TIMEOUT:
+            cache.set(key, {
+                'authenticated': False,
+                'code': e.code,
+                'message': e.args[0] if e.args else None,
+                'content': e.content,
+            }, settings.CAS_TOKEN_NEGATIVE_CACHE_TIMEOUT)
+        raise
+
+    timeout = settings.CAS_TOKEN_CACHE_TIMEOUT
+    expires_in = resp.attributes.get('accessTokenExpiresIn')
+    if expires_in is not None:
+        timeout = min(timeout, expires_in)
+    if resp.authenticated and timeout > 0:
+        attributes = {
+            name: value
+            for name, value in resp.attributes.items()
+            if name not in ('accessToken', 'accessTokenExpiresIn')
+        }
+        cache.set(key, {
+            'authenticated': True,
+            'user': resp.user,
+            'attributes': attributes,
+        }, timeout)
+    return resp
+
+
 def parse_auth_header(header):
     """
     Given an Authorization header string, e.g. 'Bearer abc123xyz',
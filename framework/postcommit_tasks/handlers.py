@@ -1,15 +1,17 @@
 import functools
-import hashlib
 import logging
 import threading
+import time
 
 import binascii
-from collections import OrderedDict
+from collections import Counter, OrderedDict, defaultdict
 import os
 
 from celery.canvas import Signature
 from celery.local import PromiseProxy
+import gevent
 from gevent.pool import Pool
+from django.db.models import Model
 from flask import current_app, has_app_context
 
 from website import settings
@@ -17,6 +19,84 @@ from website import settings
 _local = threading.local()
 logger = logging.getLogger(__name__)
 
+
+class PostcommitExecutor:
+    """Runs postcommit tasks on a pool shared by every request served by this gevent hub.
+
+    The pool's size is the concurrency budget: once it is full, spawning blocks until a
+    slot frees up, so a burst of requests queues its tasks instead of opening unbounded
+    greenlets (and database connections). Each request waits up to ``timeout`` seconds
+    for its own tasks. Per-task call counts, failures and timings are kept in ``metrics``.
+    """
+
+    def __init__(self, size=None, timeout=None, slow_threshold=None):
+        self.size = size or settings.POSTCOMMIT_CONCURRENCY
+        self.timeout = settings.POSTCOMMIT_TIMEOUT if timeout is None else timeout
+        self.slow_threshold = settings.POSTCOMMIT_SLOW_TASK_SECONDS if slow_threshold is None else slow_threshold
+        self.pool = Pool(self.size)
+        self.metrics = defaultdict(Counter)
+
+    def run(self, funcs):
+        greenlets = [self.pool.spawn(self._run_task, func) for func in funcs]
+        gevent.joinall(greenlets, timeout=self.timeout, raise_error=True)
+        pending = [greenlet for greenlet in greenlets if not greenlet.ready()]
+        if pending:
+            logger.warning(f'{len(pending)} of {len(greenlets)} postcommit tasks still running after {self.timeout}s')
+
+    def _run_task(self, func):
+        name = get_task_name(func)
+        metrics = self.metrics[name]
+        started = time.monotonic()
+        try:
+            return func()
+        except Exception:
+            metrics['failures'] += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            metrics['calls'] += 1
+            metrics['milliseconds'] += int(elapsed * 1000)
+            if elapsed > self.slow_threshold:
+                metrics['slow'] += 1
+                logger.warning(f'Postcommit task {name} took {elapsed:.2f}s')
+
+
+def get_postcommit_executor():
+    # One executor per gevent hub (i.e. per OS thread), shared by all of its request greenlets
+    hub = gevent.get_hub()
+    executor = getattr(hub, '_postcommit_executor', None)
+    if executor is None:
+        executor = hub._postcommit_executor = PostcommitExecutor()
+    return executor
+
+
+def get_task_name(func):
+    if isinstance(func, functools.partial):
+        func = func.func
+    return f'{getattr(func, "__module__", None)}.{getattr(func, "__name__", repr(func))}'
+
+
+def get_dedup_key_part(value):
+    """A hashable stand-in for a task argument. Saved model instances are keyed by
+    model and primary key, so no repr (which may hit the database) is needed.
+    """
+    if isinstance(value, Model) and value.pk is not None:
+        return (value._meta.label, value.pk)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        parts = tuple(get_dedup_key_part(item) for item in value)
+        return (type(value).__name__, tuple(sorted(parts, key=repr)) if isinstance(value, (set, frozenset)) else parts)
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted(((key, get_dedup_key_part(item)) for key, item in value.items()), key=repr)))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def get_dedup_key(fn, args, kwargs):
+    return (fn.__module__, fn.__name__, get_dedup_key_part(tuple(args)), get_dedup_key_part(kwargs))
+
 def postcommit_queue():
     if not hasattr(_local, 'postcommit_queue'):
         _local.postcommit_queue = OrderedDict()
@@ -38,11 +118,7 @@ def postcommit_after_request(response, base_status_error_code=500):
         return response
     try:
         if postcommit_queue():
-            number_of_threads = 30  # one db connection per greenlet, let's share
-            pool = Pool(number_of_threads)
-            for func in postcommit_queue().values():
-                pool.spawn(func)
-            pool.join(timeout=5.0, raise_error=True)  # 5 second timeout and reraise exceptions
+            get_postcommit_executor().run(postcommit_queue().values())
 
         if postcommit_celery_queue():
             if settings.USE_CELERY:
@@ -75,15 +151,11 @@ def enqueue_postcommit_task(fn, args, kwargs, celery=False, once_per_request=Tru
         # For testing purposes only: run fn directly
         fn(*args, **kwargs)
     else:
-        # make a hash of the pertinent data
-        raw = [fn.__name__, fn.__module__, args, kwargs]
-        m = hashlib.md5()
-        m.update('-'.join([x.__repr__() for x in raw]).encode())
-        key = m.hexdigest()
+        key = get_dedup_key(fn, args, kwargs)
 
         if not once_per_request:
             # we want to run it once for every occurrence, add a random string
-            key = f'{key}:{binascii.hexlify(os.urandom(8))}'
+            key = (key, binascii.hexlify(os.urandom(8)))
 
         if celery and isinstance(fn, PromiseProxy):
             postcommit_celery_queue().update({key: fn.si(*args, **kwargs)})
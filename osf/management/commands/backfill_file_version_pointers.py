@@ -0,0 +1,58 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10000
+
+BACKFILL_SQL = """
+    UPDATE osf_basefilenode AS F
+    SET latest_version_id = POINTERS.latest_version_id,
+        earliest_version_id = POINTERS.earliest_version_id
+    FROM (
+        SELECT
+            T.basefilenode_id,
+            (ARRAY_AGG(V.id ORDER BY V.created DESC))[1] AS latest_version_id,
+            (ARRAY_AGG(V.id ORDER BY V.created ASC))[1] AS earliest_version_id
+        FROM osf_basefileversionsthrough AS T
+        JOIN osf_fileversion AS V ON V.id = T.fileversion_id
+        WHERE T.basefilenode_id > %(start)s AND T.basefilenode_id <= %(end)s
+        GROUP BY T.basefilenode_id
+    ) AS POINTERS
+    WHERE F.id = POINTERS.basefilenode_id
+    AND F.latest_version_id IS NULL
+"""
+
+
+def backfill_file_version_pointers(chunk_size=CHUNK_SIZE):
+    """Set latest/earliest version pointers on files that have versions but no pointers,
+    a range of file ids at a time.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT MAX(id) FROM osf_basefilenode')
+        max_id = cursor.fetchone()[0] or 0
+        updated = 0
+        for start in range(0, max_id, chunk_size):
+            cursor.execute(BACKFILL_SQL, {'start': start, 'end': start + chunk_size})
+            updated += cursor.rowcount
+            logger.info(f'Backfilled version pointers for {updated} files (through id {start + chunk_size})')
+    return updated
+
+
+class Command(BaseCommand):
+    help = 'Backfill BaseFileNode.latest_version and earliest_version'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--chunk_size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Number of file ids to update per query',
+        )
+
+    def handle(self, *args, **options):
+        updated = backfill_file_version_pointers(chunk_size=options['chunk_size'])
+        logger.info(f'Complete. Backfilled version pointers for {updated} files.')
@@ -0,0 +1,60 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10000
+
+BACKFILL_SQL = """
+    WITH RECURSIVE paths AS (
+        SELECT id, '/'::TEXT AS path
+        FROM osf_basefilenode
+        WHERE type = 'osf.osfstoragefolder'
+        AND parent_id IS NULL
+        AND id > %(start)s AND id <= %(end)s
+    UNION ALL
+        SELECT F.id, P.path || F.name || CASE WHEN F.type = 'osf.osfstoragefolder' THEN '/' ELSE '' END
+        FROM paths AS P
+        JOIN osf_basefilenode AS F ON F.parent_id = P.id
+        WHERE F.type IN ('osf.osfstoragefile', 'osf.osfstoragefolder')
+    )
+    UPDATE osf_basefilenode AS B
+    SET _materialized_path = paths.path
+    FROM paths
+    WHERE B.id = paths.id
+    AND B._materialized_path IS DISTINCT FROM paths.path
+"""
+
+
+def backfill_osfstorage_paths(chunk_size=CHUNK_SIZE):
+    """Store the materialized path of every live osfstorage file and folder, walking down
+    from a range of root folder ids at a time.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MAX(id) FROM osf_basefilenode WHERE type = 'osf.osfstoragefolder' AND parent_id IS NULL")
+        max_id = cursor.fetchone()[0] or 0
+        updated = 0
+        for start in range(0, max_id, chunk_size):
+            cursor.execute(BACKFILL_SQL, {'start': start, 'end': start + chunk_size})
+            updated += cursor.rowcount
+            logger.info(f'Backfilled materialized paths for {updated} osfstorage files (through root id {start + chunk_size})')
+    return updated
+
+
+class Command(BaseCommand):
+    help = 'Backfill the stored materialized path of osfstorage files and folders'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--chunk_size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Range of root folder ids to walk per query',
+        )
+
+    def handle(self, *args, **options):
+        updated = backfill_osfstorage_paths(chunk_size=options['chunk_size'])
+        logger.info(f'Complete. Backfilled materialized paths for {updated} osfstorage files.')
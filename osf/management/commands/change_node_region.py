@@ -7,6 +7,7 @@ from google.cloud.storage.client import Client
 from google.oauth2.service_account import Credentials
 
 from osf.models import AbstractNode
+from osf.models.base import guid_resolver
 from osf.utils.migrations import disable_auto_now_fields
 from addons.osfstorage.models import Region
 
@@ -83,7 +84,9 @@ def _clone_file(file_obj):
     cloned_f.save()
     # Repoint Guids
     assert cloned_f.id, f'Cloned file ID not assigned for {file_obj._id}'
+    guid_strs = list(file_obj.guids.values_list('_id', flat=True))
     file_obj.guids.update(object_id=cloned_f.id)
+    guid_resolver.forget(*guid_strs)
     # Retain original timestamps
     cloned_f.created = file_obj.created
     cloned_f.modified = file_obj.modified
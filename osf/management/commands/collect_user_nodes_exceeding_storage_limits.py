@@ -6,7 +6,7 @@ import logging
 from tqdm import tqdm
 
 from addons.osfstorage.models import OsfStorageFile
-from api.caching.tasks import update_storage_usage_cache
+from api.caching.tasks import get_storage_usage_from_ledger, update_storage_usage_cache
 from osf.models import Node
 from osf.utils.permissions import ADMIN
 from website.settings import StorageLimits
@@ -26,7 +26,9 @@ def retrieve_user_nodes_exceeding_storage_limits():
     logger.info('Counting targets...')
     p_bar = tqdm(total=nodes.count())
     for node in nodes:
-        update_storage_usage_cache(node.id, node._id)
+        if get_storage_usage_from_ledger(node) is None:
+            # Not tracked by the storage usage ledger, so recount
+            update_storage_usage_cache(node.id, node._id)
 
         if (node.is_public and node.storage_limit_status >= StorageLimits.OVER_PUBLIC) or (not node.is_public and node.storage_limit_status >= StorageLimits.OVER_PRIVATE):
             contributors = get_admin_contributors(node)
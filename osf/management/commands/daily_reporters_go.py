@@ -1,5 +1,6 @@
 import datetime
 import logging
+import time
 
 from django.core.management.base import BaseCommand
 from django.db.utils import OperationalError
@@ -38,7 +39,9 @@ def daily_reporters_go(report_date=None, reporter_key=None, **kwargs):
 def daily_reporter_go(task, reporter_key: str, report_date: str):
     _reporter_class = AllDailyReporters[reporter_key.upper()].value
     _parsed_date = datetime.date.fromisoformat(report_date)
-    _reporter_class().run_and_record_for_date(report_date=_parsed_date)
+    _started = time.monotonic()
+    _report_count = _reporter_class().run_and_record_for_date(report_date=_parsed_date)
+    logger.info(f'{reporter_key} ({report_date}): saved {_report_count} reports in {time.monotonic() - _started:.1f}s')
 
 
 class Command(BaseCommand):
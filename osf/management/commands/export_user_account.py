@@ -6,8 +6,10 @@ import logging
 import requests
 import shutil
 import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from django.db.models import Q
+from django.db.models import Q, Sum
 from django.core import serializers
 from django.core.management.base import BaseCommand
 from django.contrib.contenttypes.models import ContentType
@@ -30,6 +32,10 @@ from api.base.settings.defaults import GBs
 ERRORS = []
 TMP_PATH = tempfile.mkdtemp()
 
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+FILES_ARCHIVE_NAME = 'osfstorage-archive.zip'
+
 PREPRINT_EXPORT_FIELDS = [
     'title',
     'description',
@@ -74,33 +80,71 @@ def export_metadata(node, current_dir):
         metadata = json.loads(serializers.serialize('json', [node], fields=export_fields))
         json.dump(metadata[0]['fields'], f, indent=4, sort_keys=True)
 
-def export_files(node, user, current_dir):
+def export_files(node, user, current_dir, downloads=None):
     """
     Creates a "files" directory within the current directory.
     Exports all of the OSFStorage files for a given node.
     Uses WB's download zip functionality to download osfstorage-archive.zip in a single request.
 
+    If a list of `downloads` is given, the download is queued on it for `download_files` instead.
+    Archives left by an earlier, interrupted export of the same directory are kept.
+
     """
     files_dir = os.path.join(current_dir, 'files')
-    os.mkdir(files_dir)
-    response = requests.get(
-        url=waterbutler_api_url_for(
-            node_id=node._id,
-            _internal=True,
-            provider='osfstorage',
-            zip='',
-            cookie=user.get_or_create_cookie(),
-            base_url=node.osfstorage_region.waterbutler_url
-        )
+    os.makedirs(files_dir, exist_ok=True)
+    archive_path = os.path.join(files_dir, FILES_ARCHIVE_NAME)
+    if os.path.exists(archive_path):
+        return
+    url = waterbutler_api_url_for(
+        node_id=node._id,
+        _internal=True,
+        provider='osfstorage',
+        zip='',
+        cookie=user.get_or_create_cookie(),
+        base_url=node.osfstorage_region.waterbutler_url
     )
-    if response.status_code == 200:
-        with open(os.path.join(files_dir, 'osfstorage-archive.zip'), 'wb') as f:
-            f.write(response.content)
+    if downloads is None:
+        download_file(node._id, url, archive_path)
     else:
-        ERRORS.append(
-            'Error exporting files for node {}. Waterbutler responded with a {} status code. Response: {}'
-            .format(node._id, response.status_code, response.json())
-        )
+        downloads.append((node._id, url, archive_path))
+
+def download_file(node_id, url, path):
+    """
+    Streams a WaterButler download to `path`, through a ".partial" file so that only complete
+    downloads are ever found at `path`.
+
+    """
+    partial_path = f'{path}.partial'
+    with requests.get(url, stream=True) as response:
+        if response.status_code != 200:
+            ERRORS.append(
+                'Error exporting files for node {}. Waterbutler responded with a {} status code. Response: {}'
+                .format(node_id, response.status_code, response.text)
+            )
+            return
+        with open(partial_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+    os.replace(partial_path, path)
+
+def download_files(downloads, workers=DOWNLOAD_WORKERS):
+    """
+    Runs queued downloads on a pool of `workers` threads.
+
+    """
+    if not downloads:
+        return
+    progress = Progress()
+    progress.start(len(downloads), 'FILES')
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(download_file, *download) for download in downloads]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except (requests.RequestException, OSError) as e:
+                ERRORS.append(f'Error exporting files: {e}')
+            progress.increment()
+    progress.stop()
 
 def export_wikis(node, current_dir):
     """
@@ -109,13 +153,13 @@ def export_wikis(node, current_dir):
 
     """
     wikis_dir = os.path.join(current_dir, 'wikis')
-    os.mkdir(wikis_dir)
+    os.makedirs(wikis_dir, exist_ok=True)
     for wiki in WikiPage.objects.get_wiki_pages_latest(node):
         if wiki.content:
             with open(os.path.join(wikis_dir, f'{wiki.wiki_page.page_name}.md'), 'w', encoding='utf-8') as f:
                 f.write(wiki.content)
 
-def export_resource(node, user, current_dir):
+def export_resource(node, user, current_dir, downloads=None):
     """
     Exports metadata, files, and wikis for given node (project, registration, or preprint).
     If the given node has children,
@@ -129,20 +173,20 @@ def export_resource(node, user, current_dir):
     if hasattr(node, 'wikis') and WikiPage.objects.get_wiki_pages_latest(node):
         export_wikis(node, current_dir)
     ctype = ContentType.objects.get_for_model(node.__class__)
-    if OsfStorageFileNode.objects.filter(target_object_id=node.id, target_content_type=ctype):
-        export_files(node, user, current_dir)
+    if OsfStorageFileNode.objects.filter(target_object_id=node.id, target_content_type=ctype).exists():
+        export_files(node, user, current_dir, downloads=downloads)
 
     if hasattr(node, 'find_readable_descendants'):
         descendants = list(node.find_readable_descendants(Auth(user)))
         if len(descendants):
             components_dir = os.path.join(current_dir, 'components')
-            os.mkdir(components_dir)
+            os.makedirs(components_dir, exist_ok=True)
             for child in descendants:
                 current_dir = os.path.join(components_dir, child._id)
-                os.mkdir(current_dir)
-                export_resource(child, user, current_dir)
+                os.makedirs(current_dir, exist_ok=True)
+                export_resource(child, user, current_dir, downloads=downloads)
 
-def export_resources(nodes_to_export, user, dir, nodes_type):
+def export_resources(nodes_to_export, user, dir, nodes_type, downloads=None):
     """
     Creates appropriate directory structure and exports a given set of resources
     (projects, registrations or preprints) by calling export helper functions.
@@ -152,11 +196,27 @@ def export_resources(nodes_to_export, user, dir, nodes_type):
     progress.start(nodes_to_export.count(), nodes_type.upper())
     for node in nodes_to_export:
         current_dir = os.path.join(dir, node._id)
-        os.mkdir(current_dir)
-        export_resource(node, user, current_dir)
+        os.makedirs(current_dir, exist_ok=True)
+        export_resource(node, user, current_dir, downloads=downloads)
         progress.increment()
     progress.stop()
 
+def write_archive(base_dir, output):
+    """
+    Zips up `base_dir` as `output`.zip, one file at a time, leaving out unfinished ".partial"
+    downloads. Downloaded archives are already compressed, so they are stored as they are.
+
+    """
+    with zipfile.ZipFile(f'{output}.zip', 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for root, dirs, files in os.walk(base_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.partial'):
+                    continue
+                path = os.path.join(root, name)
+                compress_type = zipfile.ZIP_STORED if name.endswith('.zip') else zipfile.ZIP_DEFLATED
+                archive.write(path, os.path.relpath(path, base_dir), compress_type=compress_type)
+
 def get_usage(user):
     # includes nodes, registrations
     nodes = user.nodes.filter(is_deleted=False).exclude(type='osf.collection').values_list('id', flat=True)
@@ -167,7 +227,7 @@ def get_usage(user):
     preprint_files = get_resource_files(get_preprints_to_export(user), preprint_ctype)
 
     versions = FileVersion.objects.filter(Q(basefilenode__in=node_files) | Q(basefilenode__in=preprint_files))
-    return sum([v.size or 0 for v in versions]) / GBs
+    return (versions.aggregate(total=Sum('size'))['total'] or 0) / GBs
 
 def get_resource_files(resource_list, resource_ctype):
     return OsfStorageFile.objects.filter(target_object_id__in=resource_list, target_content_type=resource_ctype).values_list('id', flat=True)
@@ -180,10 +240,15 @@ def get_preprints_to_export(user):
     )
 
 
-def export_account(user_id, path, only_private=False, only_admin=False, export_files=True, export_wikis=True):
+def export_account(user_id, path, only_private=False, only_admin=False, export_files=True, export_wikis=True,
+                   workers=DOWNLOAD_WORKERS, work_dir=None):
     """
     Exports (as a zip file) all of the projects, registrations, and preprints for which the given user is a contributor.
 
+    Metadata and wikis are written first; file archives are then downloaded by `workers` threads.
+    Everything is gathered in `work_dir` before being zipped, and running again with the same
+    `work_dir` after an interruption skips the file archives that were already downloaded.
+
     The directory structure of the exported file is:
 
     <user_fullname> (<user_guid>).zip
@@ -220,15 +285,15 @@ def export_account(user_id, path, only_private=False, only_admin=False, export_f
         print('Exiting...')
         exit(1)
 
-    base_dir = os.path.join(TMP_PATH, user_id)
+    base_dir = work_dir or os.path.join(TMP_PATH, user_id)
     preprints_dir = os.path.join(base_dir, 'preprints')
     projects_dir = os.path.join(base_dir, 'projects')
     registrations_dir = os.path.join(base_dir, 'registrations')
 
-    os.mkdir(base_dir)
-    os.mkdir(preprints_dir)
-    os.mkdir(projects_dir)
-    os.mkdir(registrations_dir)
+    os.makedirs(preprints_dir, exist_ok=True)
+    os.makedirs(projects_dir, exist_ok=True)
+    os.makedirs(registrations_dir, exist_ok=True)
+    logger.info(f'Exporting to {base_dir}; pass it as --work_dir to resume an interrupted export.')
 
     preprints_to_export = get_preprints_to_export(user)
 
@@ -242,15 +307,20 @@ def export_account(user_id, path, only_private=False, only_admin=False, export_f
         .get_roots()
     )
 
-    export_resources(projects_to_export, user, projects_dir, 'projects')
-    export_resources(preprints_to_export, user, preprints_dir, 'preprints')
-    export_resources(registrations_to_export, user, registrations_dir, 'registrations')
+    downloads = []
+    export_resources(projects_to_export, user, projects_dir, 'projects', downloads=downloads)
+    export_resources(preprints_to_export, user, preprints_dir, 'preprints', downloads=downloads)
+    export_resources(registrations_to_export, user, registrations_dir, 'registrations', downloads=downloads)
+    download_files(downloads, workers=workers)
 
     timestamp = dt.datetime.fromtimestamp(time.time()).strftime('%Y%m%d%H%M%S')
     output = os.path.join(path, f'{user_id}-export-{timestamp}')
-    print('Creating {output}.zip ...').format(**locals())
-    shutil.make_archive(output, 'zip', base_dir)
-    shutil.rmtree(base_dir)
+    print(f'Creating {output}.zip ...')
+    write_archive(base_dir, output)
+    if ERRORS:
+        print(f'Keeping {base_dir} so that failed downloads can be retried with --work_dir.')
+    else:
+        shutil.rmtree(base_dir)
 
     finished_msg = 'Finished without errors.' if not ERRORS else 'Finished with errors logged below.'
     print(finished_msg)
@@ -280,8 +350,22 @@ class Command(BaseCommand):
             help='Path where to save the output file.'
         )
 
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DOWNLOAD_WORKERS,
+            help='Number of file archives to download at a time.'
+        )
+        parser.add_argument(
+            '--work_dir',
+            type=str,
+            help='Directory to gather the export in. Pass the directory of an interrupted export to resume it.'
+        )
+
     def handle(self, *args, **options):
         export_account(
             user_id=options['user'],
             path=options['path'],
+            workers=options['workers'],
+            work_dir=options.get('work_dir'),
         )
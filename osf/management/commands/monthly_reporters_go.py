@@ -1,5 +1,6 @@
 import datetime
 import logging
+import time
 
 from django.core.management.base import BaseCommand
 from django.db import OperationalError as DjangoOperationalError
@@ -48,6 +49,7 @@ def schedule_monthly_reporter(
 ):
     _reporter = _get_reporter(reporter_key, yearmonth)
     _last_kwargs = None
+    _task_count = 0
     try:
         for _kwargs in _reporter.iter_report_kwargs(continue_after=continue_after):
             monthly_reporter_do.apply_async(kwargs={
@@ -56,6 +58,8 @@ def schedule_monthly_reporter(
                 'report_kwargs': _kwargs,
             })
             _last_kwargs = _kwargs
+            _task_count += 1
+        logger.info(f'{reporter_key} ({yearmonth}): scheduled {_task_count} report tasks')
     except _CONTINUE_AFTER_ERRORS as _error:
         # let the celery task succeed but log the error
         framework.sentry.log_exception(_error)
@@ -81,12 +85,16 @@ def monthly_reporter_do(reporter_key: str, yearmonth: str, report_kwargs: dict):
         framework.sentry.log_exception(exc)
         return
 
+    _started = time.monotonic()
+    _report_count = 0
     _reports = _reporter.report(**report_kwargs)
     for _report in _reports:
         _report.save()
+        _report_count += 1
         _followup_task = _reporter.followup_task(_report)
         if _followup_task is not None:
             _followup_task.apply_async()
+    logger.info(f'{reporter_key} ({yearmonth}): saved {_report_count} reports in {time.monotonic() - _started:.1f}s')
 
 
 class Command(BaseCommand):
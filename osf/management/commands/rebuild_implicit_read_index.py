@@ -0,0 +1,17 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from osf.models import ImplicitNodeRead
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the osf_implicitnoderead index from admin groups and component NodeRelations'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rows = ImplicitNodeRead.objects.rebuild()
+        logger.info(f'Complete. Wrote {rows} implicit read rows.')
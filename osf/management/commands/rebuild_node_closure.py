@@ -0,0 +1,17 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from osf.models import NodeClosure
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the osf_nodeclosure table from component NodeRelations'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rows = NodeClosure.objects.rebuild()
+        logger.info(f'Complete. Wrote {rows} node closure rows.')
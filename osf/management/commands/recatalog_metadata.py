@@ -2,27 +2,28 @@
 """
 import logging
 
+from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
 from addons.osfstorage.models import OsfStorageFile
-from osf.models import AbstractProvider, Registration, Preprint, Node, OSFUser
-from api.share.utils import task__update_share
+from osf.models import AbstractProvider, Guid, Registration, Preprint, Node, OSFUser
+from api.share.utils import task__update_share, task__update_share_chunk
 from website.settings import CeleryConfig
 
 
 logger = logging.getLogger(__name__)
 
 
-def recatalog(queryset, start_id, chunk_count, chunk_size):
+def recatalog(queryset, start_id, chunk_count, chunk_size, *, bulk=False):
     _chunk_start_id = start_id
     for _ in range(chunk_count):
-        _last_id = recatalog_chunk(queryset, _chunk_start_id, chunk_size)
+        _last_id = recatalog_chunk(queryset, _chunk_start_id, chunk_size, bulk=bulk)
         if _last_id is None:
             logger.info('All done!')
             return
         _chunk_start_id = _last_id + 1
 
 
-def recatalog_chunk(queryset, start_id, chunk_size):
+def recatalog_chunk(queryset, start_id, chunk_size, *, bulk=False):
     item_chunk = list(
         queryset
         .filter(id__gte=start_id)
@@ -34,23 +35,49 @@ def recatalog_chunk(queryset, start_id, chunk_size):
         first_id = item_chunk[0].id
         last_id = item_chunk[-1].id
 
+        osfids_by_item_id = _get_osfids_by_item_id(queryset.model, [item.id for item in item_chunk])
+        chunk_osfids = []
         for item in item_chunk:
-            guid = item.guids.values_list('_id', flat=True).first()
+            guid = osfids_by_item_id.get(item.id)
             if guid:
+                chunk_osfids.append(guid)
+            else:
+                logger.debug('skipping item without guid: %s', item)
+
+        chunk_label = f'{queryset.model.__name__}ses (ids in range [{first_id},{last_id}])'
+        if bulk:
+            task__update_share_chunk.apply_async(
+                kwargs={'guids': chunk_osfids, 'chunk_label': chunk_label},
+                queue=CeleryConfig.task_low_queue,  # "low priority" queue
+            )
+        else:
+            for guid in chunk_osfids:
                 task__update_share.apply_async(
                     kwargs={'guid': guid, 'is_backfill': True},
                     queue=CeleryConfig.task_low_queue,  # "low priority" queue
                 )
-            else:
-                logger.debug('skipping item without guid: %s', item)
 
-        logger.info(f'Queued metadata recataloguing for {len(item_chunk)} {queryset.model.__name__}ses (ids in range [{first_id},{last_id}])')
+        logger.info(f'Queued metadata recataloguing for {len(item_chunk)} {chunk_label}')
     else:
         logger.info(f'Done recataloguing metadata for {queryset.model.__name__}ses!')
 
     return last_id
 
 
+def _get_osfids_by_item_id(model, item_ids) -> dict:
+    # same guid as `item.guids.first()` (the newest), for all the items in one query
+    osfids_by_item_id = {}
+    guid_values = (
+        Guid.objects
+        .filter(content_type=ContentType.objects.get_for_model(model), object_id__in=item_ids)
+        .order_by('-created')
+        .values_list('object_id', '_id')
+    )
+    for item_id, osfid in guid_values:
+        osfids_by_item_id.setdefault(item_id, osfid)
+    return osfids_by_item_id
+
+
 def _recatalog_all(queryset, chunk_size):
     recatalog(queryset, start_id=0, chunk_count=int(9e9), chunk_size=chunk_size)
 
@@ -126,6 +153,11 @@ class Command(BaseCommand):
             action='store_true',
             help='also remove private and deleted items from the catalog',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='queue one task per chunk (sending its records over one connection) instead of one per item',
+        )
 
     def handle(self, *args, **options):
         pls_all_types = options['all_types']
@@ -139,6 +171,7 @@ class Command(BaseCommand):
         chunk_size = options['chunk_size']
         chunk_count = options['chunk_count']
         also_decatalog = options['also_decatalog']
+        bulk = options['bulk']
 
         if pls_all_types:
             assert not start_id, 'choose a specific type to resume with --start-id'
@@ -173,4 +206,4 @@ class Command(BaseCommand):
                     _queryset = _queryset.filter(is_public=True, is_published=True, deleted__isnull=True)
                 else:
                     _queryset = _queryset.filter(is_public=True, deleted__isnull=True)
-            recatalog(_queryset, start_id, chunk_count, chunk_size)
+            recatalog(_queryset, start_id, chunk_count, chunk_size, bulk=bulk)
@@ -0,0 +1,66 @@
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+
+from addons.osfstorage.models import OsfStorageFile, StorageUsage
+from api.caching import settings as cache_settings
+from api.caching.utils import storage_usage_cache
+from osf.models import AbstractNode
+from website import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+
+
+def reconcile_storage_usage(guids=None, chunk_size=CHUNK_SIZE):
+    """Recompute the osfstorage ledger for the given nodes, or for every node with
+    osfstorage files, walking nodes in id order a chunk at a time.
+    """
+    files = OsfStorageFile.objects.filter(
+        target_object_id=OuterRef('pk'),
+        target_content_type_id=ContentType.objects.get_for_model(AbstractNode).id,
+    )
+    nodes = AbstractNode.objects.annotate(has_files=Exists(files)).filter(has_files=True).order_by('id')
+    if guids:
+        nodes = nodes.filter(guids___id__in=guids)
+
+    reconciled = 0
+    last_id = 0
+    while True:
+        chunk = list(nodes.filter(id__gt=last_id)[:chunk_size])
+        if not chunk:
+            break
+        for node in chunk:
+            total = StorageUsage.objects.reconcile(node)
+            key = cache_settings.STORAGE_USAGE_KEY.format(target_id=node._id)
+            storage_usage_cache.set(key, total, settings.STORAGE_USAGE_CACHE_TIMEOUT)
+            reconciled += 1
+        last_id = chunk[-1].id
+        logger.info(f'Reconciled storage usage for {reconciled} nodes (through id {last_id})')
+    return reconciled
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-target osfstorage usage ledger from file versions'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--guids',
+            type=str,
+            nargs='+',
+            help='Only reconcile these nodes',
+        )
+        parser.add_argument(
+            '--chunk_size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Number of nodes to load at a time',
+        )
+
+    def handle(self, *args, **options):
+        reconciled = reconcile_storage_usage(guids=options.get('guids'), chunk_size=options['chunk_size'])
+        logger.info(f'Complete. Reconciled storage usage for {reconciled} nodes.')
@@ -1,6 +1,7 @@
 '''a gather.Basket holds gathered metadata and coordinates gatherer actions.
 
 '''
+import concurrent.futures
 import typing
 
 import rdflib
@@ -14,11 +15,32 @@ class Basket:
     focus: Focus                     # the thing to gather metadata from.
     gathered_metadata: rdflib.Graph  # heap of metadata already gathered.
     _gathertasks_done: set           # memory of gatherings already done.
+    _gathertask_memo: dict | None    # gatherer output, may be shared with other baskets.
+    _max_workers: int                # threads for gatherers on the same focus (0 to gather serially).
+    _after_threaded_gathertask: typing.Callable[[], None] | None
     _known_focus_dict: dict
 
-    def __init__(self, focus: Focus):
+    def __init__(
+        self,
+        focus: Focus,
+        *,
+        gathertask_memo: dict | None = None,
+        max_workers: int = 0,
+        after_threaded_gathertask: typing.Callable[[], None] | None = None,
+    ):
+        '''
+        @gathertask_memo: optional dict, shared by baskets that may reuse each other's gathering;
+                          maps (gatherer, focus) to the triples that gatherer gave for that focus
+        @max_workers: optional int; if more than one, gatherers for the same focus run concurrently
+                      in up to that many threads (gathered metadata is the same either way)
+        @after_threaded_gathertask: optional callable, called in the worker thread after each
+                                    concurrent gathertask (e.g. to close that thread's db connections)
+        '''
         assert isinstance(focus, Focus)
         self.focus = focus
+        self._gathertask_memo = gathertask_memo
+        self._max_workers = max_workers
+        self._after_threaded_gathertask = after_threaded_gathertask
         self.reset()  # start with an empty basket
 
     def reset(self):
@@ -26,7 +48,7 @@ class Basket:
         self._known_focus_dict = {self.focus.iri: {self.focus}}
         self.gathered_metadata = rdfutils.contextualized_graph()
 
-    def pls_gather(self, predicate_map, *, include_defaults=True):  # TODO: async
+    def pls_gather(self, predicate_map, *, include_defaults=True):
         '''go gatherers, go!
 
         @predicate_map: dict with rdflib.URIRef keys
@@ -106,12 +128,13 @@ class Basket:
                 predicate_iri: None
                 for predicate_iri in predicate_map
             }
-        for gatherer in get_gatherers(
+        gatherers = get_gatherers(
             focus.rdftype,
             predicate_map.keys(),
             include_focustype_defaults=include_defaults,
-        ):
-            for (subj, pred, obj) in self._do_a_gathertask(gatherer, focus):
+        )
+        for gathered_triples in self._do_gathertasks(gatherers, focus):
+            for (subj, pred, obj) in gathered_triples:
                 if isinstance(obj, Focus):
                     self._add_focus_reference(obj)
                     self.gathered_metadata.add((subj, pred, obj.iri))
@@ -125,12 +148,59 @@ class Basket:
                 else:
                     self.gathered_metadata.add((subj, pred, obj))
 
+    def _do_gathertasks(self, gatherers: typing.Iterable[Gatherer], focus: Focus):
+        '''invoke each gatherer with the given focus, yielding an iterable of triples per gatherer
+        (in the given order, whether or not the gatherers run concurrently)
+        '''
+        if self._max_workers <= 1:
+            for gatherer in gatherers:
+                yield self._do_a_gathertask(gatherer, focus)
+            return
+        gatherers_to_do = []
+        for gatherer in gatherers:
+            if (gatherer, focus) not in self._gathertasks_done:
+                self._gathertasks_done.add((gatherer, focus))  # eager
+                gatherers_to_do.append(gatherer)
+        if len(gatherers_to_do) <= 1:
+            for gatherer in gatherers_to_do:
+                yield self._gather_triples(gatherer, focus)
+            return
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self._max_workers, len(gatherers_to_do)),
+        ) as executor:
+            futures = [
+                executor.submit(self._gather_triples_in_thread, gatherer, focus)
+                for gatherer in gatherers_to_do
+            ]
+            gathered = [future.result() for future in futures]
+        # (outside the pool, so gathering about related foci doesn't hold its threads)
+        yield from gathered
+
     def _do_a_gathertask(self, gatherer: Gatherer, focus: Focus):
         '''invoke gatherer with the given focus, but only if it hasn't already been done
         '''
         if (gatherer, focus) not in self._gathertasks_done:
             self._gathertasks_done.add((gatherer, focus))  # eager
-            yield from gatherer(focus)
+            if self._gathertask_memo is None:
+                yield from gatherer(focus)
+            else:
+                yield from self._gather_triples(gatherer, focus)
+
+    def _gather_triples(self, gatherer: Gatherer, focus: Focus) -> tuple:
+        if self._gathertask_memo is None:
+            return tuple(gatherer(focus))
+        try:
+            return self._gathertask_memo[(gatherer, focus)]
+        except KeyError:
+            _triples = self._gathertask_memo[(gatherer, focus)] = tuple(gatherer(focus))
+            return _triples
+
+    def _gather_triples_in_thread(self, gatherer: Gatherer, focus: Focus) -> tuple:
+        try:
+            return self._gather_triples(gatherer, focus)
+        finally:
+            if self._after_threaded_gathertask is not None:
+                self._after_threaded_gathertask()
 
     def _add_focus_reference(self, focus: Focus):
         (
@@ -1,8 +1,11 @@
 '''gatherers of metadata from the osf database, in particular
 '''
+import collections
 import datetime
 import enum
 import logging
+import threading
+import time
 
 from django.contrib.contenttypes.models import ContentType
 from django import db
@@ -55,18 +58,54 @@ mime = MimeTypes()
 ##### BEGIN "public" api #####
 
 
-def pls_get_magic_metadata_basket(osf_item) -> gather.Basket:
+def pls_get_magic_metadata_basket(osf_item, *, reuse_gathered=True) -> gather.Basket:
     '''for when you just want a basket of rdf metadata about a thing
 
     @osf_item: the thing (an instance of osf.models.base.GuidMixin or a 5-ish character osf:id string)
+    @reuse_gathered: bool (default True); if False, gather everything afresh
+
+    baskets for the same unchanged thing (within METADATA_CACHE_TIMEOUT seconds, in one process)
+    share what their gatherers gathered, so serializing several formats or osfmap partitions
+    gathers each part only once -- but changes to related things (e.g. contributor names) may
+    be missed for that long, so don't reuse gathered metadata for anything kept elsewhere
+
+    with METADATA_GATHER_MAX_WORKERS set, gatherers for the same focus run in a thread pool,
+    each thread with its own db connections (which see only committed data)
     '''
     focus = OsfFocus(osf_item)
-    return gather.Basket(focus)
+    return gather.Basket(
+        focus,
+        gathertask_memo=(_get_gathertask_memo(focus) if reuse_gathered else None),
+        max_workers=website_settings.METADATA_GATHER_MAX_WORKERS,
+        after_threaded_gathertask=db.connections.close_all,
+    )
 
 
 ##### END "public" api #####
 
 
+# per-process memo of gatherer output, by (focus iri, metadata stamp)
+_gathertask_memos: collections.OrderedDict = collections.OrderedDict()
+_gathertask_memos_lock = threading.Lock()
+
+
+def _get_gathertask_memo(focus: 'OsfFocus') -> dict | None:
+    _timeout = website_settings.METADATA_CACHE_TIMEOUT
+    _max_entries = website_settings.METADATA_GATHER_MEMO_MAX_ENTRIES
+    if not (_timeout and _max_entries):
+        return None
+    _key = (focus.iri, focus.metadata_stamp())
+    _now = time.monotonic()
+    with _gathertask_memos_lock:
+        _expires, _memo = _gathertask_memos.pop(_key, (None, None))
+        if _memo is None or _expires < _now:
+            _expires, _memo = (_now + _timeout, {})
+        _gathertask_memos[_key] = (_expires, _memo)
+        while len(_gathertask_memos) > _max_entries:
+            _gathertask_memos.popitem(last=False)
+    return _memo
+
+
 ##### BEGIN osfmap #####
 # TODO: replace these dictionaries with dctap tsv or rdf/shacl file
 
@@ -338,6 +377,24 @@ class OsfFocus(gather.Focus):
         except osfdb.base.InvalidGuid:
             pass  # is ok for a focus to be something non-osfguidy
 
+    def metadata_stamp(self) -> str:
+        '''changes whenever the item or its GuidMetadataRecord is saved, or the item gets a log
+
+        (does not notice changes to related items, e.g. a contributor's name -- anything
+        keyed by this stamp should also expire)
+        '''
+        _record = getattr(self, 'guid_metadata_record', None)
+        _timestamps = (
+            getattr(self.dbmodel, 'modified', None),
+            getattr(self.dbmodel, 'last_logged', None),
+            # (an unsaved record's `modified` is just "now")
+            _record.modified if (_record is not None and _record.pk) else None,
+        )
+        return ':'.join(
+            (_timestamp.isoformat() if _timestamp else '')
+            for _timestamp in _timestamps
+        )
+
 
 ##### BEGIN the gatherers #####
 #
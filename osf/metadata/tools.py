@@ -1,10 +1,15 @@
 '''for when you don't care about rdf or gatherbaskets, just want metadata about a thing.
 '''
+import hashlib
 import typing
 
+from django.conf import settings as django_settings
+from django.core.cache import caches
+
 from osf.models.base import coerce_guid
 from osf.metadata.osf_gathering import pls_get_magic_metadata_basket
 from osf.metadata.serializers import get_metadata_serializer
+from website import settings as website_settings
 
 
 class SerializedMetadataFile(typing.NamedTuple):
@@ -13,31 +18,77 @@ class SerializedMetadataFile(typing.NamedTuple):
     serialized_metadata: str | bytes
 
 
-def pls_gather_metadata_as_dict(osf_item, format_key, serializer_config=None):
+def pls_gather_metadata_as_dict(osf_item, format_key, serializer_config=None, *, cached=True):
     '''for when you want metadata made of python primitives (e.g. a dictionary)
 
     @osf_item: the thing (osf model instance or 5-ish character guid string)
     @format_key: str (must be known by osf.metadata.serializers)
     @serializer_config: optional dict (use only when you know the serializer will understand)
+    @cached: bool (default True); if False, gather afresh (e.g. for metadata sent elsewhere)
     '''
     osfguid = coerce_guid(osf_item, create_if_needed=True)
-    basket = pls_get_magic_metadata_basket(osfguid.referent)
+    basket = pls_get_magic_metadata_basket(osfguid.referent, reuse_gathered=cached)
     serializer = get_metadata_serializer(format_key, basket, serializer_config)
-    return serializer.metadata_as_dict()
+    if not cached:
+        return serializer.metadata_as_dict()
+    return pls_get_cached_serialization(
+        osfguid._id, serializer, 'as_dict', serializer.metadata_as_dict,
+    )
 
 
-def pls_gather_metadata_file(osf_item, format_key, serializer_config=None) -> SerializedMetadataFile:
+def pls_gather_metadata_file(osf_item, format_key, serializer_config=None, *, cached=True) -> SerializedMetadataFile:
     '''for when you want metadata in a file (for saving or downloading)
 
     @osf_item: the thing (osf model instance or 5-ish character guid string)
     @format_key: str (must be known by osf.metadata.serializers)
     @serializer_config: optional dict (use only when you know the serializer will understand)
+    @cached: bool (default True); if False, gather afresh (e.g. for metadata sent elsewhere)
     '''
     osfguid = coerce_guid(osf_item, create_if_needed=True)
-    basket = pls_get_magic_metadata_basket(osfguid.referent)
+    basket = pls_get_magic_metadata_basket(osfguid.referent, reuse_gathered=cached)
     serializer = get_metadata_serializer(format_key, basket, serializer_config)
     return SerializedMetadataFile(
         mediatype=serializer.mediatype,
         filename=serializer.filename_for_itemid(osfguid._id),
-        serialized_metadata=serializer.serialize(),
+        serialized_metadata=(
+            pls_get_cached_serialization(osfguid._id, serializer, 'serialize', serializer.serialize)
+            if cached
+            else serializer.serialize()
+        ),
+    )
+
+
+def pls_get_cached_serialization(item_id: str, serializer, kind: str, serialize_fn):
+    '''reuse a serialized metadata record while its item is unchanged (see METADATA_CACHE_TIMEOUT)
+
+    @item_id: str that identifies the item (e.g. osf:id or iri)
+    @serializer: the metadata serializer (with its basket and config) that would serialize the record
+    @kind: str naming what `serialize_fn` returns (e.g. 'serialize', 'as_dict')
+    @serialize_fn: callable to get the serialized record on a cache miss
+    '''
+    if not website_settings.METADATA_CACHE_TIMEOUT:
+        return serialize_fn()
+    _cache = caches[django_settings.METADATA_RECORD_CACHE_NAME]
+    _key = _serialization_cache_key(item_id, serializer, kind)
+    _serialized = _cache.get(_key)
+    if _serialized is None:
+        _serialized = serialize_fn()
+        _cache.set(_key, _serialized, website_settings.METADATA_CACHE_TIMEOUT)
+    return _serialized
+
+
+def _serialization_cache_key(item_id: str, serializer, kind: str) -> str:
+    # (enum config values, like osfmap partitions, by name)
+    _config = ','.join(
+        f'{_name}={getattr(_value, "name", _value)}'
+        for _name, _value in sorted(serializer.serializer_config.items())
+    )
+    _key_parts = (
+        item_id,
+        type(serializer).__name__,
+        kind,
+        _config,
+        serializer.basket.focus.metadata_stamp(),
     )
+    _key_hash = hashlib.sha256('\n'.join(_key_parts).encode()).hexdigest()
+    return f'metadata_record:{_key_hash}'
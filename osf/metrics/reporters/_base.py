@@ -44,8 +44,13 @@ class DailyReporter:
         """
         raise NotImplementedError(f'{self.__class__.__name__} must implement `report`')
 
-    def run_and_record_for_date(self, report_date):
+    def run_and_record_for_date(self, report_date) -> int:
+        '''save the reports for the given date, returning how many were saved
+        '''
         # expecting each reporter to spit out only a handful of reports per day;
         # not bothering with bulk-create (this allows multiple types of reports)
+        _report_count = 0
         for report in self.report(report_date):
             report.save()
+            _report_count += 1
+        return _report_count
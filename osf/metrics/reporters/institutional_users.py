@@ -1,22 +1,33 @@
+import collections
 import dataclasses
+import datetime
+import typing
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q, F, Sum
+from django.db.models import Count, OuterRef, Subquery, Sum
 
 from osf import models as osfdb
+from osf.models.node import NodeGroupObjectPermission
 from osf.models.spam import SpamStatus
 from addons.osfstorage.models import OsfStorageFile
 from osf.metrics.utils import YearMonth
 from osf.metrics.monthly_reports import MonthlyInstitutionalUserReport
+from osf.utils.permissions import READ_NODE
 from ._base import MonthlyReporter
 
 
+USERS_PER_REPORT_TASK = 100
+
+
 class InstitutionalUsersReporter(MonthlyReporter):
     '''build a MonthlyInstitutionalUserReport for each institution-user affiliation
 
     built for the institution dashboard at ://osf.example/institutions/<id>/dashboard/,
     which offers institutional admins insight into how people at their institution are
     using osf, based on their explicitly-affiliated osf objects
+
+    users are reported in batches of USERS_PER_REPORT_TASK, with each count
+    gathered for the whole batch in one grouped query
     '''
     def iter_report_kwargs(self, continue_after: dict | None = None):
         _before_datetime = self.yearmonth.month_end()
@@ -28,164 +39,243 @@ class InstitutionalUsersReporter(MonthlyReporter):
         if continue_after:
             _inst_qs = _inst_qs.filter(pk__gte=continue_after['institution_pk'])
         for _institution in _inst_qs:
-            _user_qs = _institution.get_institution_users().filter(created__lt=_before_datetime)
+            _user_qs = (
+                _institution.get_institution_users()
+                .filter(created__lt=_before_datetime)
+                .order_by('pk')
+            )
             if continue_after and (_institution.pk == continue_after['institution_pk']):
-                _user_qs = _user_qs.filter(pk__gt=continue_after['user_pk'])
-            for _user_pk in _user_qs.values_list('pk', flat=True):
-                yield {'institution_pk': _institution.pk, 'user_pk': _user_pk}
+                _user_qs = _user_qs.filter(pk__gt=_last_user_pk(continue_after))
+            _user_pks = list(_user_qs.values_list('pk', flat=True))
+            for _i in range(0, len(_user_pks), USERS_PER_REPORT_TASK):
+                yield {
+                    'institution_pk': _institution.pk,
+                    'user_pks': _user_pks[_i:_i + USERS_PER_REPORT_TASK],
+                }
+
+    def report(self, institution_pk, user_pks=(), user_pk=None):
+        # (`user_pk` accepted for tasks enqueued before users were batched)
+        _institution = osfdb.Institution.objects.get(pk=institution_pk)
+        _user_pks = [user_pk] if user_pk is not None else user_pks
+        _helper = _InstiUserReportHelper(_institution, _user_pks, self.yearmonth)
+        yield from _helper.build_reports()
+
 
-    def report(self, **report_kwargs):
-        _institution = osfdb.Institution.objects.get(pk=report_kwargs['institution_pk'])
-        _user = osfdb.OSFUser.objects.get(pk=report_kwargs['user_pk'])
-        _helper = _InstiUserReportHelper(_institution, _user, self.yearmonth)
-        yield _helper.build_report()
+def _last_user_pk(report_kwargs: dict) -> int:
+    return (
+        report_kwargs['user_pks'][-1]
+        if 'user_pks' in report_kwargs
+        else report_kwargs['user_pk']
+    )
+
+
+class _NodeRow(typing.NamedTuple):
+    pk: int
+    type: str
+    is_public: bool
+    root_id: int
+    embargo_end_date: datetime.datetime | None
 
 
 # helper
 @dataclasses.dataclass
 class _InstiUserReportHelper:
     institution: osfdb.Institution
-    user: osfdb.OSFUser
+    user_pks: list[int]
     yearmonth: YearMonth
 
-    def build_report(self):
-        _affiliation = self.user.get_institution_affiliation(self.institution._id)
-        return MonthlyInstitutionalUserReport(
-            report_yearmonth=self.yearmonth,
-            institution_id=self.institution._id,
-            user_id=self.user._id,
-            user_name=self.user.fullname,
-            department_name=(_affiliation.sso_department or None),
-            month_last_login=(
-                YearMonth.from_date(self.user.date_last_login)
-                if self.user.date_last_login is not None
-                else None
-            ),
-            month_last_active=self._get_last_active(),
-            account_creation_date=YearMonth.from_date(self.user.created),
-            orcid_id=self.user.get_verified_external_id('ORCID', verified_only=True),
-            public_project_count=self._public_project_queryset().count(),
-            private_project_count=self._private_project_queryset().count(),
-            public_registration_count=self._public_registration_queryset().count(),
-            embargoed_registration_count=self._embargoed_registration_queryset().count(),
-            public_file_count=self._public_osfstorage_file_count(),
-            published_preprint_count=self._published_preprint_queryset().count(),
-            storage_byte_count=self._storage_byte_count(),
+    def build_reports(self):
+        _departments = dict(
+            osfdb.InstitutionAffiliation.objects
+            .filter(institution=self.institution, user_id__in=self.user_pks)
+            .values_list('user_id', 'sso_department')
         )
+        _nodes_by_user = self._nodes_by_user()
+        _preprints_by_user = self._published_preprints_by_user()
+        _node_file_stats = self._public_osfstorage_file_stats(osfdb.AbstractNode, {
+            _node.pk
+            for _nodes in _nodes_by_user.values()
+            for _node in _nodes
+            if _node.is_public
+        })
+        _preprint_file_stats = self._public_osfstorage_file_stats(osfdb.Preprint, {
+            _preprint_pk
+            for _preprint_pks in _preprints_by_user.values()
+            for _preprint_pk in _preprint_pks
+        })
+        for _user in self._user_queryset():
+            _nodes = _nodes_by_user.get(_user.pk, ())
+            _root_nodes = [_node for _node in _nodes if _node.root_id == _node.pk]
+            _preprint_pks = _preprints_by_user.get(_user.pk, set())
+            _file_stats = [
+                *(_node_file_stats.get(_node.pk, (0, 0)) for _node in _nodes if _node.is_public),
+                *(_preprint_file_stats.get(_preprint_pk, (0, 0)) for _preprint_pk in _preprint_pks),
+            ]
+            _last_active = max(filter(bool, [_user.last_node_log, _user.last_preprint_log]), default=None)
+            yield MonthlyInstitutionalUserReport(
+                report_yearmonth=self.yearmonth,
+                institution_id=self.institution._id,
+                user_id=_user._id,
+                user_name=_user.fullname,
+                department_name=(_departments.get(_user.pk) or None),
+                month_last_login=(
+                    YearMonth.from_date(_user.date_last_login)
+                    if _user.date_last_login is not None
+                    else None
+                ),
+                month_last_active=(
+                    YearMonth.from_date(_last_active)
+                    if _last_active is not None
+                    else None
+                ),
+                account_creation_date=YearMonth.from_date(_user.created),
+                orcid_id=_user.get_verified_external_id('ORCID', verified_only=True),
+                public_project_count=sum(
+                    1 for _node in _root_nodes
+                    if _node.type == 'osf.node' and _node.is_public
+                ),
+                private_project_count=sum(
+                    1 for _node in _root_nodes
+                    if _node.type == 'osf.node' and not _node.is_public
+                ),
+                public_registration_count=sum(
+                    1 for _node in _root_nodes
+                    if _node.type == 'osf.registration' and _node.is_public
+                ),
+                embargoed_registration_count=sum(
+                    1 for _node in _root_nodes
+                    if _node.type == 'osf.registration' and not _node.is_public
+                    and _node.embargo_end_date is not None
+                    and _node.embargo_end_date >= self.before_datetime
+                ),
+                public_file_count=sum(_count for _count, _ in _file_stats),
+                published_preprint_count=len(_preprint_pks),
+                storage_byte_count=sum(_bytes for _, _bytes in _file_stats),
+            )
 
     @property
     def before_datetime(self):
         return self.yearmonth.month_end()
 
+    def _user_queryset(self):
+        return (
+            osfdb.OSFUser.objects
+            .filter(pk__in=self.user_pks)
+            .annotate(
+                last_node_log=Subquery(
+                    osfdb.NodeLog.objects
+                    .filter(user=OuterRef('pk'), created__lt=self.before_datetime)
+                    .order_by('-created')
+                    .values('created')[:1]
+                ),
+                last_preprint_log=Subquery(
+                    osfdb.PreprintLog.objects
+                    .filter(user=OuterRef('pk'), created__lt=self.before_datetime)
+                    .order_by('-created')
+                    .values('created')[:1]
+                ),
+            )
+            .order_by('pk')
+        )
+
     def _node_queryset(self):
-        _institution_node_qs = self.institution.nodes.filter(
+        return self.institution.nodes.filter(
             created__lt=self.before_datetime,
             is_deleted=False,
         ).exclude(spam_status=SpamStatus.SPAM)
-        return osfdb.Node.objects.get_nodes_for_user(
-            user=self.user,
-            base_queryset=_institution_node_qs,
-        )
 
-    def _public_project_queryset(self):
-        return self._node_queryset().filter(
-            type='osf.node',  # `type` field from TypedModel
-            is_public=True,
-            root_id=F('pk'),  # only root nodes
-        )
-
-    def _private_project_queryset(self):
-        return self._node_queryset().filter(
-            type='osf.node',  # `type` field from TypedModel
-            is_public=False,
-            root_id=F('pk'),  # only root nodes
-        )
-
-    def _public_registration_queryset(self):
-        return self._node_queryset().filter(
-            type='osf.registration',  # `type` field from TypedModel
-            is_public=True,
-            root_id=F('pk'),  # only root nodes
-        )
-
-    def _embargoed_registration_queryset(self):
-        return self._node_queryset().filter(
-            type='osf.registration',  # `type` field from TypedModel
-            is_public=False,
-            root_id=F('pk'),  # only root nodes
-            embargo__end_date__gte=self.before_datetime,
-        )
+    def _nodes_by_user(self) -> dict[int, list[_NodeRow]]:
+        '''the institution's nodes each user can read (like `get_nodes_for_user`),
+        by user pk -- read permission comes through the node's guardian groups
+        '''
+        _groups_by_user = collections.defaultdict(set)
+        for _user_pk, _group_pk in (
+            osfdb.OSFUser.groups.through.objects
+            .filter(osfuser_id__in=self.user_pks)
+            .values_list('osfuser_id', 'group_id')
+        ):
+            _groups_by_user[_user_pk].add(_group_pk)
+        _node_pks_by_group = collections.defaultdict(set)
+        for _group_pk, _node_pk in (
+            NodeGroupObjectPermission.objects
+            .filter(
+                group_id__in=osfdb.OSFUser.groups.through.objects.filter(
+                    osfuser_id__in=self.user_pks,
+                ).values('group_id'),
+                permission__codename=READ_NODE,
+                content_object_id__in=self._node_queryset().values('pk'),
+            )
+            .values_list('group_id', 'content_object_id')
+        ):
+            _node_pks_by_group[_group_pk].add(_node_pk)
+        _nodes = {
+            _row[0]: _NodeRow(*_row)
+            for _row in (
+                osfdb.AbstractNode.objects
+                .filter(pk__in={_pk for _pks in _node_pks_by_group.values() for _pk in _pks})
+                .values_list('pk', 'type', 'is_public', 'root_id', 'embargo__end_date')
+            )
+        }
+        return {
+            _user_pk: [
+                _nodes[_node_pk]
+                for _node_pk in set().union(*(_node_pks_by_group[_group_pk] for _group_pk in _group_pks))
+                if _node_pk in _nodes
+            ]
+            for _user_pk, _group_pks in _groups_by_user.items()
+        }
 
-    def _published_preprint_queryset(self):
-        return (
+    def _published_preprints_by_user(self) -> dict[int, set[int]]:
+        _preprint_qs = (
             osfdb.Preprint.objects.can_view()  # published/publicly-viewable
             .filter(
                 affiliated_institutions=self.institution,
-                _contributors=self.user,
                 date_published__lt=self.before_datetime,
             )
             .exclude(spam_status=SpamStatus.SPAM)
         )
+        _preprints_by_user = collections.defaultdict(set)
+        for _user_pk, _preprint_pk in (
+            osfdb.PreprintContributor.objects
+            .filter(user_id__in=self.user_pks, preprint__in=_preprint_qs.values('pk'))
+            .values_list('user_id', 'preprint_id')
+        ):
+            _preprints_by_user[_user_pk].add(_preprint_pk)
+        return _preprints_by_user
 
-    def _public_osfstorage_file_querysets(self):
-        _target_node_q = Q(
-            # any public project, registration, project component, or registration component
-            target_object_id__in=self._node_queryset().filter(is_public=True).values('pk'),
-            target_content_type=ContentType.objects.get_for_model(osfdb.AbstractNode),
-        )
-        _target_preprint_q = Q(
-            target_object_id__in=self._published_preprint_queryset().values('pk'),
-            target_content_type=ContentType.objects.get_for_model(osfdb.Preprint),
-        )
-        return (  # split into two queries to avoid a parallel sequence scan on BFN
-            OsfStorageFile.objects
-            .filter(
-                created__lt=self.before_datetime,
-                deleted__isnull=True,
-                purged__isnull=True,
-            )
-            .filter(_target_node_q),
-            OsfStorageFile.objects
-            .filter(
-                created__lt=self.before_datetime,
-                deleted__isnull=True,
-                purged__isnull=True,
-            )
-            .filter(_target_preprint_q)
+    def _public_osfstorage_file_stats(self, target_model, target_pks) -> dict[int, tuple[int, int]]:
+        '''(file count, stored bytes) for each of the given targets, one grouped query each
+        (per target type, to avoid a parallel sequence scan on BFN)
+        '''
+        if not target_pks:
+            return {}
+        _file_qs = OsfStorageFile.objects.filter(
+            created__lt=self.before_datetime,
+            deleted__isnull=True,
+            purged__isnull=True,
+            target_object_id__in=target_pks,
+            target_content_type=ContentType.objects.get_for_model(target_model),
         )
-
-    def _public_osfstorage_file_count(self):
-        return sum(
-            _target_queryset.count() for _target_queryset
-            in self._public_osfstorage_file_querysets()
+        _file_counts = dict(
+            _file_qs
+            .order_by()
+            .values('target_object_id')
+            .annotate(file_count=Count('pk'))
+            .values_list('target_object_id', 'file_count')
         )
-
-    def _storage_byte_count(self):
-        return sum(
+        _byte_counts = dict(
             osfdb.FileVersion.objects.filter(
                 size__gt=0,
                 created__lt=self.before_datetime,
                 purged__isnull=True,
-                basefilenode__in=_target_queryset,
-            ).aggregate(storage_bytes=Sum('size', default=0))['storage_bytes']
-            for _target_queryset
-            in self._public_osfstorage_file_querysets()
+                basefilenode__in=_file_qs,
+            )
+            .order_by()
+            .values('basefilenode__target_object_id')
+            .annotate(storage_bytes=Sum('size'))
+            .values_list('basefilenode__target_object_id', 'storage_bytes')
         )
-
-    def _get_last_active(self):
-        end_date = self.yearmonth.month_end()
-
-        node_logs = self.user.logs.filter(created__lt=end_date).order_by('-created')
-        preprint_logs = self.user.preprint_logs.filter(created__lt=end_date).order_by('-created')
-
-        dates = filter(bool, [
-            node_logs.values_list('created', flat=True).first(),
-            preprint_logs.values_list('created', flat=True).first(),
-        ])
-
-        latest_activity_date = max(dates, default=None)
-
-        if latest_activity_date:
-            return YearMonth.from_date(latest_activity_date)
-        else:
-            return None
+        return {
+            _target_pk: (_file_counts.get(_target_pk, 0), _byte_counts.get(_target_pk, 0))
+            for _target_pk in target_pks
+        }
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.26 on 2026-10-16 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osf', '0042_cedarmetadatatemplate_is_for_collections'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='basefilenode',
+            name='earliest_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='osf.fileversion'),
+        ),
+        migrations.AddField(
+            model_name='basefilenode',
+            name='latest_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='osf.fileversion'),
+        ),
+        migrations.AddIndex(
+            model_name='basefilenode',
+            index=models.Index(fields=['parent', 'name', 'id'], name='osf_basefilenode_parent_name'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.26 on 2026-10-16 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osf', '0043_basefilenode_version_pointers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NodeClosure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='osf.abstractnode')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='osf.abstractnode')),
+            ],
+            options={
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='nodeclosure',
+            index=models.Index(fields=['descendant', 'depth'], name='osf_nodeclosure_desc_depth'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.26 on 2026-10-16 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osf', '0044_nodeclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImplicitNodeRead',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('node', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='osf.abstractnode')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'node')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.26 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osf', '0045_implicitnoderead'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='basefilenode',
+            index=models.Index(condition=models.Q(('provider', 'osfstorage')), fields=['target_object_id', '_materialized_path'], name='osf_basefilenode_osfs_path', opclasses=['int4_ops', 'text_pattern_ops']),
+        ),
+    ]
@@ -48,6 +48,7 @@ from .files import (
     TrashedFileNode,
 )
 from .identifiers import Identifier
+from .implicit_read import ImplicitNodeRead
 from .institution import Institution
 from .institution_affiliation import InstitutionAffiliation
 from .institution_storage_region import InstitutionStorageRegion
@@ -60,7 +61,7 @@ from .metaschema import (
     RegistrationSchemaBlock,
 )
 from .node import AbstractNode, Node
-from .node_relation import NodeRelation
+from .node_relation import NodeClosure, NodeRelation
 from .nodelog import NodeLog
 from .notable_domain import NotableDomain, DomainReference
 from .notifications import NotificationSubscriptionLegacy
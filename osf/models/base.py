@@ -1,16 +1,20 @@
+from collections import Counter, OrderedDict, defaultdict
 from collections.abc import Iterable
 import logging
 import random
+import threading
+import time
 
 import bson
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
 from django.core.exceptions import MultipleObjectsReturned
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import connections, models
 from django.db.models import ForeignKey, UniqueConstraint
 from django.db.models.query import QuerySet
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django_extensions.db.models import TimeStampedModel
 
@@ -202,6 +206,88 @@ class BaseModel(TimeStampedModel, QuerySetExplainMixin):
         yield from ()  # no semantic iris unless implemented in a subclass
 
 
+class GuidResolver:
+    """Per-process LRU of guid rows, so resolving a guid to its referent costs only the referent
+    query. Rows can also be shared between processes through the Django cache named by
+    GUID_RESOLVER_CACHE_NAME. Entries expire after GUID_RESOLVER_TIMEOUT seconds and are dropped
+    when their Guid is saved or deleted in this process.
+    """
+    FIELD_NAMES = ('id', '_id', 'content_type_id', 'object_id', 'created')
+
+    def __init__(self):
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics = Counter()
+
+    @property
+    def enabled(self):
+        return website_settings.GUID_RESOLVER_MAX_ENTRIES > 0
+
+    def _get_shared_cache(self):
+        if website_settings.GUID_RESOLVER_CACHE_NAME:
+            return caches[website_settings.GUID_RESOLVER_CACHE_NAME]
+        return None
+
+    def _remember(self, rows):
+        expires = time.monotonic() + website_settings.GUID_RESOLVER_TIMEOUT
+        with self._lock:
+            for row in rows:
+                self._rows.pop(row[1], None)
+                self._rows[row[1]] = (expires, row)
+            while len(self._rows) > website_settings.GUID_RESOLVER_MAX_ENTRIES:
+                self._rows.popitem(last=False)
+
+    def get_many(self, guid_strs):
+        """Return a dict of base guid str to Guid, for the guids that exist."""
+        rows = {}
+        now = time.monotonic()
+        with self._lock:
+            for guid_str in guid_strs:
+                entry = self._rows.get(guid_str)
+                if entry and entry[0] > now:
+                    self._rows.move_to_end(guid_str)
+                    rows[guid_str] = entry[1]
+        self.metrics['hits'] += len(rows)
+
+        missing = [guid_str for guid_str in guid_strs if guid_str not in rows]
+        shared_cache = self._get_shared_cache()
+        if missing and shared_cache is not None:
+            shared = shared_cache.get_many([f'guid:{guid_str}' for guid_str in missing])
+            shared_rows = [tuple(row) for row in shared.values()]
+            self._remember(shared_rows)
+            rows.update((row[1], row) for row in shared_rows)
+            self.metrics['shared_hits'] += len(shared_rows)
+            missing = [guid_str for guid_str in missing if guid_str not in rows]
+
+        if missing:
+            self.metrics['misses'] += len(missing)
+            loaded = list(Guid.objects.filter(_id__in=missing).values_list(*self.FIELD_NAMES))
+            self._remember(loaded)
+            if shared_cache is not None and loaded:
+                shared_cache.set_many({f'guid:{row[1]}': row for row in loaded}, website_settings.GUID_RESOLVER_TIMEOUT)
+            rows.update((row[1], row) for row in loaded)
+
+        return {
+            guid_str: Guid.from_db('default', self.FIELD_NAMES, row)
+            for guid_str, row in rows.items()
+        }
+
+    def forget(self, *guid_strs):
+        with self._lock:
+            for guid_str in guid_strs:
+                self._rows.pop(guid_str, None)
+        shared_cache = self._get_shared_cache()
+        if shared_cache is not None:
+            shared_cache.delete_many([f'guid:{guid_str}' for guid_str in guid_strs])
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+
+guid_resolver = GuidResolver()
+
+
 class Guid(BaseModel):
     """Stores either a short guid or long object_id for any model that inherits from BaseIDMixin.
     Each ID field (e.g. 'guid', 'object_id') MUST have an accompanying method, named with
@@ -242,6 +328,12 @@ class Guid(BaseModel):
         if not data:
             return None
         base_guid_str, version = cls.split_guid(data)
+        if not select_for_update and guid_resolver.enabled:
+            guid = guid_resolver.get_many([base_guid_str]).get(base_guid_str)
+            if not (guid or skip_log_not_found):
+                logger.debug(f'Object not found from base guid: '
+                             f'[data={data}, base_guid={base_guid_str}, version={version}]')
+            return guid
         try:
             if not select_for_update:
                 return cls.objects.get(_id=base_guid_str)
@@ -276,10 +368,43 @@ class Guid(BaseModel):
             return referent, referent.version
         # Handles guid str without version
         referent = base_guid_obj.referent
+        if referent is None and guid_resolver.enabled:
+            # The resolver may have handed out a row that was repointed by another process
+            guid_resolver.forget(base_guid_str)
+            base_guid_obj = cls.objects.filter(_id=base_guid_str).first()
+            referent = base_guid_obj.referent if base_guid_obj else None
+            if referent is None:
+                return None, None
         # If the guid str doesn't have version but supports versioning, we need to check and return the version
         version = referent.version if hasattr(referent, 'version') else None
         return referent, version
 
+    @classmethod
+    def load_many(cls, guid_strs):
+        """Load many guid strs at once, with one query per referent type (plus one for any guids
+        the resolver doesn't know). Returns a dict of base guid str to Guid, each with its referent
+        already loaded; versions in guid strs are ignored and guids that don't resolve are left out.
+        """
+        base_guid_strs = {cls.split_guid(guid_str)[0] for guid_str in guid_strs if guid_str}
+        if guid_resolver.enabled:
+            guids = guid_resolver.get_many(list(base_guid_strs)).values()
+        else:
+            guids = cls.objects.filter(_id__in=base_guid_strs)
+
+        guids_by_type = defaultdict(dict)
+        for guid in guids:
+            if guid.content_type_id:
+                guids_by_type[guid.content_type_id][guid.object_id] = guid
+
+        loaded = {}
+        for content_type_id, guids_by_object_id in guids_by_type.items():
+            content_type = ContentType.objects.get_for_id(content_type_id)
+            for referent in content_type.get_all_objects_for_this_type(pk__in=guids_by_object_id):
+                guid = guids_by_object_id[referent.pk]
+                guid.referent = referent
+                loaded[guid._id] = guid
+        return loaded
+
     @property
     def is_versioned(self):
         return self.versions.exists()
@@ -626,6 +751,12 @@ def _clear_cached_guid(instance):
         del instance._prefetched_objects_cache['guids']
 
 
+@receiver(post_save, sender=Guid)
+@receiver(post_delete, sender=Guid)
+def forget_resolved_guid(sender, instance, **kwargs):
+    guid_resolver.forget(instance._id)
+
+
 @receiver(post_save)
 def ensure_guid(sender, instance, **kwargs):
     """Generate guid if it doesn't exist for subclasses of GuidMixin except for subclasses of VersionedGuidMixin
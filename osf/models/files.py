@@ -5,7 +5,7 @@ import requests
 from dateutil.parser import parse as parse_date
 from django.apps import apps
 from django.db import models, IntegrityError
-from django.db.models import Manager
+from django.db.models import Manager, Q
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
@@ -24,6 +24,7 @@ from osf.utils.fields import NonNaiveDateTimeField
 from api.base.utils import waterbutler_api_url_for
 from website.files import utils
 from website.files.exceptions import VersionNotFoundError
+from website import settings
 from website.util import api_v2_url, web_url_for, api_url_for
 
 __all__ = (
@@ -88,6 +89,11 @@ class BaseFileNode(TypedModel, CommentableMixin, OptionalGuidMixin, Taggable, Ob
     _history = DateTimeAwareJSONField(default=list, blank=True)
     # A concrete version of a FileNode, must have an identifier
     versions = models.ManyToManyField('FileVersion', through='BaseFileVersionsThrough')
+    # Most and least recently created of `versions`, kept up to date by `add_version` so listings
+    # don't need to sort each file's versions. Null when the file has no versions or the
+    # pointers haven't been backfilled yet.
+    latest_version = models.ForeignKey('FileVersion', null=True, blank=True, related_name='+', on_delete=models.SET_NULL)
+    earliest_version = models.ForeignKey('FileVersion', null=True, blank=True, related_name='+', on_delete=models.SET_NULL)
 
     target_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     target_object_id = models.PositiveIntegerField()
@@ -117,6 +123,15 @@ class BaseFileNode(TypedModel, CommentableMixin, OptionalGuidMixin, Taggable, Ob
         index_together = (
             ('target_content_type', 'target_object_id', )
         )
+        indexes = [
+            models.Index(fields=['parent', 'name', 'id'], name='osf_basefilenode_parent_name'),
+            models.Index(
+                fields=['target_object_id', '_materialized_path'],
+                name='osf_basefilenode_osfs_path',
+                opclasses=['int4_ops', 'text_pattern_ops'],
+                condition=Q(provider='osfstorage'),
+            ),
+        ]
 
     @property
     def history(self):
@@ -218,7 +233,7 @@ class BaseFileNode(TypedModel, CommentableMixin, OptionalGuidMixin, Taggable, Ob
             # it's a file
             try:
                 file_obj = cls.objects.get(
-                    target_object_id=target.id, target_content_type=content_type, _materialized_path=materialized_path
+                    provider=provider, target_object_id=target.id, target_content_type=content_type, _materialized_path=materialized_path
                 )
             except cls.DoesNotExist:
                 return guids
@@ -249,8 +264,24 @@ class BaseFileNode(TypedModel, CommentableMixin, OptionalGuidMixin, Taggable, Ob
         """
         version_name = name or self.name
         BaseFileVersionsThrough.objects.create(fileversion=version, basefilenode=self, version_name=version_name)
+        self._update_version_pointers(version)
         return version
 
+    def _update_version_pointers(self, version):
+        if self.latest_version_id is None and self.versions.exclude(id=version.id).exists():
+            # Pointers were never backfilled for this file; leave them for the backfill
+            return
+        updates = {}
+        if self.latest_version_id is None or version.created >= self.latest_version.created:
+            updates['latest_version'] = version
+        if self.earliest_version_id is None or version.created < self.earliest_version.created:
+            updates['earliest_version'] = version
+        if updates:
+            for field_name, value in updates.items():
+                setattr(self, field_name, value)
+            # Avoid a full save, which would re-trigger search and SHARE updates
+            BaseFileNode.objects.filter(id=self.id).update(**updates)
+
     @classmethod
     def files_checked_out(cls, user):
         """
@@ -676,6 +707,10 @@ class TrashedFileNode(BaseFileNode):
         if save:
             self.save()
 
+        if settings.ENABLE_STORAGE_USAGE_LEDGER and self.provider == 'osfstorage' and self.is_file:
+            StorageUsage = apps.get_model('addons_osfstorage.StorageUsage')
+            StorageUsage.objects.record_file(self)
+
         return self
 
     def _purge(self, client=None, save=True):
@@ -0,0 +1,167 @@
+from django.contrib.auth.models import Group
+from django.db import connection, models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from website import settings
+
+from .node_relation import NodeRelation
+
+# Every component below a project the user administers, as found by the `implicit_read`
+# CTE in AbstractNodeQuerySet.can_view.
+REFRESH_IMPLICIT_READ_SQL = """
+    WITH RECURSIVE implicit_read AS (
+        SELECT UG.osfuser_id AS user_id, N.id AS node_id, ARRAY[N.id] AS path
+        FROM osf_abstractnode AS N, auth_permission AS P, osf_nodegroupobjectpermission AS G, osf_osfuser_groups AS UG
+        WHERE P.codename = 'admin_node'
+        AND G.permission_id = P.id
+        AND G.group_id = UG.group_id
+        AND G.content_object_id = N.id
+        AND N.type = 'osf.node'
+        {user_filter}
+    UNION ALL
+        SELECT I.user_id, R.child_id, I.path || R.child_id
+        FROM implicit_read AS I
+        JOIN osf_noderelation AS R ON R.parent_id = I.node_id
+        WHERE R.is_node_link IS FALSE AND NOT R.child_id = ANY(I.path)
+    )
+    INSERT INTO osf_implicitnoderead (user_id, node_id)
+    SELECT DISTINCT user_id, node_id
+    FROM implicit_read
+    WHERE array_length(path, 1) > 1
+    ON CONFLICT (user_id, node_id) DO NOTHING
+"""
+
+# ``node_id`` and every component below it.
+SUBTREE_SQL = """
+    WITH RECURSIVE subtree AS (
+        SELECT %s::integer AS node_id, ARRAY[%s::integer] AS path
+    UNION ALL
+        SELECT R.child_id, S.path || R.child_id
+        FROM subtree AS S
+        JOIN osf_noderelation AS R ON R.parent_id = S.node_id
+        WHERE R.is_node_link IS FALSE AND NOT R.child_id = ANY(S.path)
+    )
+    SELECT DISTINCT node_id FROM subtree
+"""
+
+# The rows of REFRESH_IMPLICIT_READ_SQL for the given subtree only: admins are looked up on the
+# subtree's own ancestors and on the subtree, and the walk down never leaves that lineage.
+REFRESH_IMPLICIT_READ_FOR_SUBTREE_SQL = """
+    WITH RECURSIVE ancestors AS (
+        SELECT %s::integer AS node_id, ARRAY[%s::integer] AS path
+    UNION ALL
+        SELECT R.parent_id, A.path || R.parent_id
+        FROM ancestors AS A
+        JOIN osf_noderelation AS R ON R.child_id = A.node_id
+        WHERE R.is_node_link IS FALSE AND NOT R.parent_id = ANY(A.path)
+    ), lineage AS (
+        SELECT node_id FROM ancestors
+    UNION
+        SELECT unnest(%s::integer[])
+    ), implicit_read AS (
+        SELECT UG.osfuser_id AS user_id, N.id AS node_id, ARRAY[N.id] AS path
+        FROM lineage AS L, osf_abstractnode AS N, auth_permission AS P, osf_nodegroupobjectpermission AS G, osf_osfuser_groups AS UG
+        WHERE N.id = L.node_id
+        AND P.codename = 'admin_node'
+        AND G.permission_id = P.id
+        AND G.group_id = UG.group_id
+        AND G.content_object_id = N.id
+        AND N.type = 'osf.node'
+    UNION ALL
+        SELECT I.user_id, R.child_id, I.path || R.child_id
+        FROM implicit_read AS I
+        JOIN osf_noderelation AS R ON R.parent_id = I.node_id
+        JOIN lineage AS L ON L.node_id = R.child_id
+        WHERE R.is_node_link IS FALSE AND NOT R.child_id = ANY(I.path)
+    )
+    INSERT INTO osf_implicitnoderead (user_id, node_id)
+    SELECT DISTINCT user_id, node_id
+    FROM implicit_read
+    WHERE array_length(path, 1) > 1
+    AND node_id = ANY(%s)
+    ON CONFLICT (user_id, node_id) DO NOTHING
+"""
+
+
+class ImplicitNodeReadQuerySet(models.QuerySet):
+
+    def refresh_for_users(self, user_ids):
+        """Recompute the index rows for ``user_ids``."""
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM osf_implicitnoderead WHERE user_id = ANY(%s)', [user_ids])
+            cursor.execute(
+                REFRESH_IMPLICIT_READ_SQL.format(user_filter='AND UG.osfuser_id = ANY(%s)'),
+                [user_ids],
+            )
+
+    def refresh_for_subtree(self, node_id):
+        """Recompute the index rows for ``node_id`` and every node below it.
+        Walks osf_noderelation rather than osf_nodeclosure, which may not have been built.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(SUBTREE_SQL, [node_id, node_id])
+            node_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute('DELETE FROM osf_implicitnoderead WHERE node_id = ANY(%s)', [node_ids])
+            cursor.execute(REFRESH_IMPLICIT_READ_FOR_SUBTREE_SQL, [node_id, node_id, node_ids, node_ids])
+
+    def rebuild(self):
+        """Recompute the whole index."""
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM osf_implicitnoderead')
+            cursor.execute(REFRESH_IMPLICIT_READ_SQL.format(user_filter=''))
+            return cursor.rowcount
+
+
+class ImplicitNodeRead(models.Model):
+    """Components a user can read because they administer a project above them.
+    Kept up to date when admin group membership or component relations change, while
+    ENABLE_IMPLICIT_READ_INDEX is on (rebuild after turning it on).
+    """
+    user = models.ForeignKey('OSFUser', related_name='+', on_delete=models.CASCADE)
+    node = models.ForeignKey('AbstractNode', related_name='+', on_delete=models.CASCADE)
+
+    objects = ImplicitNodeReadQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('user', 'node')
+
+
+def is_node_admin_group(group_ids):
+    return Group.objects.filter(id__in=group_ids, name__startswith='node_', name__endswith='_admin').exists()
+
+
+@receiver(m2m_changed, sender='osf.osfuser_groups')
+def update_implicit_read_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not settings.ENABLE_IMPLICIT_READ_INDEX:
+        return
+    if action in ('post_add', 'post_remove'):
+        if reverse:
+            if is_node_admin_group([instance.pk]):
+                ImplicitNodeRead.objects.refresh_for_users(pk_set)
+        elif is_node_admin_group(pk_set):
+            ImplicitNodeRead.objects.refresh_for_users([instance.pk])
+    elif action == 'pre_clear' and reverse and is_node_admin_group([instance.pk]):
+        instance._implicit_read_user_ids = list(instance.user_set.values_list('id', flat=True))
+    elif action == 'post_clear':
+        user_ids = getattr(instance, '_implicit_read_user_ids', []) if reverse else [instance.pk]
+        ImplicitNodeRead.objects.refresh_for_users(user_ids)
+
+
+def update_implicit_read_for_relation(relation):
+    # only the child's subtree gains or loses ancestors
+    if settings.ENABLE_IMPLICIT_READ_INDEX and not relation.is_node_link:
+        ImplicitNodeRead.objects.refresh_for_subtree(relation.child_id)
+
+
+@receiver(post_save, sender=NodeRelation)
+def update_implicit_read_on_relation_save(sender, instance, **kwargs):
+    update_implicit_read_for_relation(instance)
+
+
+@receiver(post_delete, sender=NodeRelation)
+def update_implicit_read_on_relation_delete(sender, instance, **kwargs):
+    update_implicit_read_for_relation(instance)
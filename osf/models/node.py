@@ -1,3 +1,4 @@
+from collections import defaultdict
 import functools
 import itertools
 import logging
@@ -8,7 +9,7 @@ import warnings
 from rest_framework import status as http_status
 
 import bson
-from django.db.models import Q
+from django.db.models import OuterRef, Q, Subquery
 from dirtyfields import DirtyFieldsMixin
 from django.apps import apps
 from django.contrib.auth.models import AnonymousUser, Permission
@@ -45,7 +46,8 @@ from .metadata import GuidMetadataRecord
 from .mixins import (AddonModelMixin, CommentableMixin, Loggable, GuardianMixin,
                      NodeLinkMixin, SpamOverrideMixin, RegistrationResponseMixin,
                      EditableFieldsMixin, ShareIndexMixin)
-from .node_relation import NodeRelation
+from .implicit_read import ImplicitNodeRead
+from .node_relation import NodeClosure, NodeRelation
 from .nodelog import NodeLog
 from .private_link import PrivateLink
 from .tag import Tag
@@ -82,9 +84,9 @@ from website.util.metrics import OsfSourceTags, CampaignSourceTags
 from website.util import api_url_for, api_v2_url, web_url_for
 from .base import BaseModel, GuidMixin, GuidMixinQuerySet, check_manually_assigned_guid
 from api.base.exceptions import Conflict
-from api.caching.tasks import update_storage_usage
+from api.caching.tasks import get_storage_usage_from_ledger, update_storage_usage
 from api.caching import settings as cache_settings
-from api.caching.utils import storage_usage_cache
+from api.caching.utils import forget_waterbutler_auth, storage_usage_cache
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +98,20 @@ class AbstractNodeQuerySet(GuidMixinQuerySet):
             id__in=self.exclude(type__in=['osf.collection', 'osf.draftnode']).values_list(
                 'root_id', flat=True))
 
+    def get_descendants(self, node, max_depth=None):
+        """Nodes below ``node`` through component relations, read from the closure table."""
+        closure = NodeClosure.objects.filter(ancestor=node)
+        if max_depth is not None:
+            closure = closure.filter(depth__lte=max_depth)
+        return self.filter(id__in=closure.values('descendant_id'))
+
+    def get_ancestors(self, node):
+        """Nodes above ``node`` through component relations, nearest first."""
+        depth = NodeClosure.objects.filter(ancestor=OuterRef('pk'), descendant=node).values('depth')[:1]
+        return self.filter(
+            id__in=NodeClosure.objects.filter(descendant=node).values('ancestor_id')
+        ).annotate(closure_depth=Subquery(depth)).order_by('closure_depth')
+
     def get_children(self, root, active=False, include_root=False):
         # If `root` is a root node, we can use the 'descendants' related name
         # rather than doing a recursive query
@@ -104,6 +120,13 @@ class AbstractNodeQuerySet(GuidMixinQuerySet):
             if active:
                 query = query.filter(is_deleted=False)
             return query
+        elif settings.ENABLE_NODE_CLOSURE:
+            query = AbstractNode.objects.get_descendants(root)
+            if include_root:
+                query |= AbstractNode.objects.filter(id=root.pk)
+            if active:
+                query = query.filter(is_deleted=False)
+            return query
         else:
             sql = """
                 WITH RECURSIVE descendants AS (
@@ -163,6 +186,9 @@ class AbstractNodeQuerySet(GuidMixinQuerySet):
         qs = self.filter(is_public=True) if not custom_filters else self.filter(**custom_filters)
         if user is not None and not isinstance(user, AnonymousUser):
             qs |= get_objects_for_user(user, READ_NODE, self, with_superuser=False)
+            if settings.ENABLE_IMPLICIT_READ_INDEX:
+                qs |= self.filter(id__in=ImplicitNodeRead.objects.filter(user_id=user.id).values('node_id'))
+                return qs.filter(is_deleted=False)
             qs |= self.extra(where=["""
                 "osf_abstractnode".id in (
                     WITH RECURSIVE implicit_read AS (
@@ -201,10 +227,16 @@ class AbstractNodeManager(TypedModelManager):
     def get_children(self, root, active=False, include_root=False):
         return self.get_queryset().get_children(root, active=active, include_root=include_root)
 
+    def get_descendants(self, node, max_depth=None):
+        return self.get_queryset().get_descendants(node, max_depth=max_depth)
+
+    def get_ancestors(self, node):
+        return self.get_queryset().get_ancestors(node)
+
     def can_view(self, user=None, private_link=None):
         return self.get_queryset().can_view(user=user, private_link=private_link)
 
-    def get_nodes_for_user(self, user, permission=READ_NODE, base_queryset=None, include_public=False):
+    def get_nodes_for_user(self, user, permission=READ_NODE, base_queryset=None, include_public=False, include_implicit=False):
         """
         Return all AbstractNodes that the user has permissions to - either through contributorship or group membership.
         - similar to guardian.get_objects_for_user(self, READ_NODE, AbstractNode, with_superuser=False).  If include_public is True,
@@ -214,6 +246,8 @@ class AbstractNodeManager(TypedModelManager):
         :param permission: Permission string to check, official perm, i.e. 'read_node', 'write_node', 'admin_node'
         :param base_queryset: If filtering on a smaller queryset is desired, pass in a starting queryset
         :param include_public: If True, will include public nodes in query that user may not have explicit perms to
+        :param include_implicit: If True and checking read permission, will include components the user can read because
+            they are an admin on a parent project. Requires ENABLE_IMPLICIT_READ_INDEX.
         :returns node queryset that the user has perms to
         """
         OSFUserGroup = apps.get_model('osf', 'osfuser_groups')
@@ -231,6 +265,8 @@ class AbstractNodeManager(TypedModelManager):
                                                                permission_id=permission_object_id).values_list(
             'content_object_id', flat=True)
         query = Q(id__in=node_groups)
+        if include_implicit and permission == READ_NODE and settings.ENABLE_IMPLICIT_READ_INDEX:
+            query |= Q(id__in=ImplicitNodeRead.objects.filter(user_id=user.id if user else None).values('node_id'))
         if include_public:
             query |= Q(is_public=True)
         return nodes.filter(query)
@@ -1328,6 +1364,8 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
         return self.private_links.filter(is_deleted=True).values_list('key', flat=True)
 
     def get_root(self):
+        if settings.ENABLE_NODE_CLOSURE:
+            return AbstractNode.objects.get_ancestors(self).last() or self
         sql = """
             WITH RECURSIVE ascendants AS (
               SELECT
@@ -1558,8 +1596,10 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
     def get_primary(self, node):
         return NodeRelation.objects.filter(parent=self, child=node, is_node_link=False).exists()
 
-    # TODO optimize me
     def get_descendants_recursive(self, primary_only=False):
+        if settings.ENABLE_NODE_CLOSURE:
+            yield from self._get_descendants_from_closure(primary_only=primary_only)
+            return
         query = self.nodes_primary if primary_only else self._nodes
         for node in query.all():
             yield node
@@ -1570,6 +1610,31 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
             else:
                 yield from node.get_descendants_recursive(primary_only=primary_only)
 
+    def _get_descendants_from_closure(self, primary_only=False):
+        """Same traversal as get_descendants_recursive, but loads the whole subtree's
+        relations and nodes up front instead of querying once per node.
+        """
+        subtree_ids = [self.id, *NodeClosure.objects.filter(ancestor=self).values_list('descendant_id', flat=True)]
+        relations = NodeRelation.objects.filter(parent_id__in=subtree_ids).order_by('parent_id', '_order')
+        if primary_only:
+            relations = relations.filter(is_node_link=False)
+
+        children = defaultdict(list)
+        for parent_id, child_id, is_node_link in relations.values_list('parent_id', 'child_id', 'is_node_link'):
+            children[parent_id].append((child_id, is_node_link))
+        nodes = AbstractNode.objects.in_bulk([child_id for rels in children.values() for child_id, _ in rels])
+
+        def walk(parent_id):
+            for child_id, is_node_link in children[parent_id]:
+                node = nodes.get(child_id)
+                if node is None:
+                    continue
+                yield node
+                if not is_node_link:
+                    yield from walk(child_id)
+
+        yield from walk(self.id)
+
     @property
     def nodes_primary(self):
         """For v1 compat."""
@@ -1988,6 +2053,9 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
         ret = super().save(*args, **kwargs)
         if saved_fields:
             self.on_update(first_save, saved_fields)
+            # Logging a file action only bumps last_logged; anything else may change file access
+            if not first_save and set(saved_fields) - {'last_logged'}:
+                forget_waterbutler_auth(self)
 
         if 'node_license' in saved_fields:
             children = list(self.descendants.filter(node_license=None, is_public=True, is_deleted=False))
@@ -2444,6 +2512,10 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
 
     @property
     def storage_usage(self):
+        storage_usage_total = get_storage_usage_from_ledger(self)
+        if storage_usage_total is not None:
+            return storage_usage_total
+
         key = cache_settings.STORAGE_USAGE_KEY.format(target_id=self._id)
 
         storage_usage_total = storage_usage_cache.get(key)
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import connection, models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from .base import BaseModel, ObjectIDMixin
 
@@ -25,3 +27,95 @@ class NodeRelation(ObjectIDMixin, BaseModel):
         index_together = (
             ('is_node_link', 'child', 'parent'),
         )
+
+
+# Every (ancestor, descendant) pair that can be reached through the subtree being attached or
+# detached: the parent and its ancestors crossed with the child and its descendants.
+CLOSURE_PAIRS_SQL = """
+    SELECT A.ancestor_id, D.descendant_id, MIN(A.depth + D.depth + 1) AS depth
+    FROM (
+        SELECT ancestor_id, depth FROM osf_nodeclosure WHERE descendant_id = %(parent_id)s
+        UNION ALL SELECT %(parent_id)s, 0
+    ) AS A
+    CROSS JOIN (
+        SELECT descendant_id, depth FROM osf_nodeclosure WHERE ancestor_id = %(child_id)s
+        UNION ALL SELECT %(child_id)s, 0
+    ) AS D
+    WHERE A.ancestor_id <> D.descendant_id
+    GROUP BY A.ancestor_id, D.descendant_id
+"""
+
+
+class NodeClosureQuerySet(models.QuerySet):
+
+    def attach(self, parent_id, child_id):
+        """Record that ``child_id`` (and its subtree) now sits under ``parent_id``."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                INSERT INTO osf_nodeclosure (ancestor_id, descendant_id, depth)
+                {CLOSURE_PAIRS_SQL}
+                ON CONFLICT (ancestor_id, descendant_id) DO UPDATE
+                SET depth = LEAST(osf_nodeclosure.depth, EXCLUDED.depth)
+            """, {'parent_id': parent_id, 'child_id': child_id})
+
+    def detach(self, parent_id, child_id):
+        """Remove the paths from ``parent_id`` and its ancestors into ``child_id``'s subtree."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                DELETE FROM osf_nodeclosure AS C
+                USING ({CLOSURE_PAIRS_SQL}) AS P
+                WHERE C.ancestor_id = P.ancestor_id AND C.descendant_id = P.descendant_id
+            """, {'parent_id': parent_id, 'child_id': child_id})
+
+    def rebuild(self):
+        """Recompute the whole table from osf_noderelation."""
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM osf_nodeclosure')
+            cursor.execute("""
+                WITH RECURSIVE closure AS (
+                    SELECT parent_id AS ancestor_id, child_id AS descendant_id, 1 AS depth, ARRAY[parent_id] AS path
+                    FROM osf_noderelation
+                    WHERE is_node_link IS FALSE
+                UNION ALL
+                    SELECT C.ancestor_id, R.child_id, C.depth + 1, C.path || R.parent_id
+                    FROM closure AS C
+                    JOIN osf_noderelation AS R ON R.parent_id = C.descendant_id
+                    WHERE R.is_node_link IS FALSE AND NOT R.child_id = ANY(C.path)
+                )
+                INSERT INTO osf_nodeclosure (ancestor_id, descendant_id, depth)
+                SELECT ancestor_id, descendant_id, MIN(depth)
+                FROM closure
+                WHERE ancestor_id <> descendant_id
+                GROUP BY ancestor_id, descendant_id
+            """)
+            return cursor.rowcount
+
+
+class NodeClosure(models.Model):
+    """One row per (ancestor, descendant) pair joined by a chain of component (non-link)
+    NodeRelations, kept up to date by the NodeRelation signals below. A node is not its
+    own ancestor.
+    """
+    ancestor = models.ForeignKey('AbstractNode', related_name='+', on_delete=models.CASCADE)
+    descendant = models.ForeignKey('AbstractNode', related_name='+', on_delete=models.CASCADE)
+    depth = models.PositiveIntegerField()
+
+    objects = NodeClosureQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+        indexes = [
+            models.Index(fields=['descendant', 'depth'], name='osf_nodeclosure_desc_depth'),
+        ]
+
+
+@receiver(post_save, sender=NodeRelation)
+def update_node_closure_on_save(sender, instance, **kwargs):
+    if not instance.is_node_link:
+        NodeClosure.objects.attach(instance.parent_id, instance.child_id)
+
+
+@receiver(post_delete, sender=NodeRelation)
+def update_node_closure_on_delete(sender, instance, **kwargs):
+    if not instance.is_node_link:
+        NodeClosure.objects.detach(instance.parent_id, instance.child_id)
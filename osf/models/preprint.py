@@ -57,6 +57,7 @@ from osf.exceptions import (
     ValidationValueError,
 )
 from django.contrib.postgres.fields import ArrayField
+from api.caching.utils import forget_waterbutler_auth
 from api.share.utils import update_share
 from api.providers.workflows import Workflows
 
@@ -1037,6 +1038,9 @@ class Preprint(DirtyFieldsMixin, VersionedGuidMixin, IdentifierMixin, Reviewable
 
         ret = super().save(*args, **kwargs)
 
+        if not first_save and set(saved_fields) - {'last_logged'}:
+            forget_waterbutler_auth(self)
+
         if saved_fields and (not settings.SPAM_CHECK_PUBLIC_ONLY or self.verified_publishable):
             request, user_id = get_request_and_user_id()
             request_headers = string_type_request_headers(request)
@@ -0,0 +1,125 @@
+import os
+import zipfile
+from unittest import mock
+
+import pytest
+
+from api.base.settings.defaults import GBs
+from api_tests.utils import create_test_file
+from osf.management.commands import export_user_account
+from osf.models import FileVersion
+from osf_tests.factories import AuthUserFactory, PreprintFactory, ProjectFactory
+
+
+@pytest.mark.django_db
+class TestExportUserAccount:
+
+    @pytest.fixture(autouse=True)
+    def errors(self):
+        with mock.patch.object(export_user_account, 'ERRORS', []) as errors:
+            yield errors
+
+    @pytest.fixture(autouse=True)
+    def mock_input(self):
+        with mock.patch('builtins.input', return_value='y'):
+            yield
+
+    @pytest.fixture()
+    def user(self):
+        return AuthUserFactory()
+
+    @pytest.fixture()
+    def project(self, user):
+        project = ProjectFactory(creator=user)
+        create_test_file(project, user, filename='carp.txt')
+        return project
+
+    @pytest.fixture()
+    def response(self):
+        response = mock.Mock(status_code=200)
+        response.iter_content.return_value = [b'archive ', b'bytes']
+        return response
+
+    @pytest.fixture()
+    def mock_get(self, response):
+        with mock.patch('osf.management.commands.export_user_account.requests.get') as mock_get:
+            mock_get.return_value.__enter__.return_value = response
+            yield mock_get
+
+    @pytest.fixture()
+    def work_dir(self, tmp_path):
+        return str(tmp_path / 'work')
+
+    def archive_path(self, work_dir, project):
+        return os.path.join(work_dir, 'projects', project._id, 'files', export_user_account.FILES_ARCHIVE_NAME)
+
+    def export(self, user, tmp_path, work_dir):
+        export_user_account.export_account(user._id, str(tmp_path), workers=2, work_dir=work_dir)
+        outputs = [name for name in os.listdir(tmp_path) if name.endswith('.zip')]
+        assert len(outputs) == 1
+        with zipfile.ZipFile(os.path.join(tmp_path, outputs[0])) as archive:
+            return archive.namelist()
+
+    def test_export(self, user, project, mock_get, tmp_path, work_dir, errors):
+        names = self.export(user, tmp_path, work_dir)
+
+        assert mock_get.call_count == 1
+        assert f'projects/{project._id}/metadata.json' in names
+        assert f'projects/{project._id}/files/{export_user_account.FILES_ARCHIVE_NAME}' in names
+        assert errors == []
+        assert not os.path.exists(work_dir)
+
+    def test_resumed_export_skips_finished_archives(self, user, project, mock_get, tmp_path, work_dir):
+        archive_path = self.archive_path(work_dir, project)
+        os.makedirs(os.path.dirname(archive_path))
+        with open(archive_path, 'wb') as f:
+            f.write(b'downloaded before')
+
+        names = self.export(user, tmp_path, work_dir)
+
+        assert not mock_get.called
+        assert f'projects/{project._id}/files/{export_user_account.FILES_ARCHIVE_NAME}' in names
+
+    def test_failed_download_is_recorded(self, user, project, mock_get, response, tmp_path, work_dir, errors):
+        response.status_code = 502
+        response.text = 'Bad Gateway'
+
+        names = self.export(user, tmp_path, work_dir)
+
+        assert len(errors) == 1
+        assert '502' in errors[0]
+        assert f'projects/{project._id}/files/{export_user_account.FILES_ARCHIVE_NAME}' not in names
+        assert os.path.exists(work_dir)
+
+    def test_disk_error_is_recorded(self, user, project, mock_get, response, tmp_path, work_dir, errors):
+        response.iter_content.side_effect = OSError('No space left on device')
+
+        names = self.export(user, tmp_path, work_dir)
+
+        assert len(errors) == 1
+        assert 'No space left on device' in errors[0]
+        assert not any(name.endswith('.partial') for name in names)
+        assert os.path.exists(work_dir)
+
+    def test_partial_files_are_left_out(self, tmp_path):
+        base_dir = tmp_path / 'work'
+        files_dir = base_dir / 'projects' / 'abcde' / 'files'
+        files_dir.mkdir(parents=True)
+        (files_dir / export_user_account.FILES_ARCHIVE_NAME).write_bytes(b'done')
+        (files_dir / f'{export_user_account.FILES_ARCHIVE_NAME}.partial').write_bytes(b'half')
+
+        export_user_account.write_archive(str(base_dir), str(tmp_path / 'export'))
+
+        with zipfile.ZipFile(tmp_path / 'export.zip') as archive:
+            assert archive.namelist() == [f'projects/abcde/files/{export_user_account.FILES_ARCHIVE_NAME}']
+
+    def test_get_usage(self, user, project):
+        create_test_file(project, user, filename='tuna.txt', size=42)
+        PreprintFactory(creator=user)
+        someone_else = AuthUserFactory()
+        elsewhere = create_test_file(ProjectFactory(creator=someone_else), someone_else, filename='cod.txt')
+        # what get_usage used to add up, one version at a time
+        versions = FileVersion.objects.exclude(basefilenode=elsewhere)
+
+        assert export_user_account.get_usage(user) == sum([v.size or 0 for v in versions]) / GBs
+        assert export_user_account.get_usage(user) >= (1337 + 42) / GBs
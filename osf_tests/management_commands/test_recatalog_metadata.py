@@ -23,6 +23,11 @@ class TestRecatalogMetadata:
         with mock.patch('osf.management.commands.recatalog_metadata.task__update_share') as _shmock:
             yield _shmock
 
+    @pytest.fixture
+    def mock_update_share_chunk_task(self):
+        with mock.patch('osf.management.commands.recatalog_metadata.task__update_share_chunk') as _shmock:
+            yield _shmock
+
     @pytest.fixture
     def preprint_provider(self):
         return PreprintProviderFactory()
@@ -207,6 +212,32 @@ class TestRecatalogMetadata:
         _expected_osfids = set(_iter_osfids(_all_items))
         assert _expected_osfids == _actual_osfids()
 
+    def test_recatalog_metadata_bulk(
+        self,
+        mock_update_share_task,
+        mock_update_share_chunk_task,
+        registrations,
+    ):
+        call_command(
+            'recatalog_metadata',
+            '--registrations',
+            '--all-providers',
+            '--bulk',
+            f'--start-id={registrations[1].id}',
+            '--chunk-size=3',
+            '--chunk-count=2',
+        )
+        mock_update_share_task.apply_async.assert_not_called()
+        assert [
+            _call.kwargs['kwargs']['guids']
+            for _call in mock_update_share_chunk_task.apply_async.mock_calls
+        ] == [
+            list(_iter_osfids(registrations[1:4])),
+            list(_iter_osfids(registrations[4:7])),
+        ]
+        for _call in mock_update_share_chunk_task.apply_async.mock_calls:
+            assert _call.kwargs['queue'] == 'low'
+
 
 ###
 # local utils
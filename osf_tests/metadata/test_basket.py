@@ -81,3 +81,70 @@ def test_goodbasket():
     assert len(basket.gathered_metadata) == 0
     assert len(basket._gathertasks_done) == 0
     assert len(basket._known_focus_dict) == 1
+
+
+def test_shared_gathertask_memo():
+    BLARG = rdflib.Namespace('https://blarg.example/blarg/')
+    focus = gather.Focus(BLARG.memoitem, BLARG.Type)
+    mock_gatherer = mock.Mock(return_value=(
+        (BLARG.memoitem, BLARG.memo, BLARG.memoed),
+    ))
+    gather.er(BLARG.memo)(mock_gatherer)
+    memo = {}
+    basket_a = gather.Basket(focus, gathertask_memo=memo)
+    basket_b = gather.Basket(focus, gathertask_memo=memo)
+    assert set(basket_a[BLARG.memo]) == {BLARG.memoed}
+    mock_gatherer.assert_called_once()
+    # the second basket gets the same metadata without gathering again
+    assert set(basket_b[BLARG.memo]) == {BLARG.memoed}
+    mock_gatherer.assert_called_once()
+    assert set(basket_a.gathered_metadata) == set(basket_b.gathered_metadata)
+    # baskets without the memo gather for themselves
+    assert set(gather.Basket(focus)[BLARG.memo]) == {BLARG.memoed}
+    assert mock_gatherer.call_count == 2
+
+
+def test_concurrent_gather():
+    BLARG = rdflib.Namespace('https://blarg.example/blarg/')
+    focus = gather.Focus(BLARG.threaditem, BLARG.ThreadType)
+    mock_gatherers = {
+        BLARG.fork: mock.Mock(return_value=(
+            (BLARG.threaditem, BLARG.fork, BLARG.forked),
+        )),
+        BLARG.spork: mock.Mock(return_value=(
+            (BLARG.threaditem, BLARG.spork, BLARG.sporked),
+            (BLARG.sporked, BLARG.lork, BLARG.sporklorked),
+        )),
+        BLARG.cork: mock.Mock(return_value=(
+            (BLARG.threaditem, BLARG.cork, BLARG.corked),
+        )),
+    }
+    for predicate, mock_gatherer in mock_gatherers.items():
+        gather.er(predicate)(mock_gatherer)
+    after_gathertask = mock.Mock()
+    serial_basket = gather.Basket(focus)
+    serial_basket.pls_gather(mock_gatherers.keys())
+    concurrent_basket = gather.Basket(focus, max_workers=2, after_threaded_gathertask=after_gathertask)
+    concurrent_basket.pls_gather(mock_gatherers.keys())
+    # same metadata, each gatherer called once per basket
+    assert set(concurrent_basket.gathered_metadata) == set(serial_basket.gathered_metadata)
+    for mock_gatherer in mock_gatherers.values():
+        assert mock_gatherer.call_count == 2
+    assert after_gathertask.call_count == 3
+    # no repeat gathertasks:
+    concurrent_basket.pls_gather(mock_gatherers.keys())
+    for mock_gatherer in mock_gatherers.values():
+        assert mock_gatherer.call_count == 2
+    assert after_gathertask.call_count == 3
+
+
+def test_concurrent_gather_error():
+    BLARG = rdflib.Namespace('https://blarg.example/blarg/')
+    focus = gather.Focus(BLARG.erritem, BLARG.ErrType)
+    gather.er(BLARG.berk)(mock.Mock(side_effect=ValueError('berk')))
+    gather.er(BLARG.blerk)(mock.Mock(return_value=()))
+    after_gathertask = mock.Mock()
+    basket = gather.Basket(focus, max_workers=2, after_threaded_gathertask=after_gathertask)
+    with pytest.raises(ValueError):
+        basket.pls_gather({BLARG.berk: None, BLARG.blerk: None})
+    assert after_gathertask.call_count == 2
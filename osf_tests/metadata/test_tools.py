@@ -0,0 +1,57 @@
+from unittest import mock
+
+import pytest
+
+from osf.metadata import osf_gathering
+from osf.metadata.serializers import TurtleMetadataSerializer
+from osf.metadata.tools import pls_gather_metadata_file
+from osf_tests import factories
+from website import settings as website_settings
+
+
+@pytest.mark.django_db
+class TestCachedMetadataRecords:
+
+    @pytest.fixture(autouse=True)
+    def metadata_cache(self):
+        osf_gathering._gathertask_memos.clear()
+        with mock.patch.object(website_settings, 'METADATA_CACHE_TIMEOUT', 60):
+            yield
+        osf_gathering._gathertask_memos.clear()
+
+    @pytest.fixture()
+    def project(self):
+        return factories.ProjectFactory(is_public=True, title='cached title')
+
+    def test_unchanged_item_is_serialized_once(self, project):
+        _serialize = TurtleMetadataSerializer.serialize
+        with mock.patch.object(TurtleMetadataSerializer, 'serialize', autospec=True, side_effect=_serialize) as mock_serialize:
+            first = pls_gather_metadata_file(project, 'turtle')
+            second = pls_gather_metadata_file(project, 'turtle')
+        assert mock_serialize.call_count == 1
+        assert first == second
+
+    def test_saved_item_is_serialized_again(self, project):
+        first = pls_gather_metadata_file(project, 'turtle')
+        assert 'cached title' in first.serialized_metadata
+        project.title = 'fresh title'
+        project.save()
+        second = pls_gather_metadata_file(project, 'turtle')
+        assert 'fresh title' in second.serialized_metadata
+
+    def test_cache_disabled(self, project):
+        _serialize = TurtleMetadataSerializer.serialize
+        with mock.patch.object(website_settings, 'METADATA_CACHE_TIMEOUT', 0):
+            with mock.patch.object(TurtleMetadataSerializer, 'serialize', autospec=True, side_effect=_serialize) as mock_serialize:
+                pls_gather_metadata_file(project, 'turtle')
+                pls_gather_metadata_file(project, 'turtle')
+        assert mock_serialize.call_count == 2
+
+    def test_uncached_gathers_afresh(self, project):
+        _serialize = TurtleMetadataSerializer.serialize
+        with mock.patch.object(TurtleMetadataSerializer, 'serialize', autospec=True, side_effect=_serialize) as mock_serialize:
+            pls_gather_metadata_file(project, 'turtle')
+            pls_gather_metadata_file(project, 'turtle', cached=False)
+        assert mock_serialize.call_count == 2
+        _basket = osf_gathering.pls_get_magic_metadata_basket(project, reuse_gathered=False)
+        assert _basket._gathertask_memo is None
@@ -142,6 +142,35 @@ class TestInstiUsersReporter(TestCase):
             _setup = _setup_by_userid[_actual_report.user_id]
             self._assert_report_matches_setup(_actual_report, _setup)
 
+    def test_users_batched_per_task(self):
+        _setups = [
+            self._user_setup_with_nothing,
+            self._user_setup_with_ones,
+            self._user_setup_with_stuff,
+        ]
+        for _setup in _setups:
+            _setup.affiliate_user()
+        _reporter = InstitutionalUsersReporter(self._yearmonth)
+        with unittest.mock.patch('osf.metrics.reporters.institutional_users.USERS_PER_REPORT_TASK', 2):
+            _kwargs_list = list(_reporter.iter_report_kwargs())
+            self.assertEqual([len(_kwargs['user_pks']) for _kwargs in _kwargs_list], [2, 1])
+            _continued = list(_reporter.iter_report_kwargs(continue_after=_kwargs_list[0]))
+            self.assertEqual(_continued, _kwargs_list[1:])
+        _reports = list_monthly_reports(_reporter)
+        self.assertEqual(
+            sorted(_report.user_id for _report in _reports),
+            sorted(_setup.user._id for _setup in _setups),
+        )
+
+    def test_report_for_single_user_kwargs(self):
+        # tasks enqueued before users were batched
+        self._user_setup_with_ones.affiliate_user()
+        _reports = list(InstitutionalUsersReporter(self._yearmonth).report(
+            institution_pk=self._institution.pk,
+            user_pk=self._user_setup_with_ones.user.pk,
+        ))
+        self.assertEqual(len(_reports), 1)
+        self._assert_report_matches_setup(_reports[0], self._user_setup_with_ones)
 
 @dataclasses.dataclass
 class _InstiUserSetup:
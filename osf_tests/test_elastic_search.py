@@ -10,6 +10,7 @@ from framework.auth.core import Auth
 from website import settings
 import website.search.search as search
 from website.search import elastic_search
+from website.search.exceptions import BulkUpdateError
 from website.search.util import build_query
 from website.search_migration.migrate import migrate
 from osf.models import (
@@ -1269,6 +1270,70 @@ class TestSearchExceptions(OsfTestCase):
         self.project.save()
 
 
+class TestIndexDebounce:
+
+    @pytest.fixture(autouse=True)
+    def mock_client(self):
+        elastic_search.forget_index(TEST_INDEX)
+        with mock.patch('website.search.elastic_search.client') as mock_client:
+            yield mock_client.return_value
+        elastic_search.forget_index(TEST_INDEX)
+
+    def test_identical_document_is_sent_once(self, mock_client):
+        elastic_search.index_document(TEST_INDEX, 'project', 'abcde', {'title': 'Carp'})
+        elastic_search.index_document(TEST_INDEX, 'project', 'abcde', {'title': 'Carp'})
+        assert mock_client.index.call_count == 1
+
+    def test_changed_document_is_sent(self, mock_client):
+        elastic_search.index_document(TEST_INDEX, 'project', 'abcde', {'title': 'Carp'})
+        elastic_search.index_document(TEST_INDEX, 'project', 'abcde', {'title': 'Tuna'})
+        assert mock_client.index.call_count == 2
+
+    def test_failed_document_is_resent(self, mock_client):
+        mock_client.index.side_effect = [Exception('unavailable'), None]
+        with pytest.raises(Exception):
+            elastic_search.index_document(TEST_INDEX, 'project', 'abcde', {'title': 'Carp'})
+        elastic_search.index_document(TEST_INDEX, 'project', 'abcde', {'title': 'Carp'})
+        assert mock_client.index.call_count == 2
+
+    @mock.patch('website.search.elastic_search.helpers.streaming_bulk')
+    def test_failed_bulk_document_is_resent(self, mock_streaming_bulk, mock_client):
+        def streaming_bulk(client, actions, **kwargs):
+            for action in actions:
+                yield False, {'index': {'_index': action['_index'], '_type': action['_type'], '_id': action['_id'], 'status': 500}}
+        mock_streaming_bulk.side_effect = streaming_bulk
+        action = {'_op_type': 'index', '_index': TEST_INDEX, '_type': 'file', '_id': 'abcde', '_source': {'name': 'carp.txt'}}
+        success, errors = elastic_search.stream_bulk(iter([action]), raise_on_error=False)
+        assert (success, len(errors)) == (0, 1)
+        assert not elastic_search.is_recently_indexed(TEST_INDEX, 'file', 'abcde', {'name': 'carp.txt'})
+
+    @mock.patch('website.search.elastic_search.serialize_file', return_value={'name': 'carp.txt'})
+    @mock.patch('api.share.utils.update_share')
+    @mock.patch('website.search.elastic_search.stream_bulk')
+    def test_bulk_file_errors_are_raised(self, mock_stream_bulk, mock_update_share, mock_serialize_file, mock_client):
+        mock_stream_bulk.return_value = (1, [{'index': {'_id': 'abcde', 'status': 500}}])
+        with pytest.raises(BulkUpdateError):
+            elastic_search.bulk_update_files([mock.Mock(_id='abcde')], index=TEST_INDEX)
+
+    @mock.patch('website.settings.ELASTIC_DEBOUNCE_SECONDS', 0)
+    def test_debounce_disabled(self, mock_client):
+        elastic_search.index_document(TEST_INDEX, 'project', 'abcde', {'title': 'Carp'})
+        elastic_search.index_document(TEST_INDEX, 'project', 'abcde', {'title': 'Carp'})
+        assert mock_client.index.call_count == 2
+
+
+class TestSerializeInChunks:
+
+    def test_serializes_every_object_in_order(self):
+        serialized = list(elastic_search.serialize_in_chunks(str, range(7), chunk_size=3, workers=1))
+        assert serialized == [(i, str(i)) for i in range(7)]
+
+    @mock.patch('website.search.elastic_search.connection')
+    def test_serializes_with_workers(self, mock_connection):
+        serialized = list(elastic_search.serialize_in_chunks(str, range(7), chunk_size=2, workers=3))
+        assert serialized == [(i, str(i)) for i in range(7)]
+
+
 @pytest.mark.enable_search
 @pytest.mark.enable_enqueue_task
 class TestSearchMigration(OsfTestCase):
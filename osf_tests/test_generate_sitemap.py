@@ -15,22 +15,30 @@ from tests.utils import capture_notifications
 from website import settings
 
 
+NAMESPACE = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+def read_sitemap_urls(sitemap_dir):
+    # Follow the index to every shard file
+    # Note: namespace was defined in the XML file, therefore necessary to include in tag
+    index = xml.etree.ElementTree.parse(os.path.join(sitemap_dir, 'sitemap_index.xml'))
+    urls = []
+    for loc in index.iter(NAMESPACE + 'loc'):
+        with open(os.path.join(sitemap_dir, loc.text.rsplit('/', 1)[-1])) as f:
+            tree = xml.etree.ElementTree.parse(f)
+        urls.extend(element.text for element in tree.iter(NAMESPACE + 'loc'))
+    return urls
+
+
 def get_all_sitemap_urls():
     # Create temporary directory for the sitemaps to be generated
 
     generate_sitemap.main()
 
-    # Parse the generated XML sitemap file
-    with open(os.path.join(settings.STATIC_FOLDER, 'sitemaps/sitemap_0.xml')) as f:
-        tree = xml.etree.ElementTree.parse(f)
+    urls = read_sitemap_urls(os.path.join(settings.STATIC_FOLDER, 'sitemaps'))
 
     shutil.rmtree(settings.STATIC_FOLDER)
 
-    # Get all the urls in the sitemap
-    # Note: namespace was defined in the XML file, therefore necessary to include in tag
-    namespace = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
-    urls = [element.text for element in tree.iter(namespace + 'loc')]
-
     return urls
 
 
@@ -246,3 +254,72 @@ class TestGenerateSitemap:
 
         # Verify the spammed registration's overview page does not make it into the XML
         assert urljoin(settings.DOMAIN, registration_spammed.url + 'overview') not in urls
+
+    def test_split_sitemap_files_include_all_links(self, all_included_links, create_tmp_directory):
+        with mock.patch('website.settings.STATIC_FOLDER', create_tmp_directory), \
+                mock.patch('website.settings.SITEMAP_SHARD_SIZE', 1000), \
+                mock.patch('website.settings.SITEMAP_URL_MAX', 3):
+            urls = get_all_sitemap_urls()
+
+        assert len(all_included_links) == len(urls)
+        assert set(all_included_links) == set(urls)
+
+    def test_unchanged_shards_are_not_rewritten(self, project_registration_public, create_tmp_directory):
+        with mock.patch('website.settings.STATIC_FOLDER', create_tmp_directory):
+            generate_sitemap.main()
+
+            with mock.patch('scripts.generate_sitemap.write_shard') as mock_write_shard:
+                generate_sitemap.main()
+            assert not mock_write_shard.called
+
+            project_registration_public.is_public = False
+            project_registration_public.save()
+            with mock.patch('scripts.generate_sitemap.write_shard', wraps=generate_sitemap.write_shard) as mock_write_shard:
+                generate_sitemap.main()
+            assert [call[0][1:3] for call in mock_write_shard.call_args_list] == [('nodes', (project_registration_public.id - 1) // settings.SITEMAP_SHARD_SIZE)]
+
+            urls = read_sitemap_urls(os.path.join(create_tmp_directory, 'sitemaps'))
+        assert urljoin(settings.DOMAIN, project_registration_public.url + 'overview') not in urls
+
+    @pytest.fixture()
+    def mock_s3(self):
+        with mock.patch.multiple(
+            'website.settings',
+            SITEMAP_TO_S3=True,
+            SITEMAP_AWS_BUCKET='sitemap-bucket',
+            AWS_ACCESS_KEY_ID='access-key',
+            AWS_SECRET_ACCESS_KEY='secret-key',
+        ), mock.patch('scripts.generate_sitemap.boto3') as mock_boto3:
+            mock_s3 = mock_boto3.resource.return_value
+            mock_s3.Object.side_effect = Exception('no manifest yet')
+            yield mock_s3
+
+    def test_failed_s3_upload_is_retried(self, mock_s3, project_registration_public):
+        def put_object(Bucket, Key, Body):
+            if Key.startswith('sitemaps/sitemap_nodes_'):
+                raise Exception('upload failed')
+        mock_s3.meta.client.put_object.side_effect = put_object
+
+        sitemap = generate_sitemap.Sitemap()
+        sitemap.generate()
+        sitemap.cleanup()
+        assert 'static_0' in sitemap.manifest
+        assert not any(key.startswith('nodes_') for key in sitemap.manifest)
+
+    def test_stale_files_are_deleted_from_s3(self, mock_s3, project_registration_public):
+        sitemap = generate_sitemap.Sitemap()
+        sitemap.manifest['nodes_99999'] = {
+            'digest': 'gone',
+            'files': ['sitemap_nodes_99999_0.xml'],
+            'url_count': 1,
+            'lastmod': '2020-01-01',
+        }
+        sitemap.generate()
+        sitemap.cleanup()
+        mock_s3.meta.client.delete_objects.assert_called_once_with(
+            Bucket='sitemap-bucket',
+            Delete={'Objects': [
+                {'Key': 'sitemaps/sitemap_nodes_99999_0.xml'},
+                {'Key': 'sitemaps/sitemap_nodes_99999_0.xml.gz'},
+            ]},
+        )
@@ -1,11 +1,13 @@
 from unittest import mock
 
 from django.core.exceptions import MultipleObjectsReturned
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 import pytest
 
 from framework.auth import Auth
 from osf.models import Guid, GuidVersionsThrough, NodeLicenseRecord, OSFUser, Preprint
-from osf.models.base import VersionedGuidMixin
+from osf.models.base import VersionedGuidMixin, guid_resolver
 from osf_tests.factories import (
     AuthUserFactory,
     NodeFactory,
@@ -136,6 +138,64 @@ class TestReferent:
             pytest.fail(f'Multiple objects returned for {Factory._meta.model} with multiple guids. {ex}')
 
 
+@pytest.mark.django_db
+@mock.patch('website.settings.GUID_RESOLVER_MAX_ENTRIES', 100)
+class TestGuidResolver:
+
+    @pytest.fixture(autouse=True)
+    def clear_resolver(self):
+        guid_resolver.clear()
+
+    def test_load_is_reused(self):
+        node = NodeFactory()
+        Guid.load(node._id)
+        with CaptureQueriesContext(connection) as queries:
+            assert Guid.load(node._id).referent == node
+        assert len(queries) == 1
+
+    def test_load_missing(self):
+        assert Guid.load('nope1') is None
+
+    def test_load_many(self):
+        nodes = [NodeFactory() for _ in range(3)]
+        user = UserFactory()
+        guid_strs = [node._id for node in nodes] + [user._id, 'nope1']
+
+        with CaptureQueriesContext(connection) as queries:
+            guids = Guid.load_many(guid_strs)
+        # guid rows, then one query per referent type
+        assert len([query for query in queries if 'osf_guid' in query['sql'] and 'IN' in query['sql']]) == 1
+
+        with CaptureQueriesContext(connection) as queries:
+            referents = {guid_str: guid.referent for guid_str, guid in guids.items()}
+        assert not queries
+        assert referents == {**{node._id: node for node in nodes}, user._id: user}
+
+    def test_repointed_guid_is_forgotten(self):
+        node = NodeFactory()
+        other = NodeFactory()
+        guid = Guid.load(node._id)
+        guid.referent = other
+        guid.save()
+
+        assert Guid.load_referent(guid._id) == (other, None)
+
+    def test_deleted_guid_is_forgotten(self):
+        node = NodeFactory()
+        guid_str = node._id
+        Guid.load(guid_str).delete()
+
+        assert Guid.load(guid_str) is None
+
+    def test_row_without_referent_is_reloaded(self):
+        node = NodeFactory()
+        guid = Guid.load(node._id)
+        # A row another process has since repointed, to a referent that has gone
+        guid_resolver._remember([(guid.id, guid._id, guid.content_type_id, 0, guid.created)])
+
+        assert Guid.load_referent(node._id) == (node, None)
+
+
 @pytest.mark.enable_bookmark_creation
 class TestResolveGuid(OsfTestCase):
 
@@ -26,11 +26,13 @@ from osf.utils.permissions import READ, WRITE, ADMIN, DEFAULT_CONTRIBUTOR_PERMIS
 from osf.models import (
     AbstractNode,
     Email,
+    ImplicitNodeRead,
     Node,
     Tag,
     NodeLog,
     Contributor,
     RegistrationSchema,
+    NodeClosure,
     NodeRelation,
     Registration,
     DraftRegistration,
@@ -586,6 +588,154 @@ class TestRoot:
                 assert p.parent_node._id in parent_list
 
 
+@mock.patch('website.settings.ENABLE_NODE_CLOSURE', True)
+class TestNodeClosure:
+
+    @pytest.fixture()
+    def root(self, user):
+        return ProjectFactory(creator=user)
+
+    @pytest.fixture()
+    def child(self, root):
+        return NodeFactory(parent=root)
+
+    @pytest.fixture()
+    def grandchild(self, child):
+        return NodeFactory(parent=child)
+
+    def closure(self):
+        return set(NodeClosure.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+
+    def test_closure_is_maintained_on_create(self, root, child, grandchild):
+        assert self.closure() == {
+            (root.id, child.id, 1),
+            (root.id, grandchild.id, 2),
+            (child.id, grandchild.id, 1),
+        }
+
+    def test_node_links_are_not_in_closure(self, root, child, grandchild):
+        linked = ProjectFactory()
+        grandchild.add_node_link(linked, auth=Auth(grandchild.creator))
+        assert not NodeClosure.objects.filter(descendant=linked).exists()
+
+    def test_closure_is_maintained_on_delete(self, root, child, grandchild):
+        NodeRelation.objects.get(parent=root, child=child).delete()
+        assert self.closure() == {(child.id, grandchild.id, 1)}
+
+    def test_rebuild_matches_maintained_closure(self, root, child, grandchild):
+        NodeFactory(parent=child)
+        maintained = self.closure()
+        NodeClosure.objects.rebuild()
+        assert self.closure() == maintained
+
+    def test_get_root(self, root, child, grandchild):
+        assert grandchild.get_root() == root
+        assert child.get_root() == root
+        assert root.get_root() == root
+
+    def test_get_ancestors(self, root, child, grandchild):
+        assert list(Node.objects.get_ancestors(grandchild)) == [child, root]
+
+    def test_get_descendants(self, root, child, grandchild):
+        assert set(Node.objects.get_descendants(root)) == {child, grandchild}
+        assert set(Node.objects.get_descendants(root, max_depth=1)) == {child}
+
+    def test_get_children_of_non_root(self, root, child, grandchild):
+        deleted = NodeFactory(parent=grandchild, is_deleted=True)
+        assert set(Node.objects.get_children(child)) == {grandchild, deleted}
+        assert set(Node.objects.get_children(child, active=True)) == {grandchild}
+        assert set(Node.objects.get_children(child, include_root=True)) == {child, grandchild, deleted}
+
+    def test_get_descendants_recursive(self, root, child, grandchild):
+        linked = ProjectFactory()
+        NodeFactory(parent=linked)
+        child.add_node_link(linked, auth=Auth(child.creator))
+
+        assert list(root.get_descendants_recursive()) == [child, grandchild, linked]
+        assert list(root.get_descendants_recursive(primary_only=True)) == [child, grandchild]
+
+
+class TestImplicitNodeRead:
+
+    @pytest.fixture(autouse=True)
+    def enable_index(self):
+        with mock.patch('website.settings.ENABLE_IMPLICIT_READ_INDEX', True):
+            yield
+
+    @pytest.fixture()
+    def admin(self):
+        return UserFactory()
+
+    @pytest.fixture()
+    def root(self, admin):
+        return ProjectFactory(creator=admin)
+
+    @pytest.fixture()
+    def component(self, root):
+        return NodeFactory(parent=root)
+
+    @pytest.fixture()
+    def subcomponent(self, component):
+        return NodeFactory(parent=component, creator=component.creator)
+
+    def indexed(self, user):
+        return set(ImplicitNodeRead.objects.filter(user=user).values_list('node_id', flat=True))
+
+    def test_admin_can_read_components(self, admin, root, component, subcomponent):
+        assert self.indexed(admin) == {component.id, subcomponent.id}
+
+    def test_adding_admin_indexes_components(self, user, root, component, subcomponent):
+        root.add_contributor(user, permissions=ADMIN, auth=Auth(root.creator), save=True)
+        assert self.indexed(user) == {component.id, subcomponent.id}
+
+    def test_removing_admin_clears_components(self, user, root, component):
+        root.add_contributor(user, permissions=ADMIN, auth=Auth(root.creator), save=True)
+        root.remove_contributor(user, auth=Auth(root.creator))
+        assert self.indexed(user) == set()
+
+    def test_non_admin_has_no_implicit_read(self, user, root, component):
+        root.add_contributor(user, permissions=WRITE, auth=Auth(root.creator), save=True)
+        assert self.indexed(user) == set()
+
+    def test_detached_component_is_unindexed(self, admin, root, component, subcomponent):
+        NodeRelation.objects.get(parent=root, child=component).delete()
+        assert self.indexed(admin) == set()
+
+    def test_moved_subtree_is_reindexed(self, admin, root, component, subcomponent):
+        other_admin = UserFactory()
+        other_root = ProjectFactory(creator=other_admin)
+        NodeRelation.objects.get(parent=root, child=component).delete()
+        NodeRelation.objects.create(parent=other_root, child=component)
+        assert self.indexed(admin) == set()
+        assert self.indexed(other_admin) == {component.id, subcomponent.id}
+
+    def test_subtree_is_reindexed_without_closure(self, admin, root, component, subcomponent):
+        NodeClosure.objects.all().delete()
+        grandchild = NodeFactory(parent=subcomponent, creator=subcomponent.creator)
+        assert self.indexed(admin) == {component.id, subcomponent.id, grandchild.id}
+
+    def test_index_untouched_while_disabled(self, admin, root, component, subcomponent):
+        with mock.patch('website.settings.ENABLE_IMPLICIT_READ_INDEX', False):
+            NodeRelation.objects.get(parent=root, child=component).delete()
+            root.add_contributor(UserFactory(), permissions=ADMIN, auth=Auth(admin), save=True)
+        assert self.indexed(admin) == {component.id, subcomponent.id}
+
+    def test_rebuild_matches_maintained_index(self, admin, root, component, subcomponent):
+        maintained = self.indexed(admin)
+        ImplicitNodeRead.objects.rebuild()
+        assert self.indexed(admin) == maintained
+
+    def test_can_view(self, admin, root, component):
+        component.is_public = False
+        component.save()
+        assert component in Node.objects.filter(id=component.id).can_view(user=admin)
+        assert component not in Node.objects.filter(id=component.id).can_view(user=UserFactory())
+
+    def test_get_nodes_for_user(self, admin, root, component):
+        assert component not in Node.objects.get_nodes_for_user(admin)
+        assert component in Node.objects.get_nodes_for_user(admin, include_implicit=True)
+
+
 @pytest.mark.enable_implicit_clean
 class TestNodeMODMCompat:
 
@@ -871,6 +871,27 @@ class TestProjectsInCommon:
         assert user.n_projects_in_common(user2) == 1
         assert user.n_projects_in_common(user3) == 0
 
+    def test_n_projects_in_common_by_user(self, user, auth):
+        user2 = UserFactory()
+        user3 = UserFactory()
+        user4 = UserFactory()
+        project = NodeFactory(creator=user)
+        project.add_contributor(contributor=user2, auth=auth)
+        project.add_contributor(contributor=user3, auth=auth)
+        project.save()
+        component = NodeFactory(creator=user, parent=project)
+        component.add_contributor(contributor=user2, auth=auth)
+        component.save()
+        deleted = NodeFactory(creator=user)
+        deleted.add_contributor(contributor=user2, auth=auth)
+        deleted.is_deleted = True
+        deleted.save()
+
+        counts = user.n_projects_in_common_by_user([user2, user3, user4])
+        assert counts == {user2.pk: 2, user3.pk: 1}
+        for other_user in (user2, user3, user4):
+            assert counts.get(other_user.pk, 0) == user.n_projects_in_common(other_user)
+
 
 class TestCookieMethods:
 
@@ -1,15 +1,25 @@
 #!/usr/bin/env python3
-"""Generate a sitemap for osf.io"""
+"""Generate a sitemap for osf.io
+
+URLs are split into shards by id range (static urls, nodes by node id, preprints by
+base guid id). Each shard is written as one or more `sitemap_<section>_<shard>_<part>.xml`
+files (plus a gzipped copy) and its content digest is recorded in `sitemap_manifest.json`,
+so later runs only rewrite and upload the shards whose urls changed.
+"""
+import argparse
 import boto3
+import concurrent.futures
 import datetime
 import gzip
+import hashlib
+import json
+import multiprocessing
 import os
 import shutil
-from urllib.parse import urlparse, urljoin
-import xml
+from urllib.parse import urljoin
+from xml.sax.saxutils import escape
 
 import django
-from django.contrib.sitemaps.views import sitemap
 
 django.setup()
 import logging
@@ -17,10 +27,10 @@ import tempfile
 
 from framework import sentry
 from framework.celery_tasks import app as celery_app
-from django.db.models import Q, F, OuterRef, Subquery
-from osf.models import OSFUser, AbstractNode, Preprint, PreprintProvider
+from django.db import connections
+from django.db.models import Max
+from osf.models import AbstractNode, GuidVersionsThrough, Preprint, VersionedGuidMixin
 from osf.models.spam import SpamStatus
-from osf.utils.workflows import DefaultStates
 from scripts import utils as script_utils
 from website import settings
 from website.app import init_app
@@ -28,17 +38,184 @@ from website.app import init_app
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+MANIFEST_NAME = 'sitemap_manifest.json'
+SECTIONS = ('static', 'nodes', 'preprints')
+MAX_ERRORS = 1000
+
+
+def node_queryset():
+    # AbstractNode urls (Nodes and Registrations, no Collections)
+    return (AbstractNode.objects
+        .filter(is_public=True, is_deleted=False, retraction_id__isnull=True)
+        .exclude(type__in=['osf.collection'], spam_status__in=[SpamStatus.SPAM, SpamStatus.FLAGGED]))
+
+
+def preprint_queryset():
+    # One row per base guid: the published version if there is one, else the latest
+    return Preprint.objects.filter(
+        date_published__isnull=False
+    ).exclude(
+        spam_status__in=[SpamStatus.SPAM, SpamStatus.FLAGGED]
+    ).order_by(
+        'versioned_guids__guid_id',
+        '-is_published',
+        '-versioned_guids__version'
+    ).distinct('versioned_guids__guid_id')
+
+
+def get_shard_count(section, shard_size):
+    if section == 'static':
+        return 1
+    if section == 'nodes':
+        max_id = AbstractNode.objects.aggregate(max_id=Max('id'))['max_id']
+    else:
+        max_id = GuidVersionsThrough.objects.filter(
+            content_type__model='preprint'
+        ).aggregate(max_id=Max('guid_id'))['max_id']
+    return -(-(max_id or 0) // shard_size)
+
+
+def url_config(base, **values):
+    config = dict(base)
+    config.update(values)
+    return config
+
+
+def get_shard_urls(section, shard, shard_size):
+    """Returns `(urls, errors)` for one shard, reading only the rows in its id range."""
+    urls = []
+    errors = 0
+    if section == 'static':
+        for config in settings.SITEMAP_STATIC_URLS:
+            urls.append(url_config(config, loc=urljoin(settings.DOMAIN, config['loc'])))
+        return urls, errors
+
+    start, end = shard * shard_size, (shard + 1) * shard_size
+    if section == 'nodes':
+        rows = (node_queryset()
+            .filter(id__gt=start, id__lte=end)
+            .order_by('id')
+            .values_list('id', 'guids___id', 'modified'))
+        for node_id, guid, modified in rows:
+            try:
+                urls.append(url_config(
+                    settings.SITEMAP_NODE_CONFIG,
+                    loc=urljoin(settings.DOMAIN, f'/{guid}/overview'),
+                    lastmod=modified.strftime('%Y-%m-%d'),
+                ))
+            except Exception as e:
+                errors += 1
+                logger.info(f'Error on NODE, {node_id}:')
+                logger.exception(e)
+        return urls, errors
+
+    rows = (preprint_queryset()
+        .filter(versioned_guids__guid_id__gt=start, versioned_guids__guid_id__lte=end)
+        .values_list('id', 'versioned_guids__guid___id', 'versioned_guids__version', 'provider___id', 'modified', 'date_withdrawn'))
+    for preprint_id, guid, version, provider_id, modified, date_withdrawn in rows:
+        try:
+            preprint_date = modified.strftime('%Y-%m-%d')
+            versioned_guid = f'{guid}{VersionedGuidMixin.GUID_VERSION_DELIMITER}{version}'
+            urls.append(url_config(
+                settings.SITEMAP_PREPRINT_CONFIG,
+                loc=urljoin(settings.DOMAIN, os.path.join('preprints', provider_id, versioned_guid)),
+                lastmod=preprint_date,
+            ))
+            # Withdrawn preprints may be viewed but not downloaded
+            if date_withdrawn is None:
+                urls.append(url_config(
+                    settings.SITEMAP_PREPRINT_FILE_CONFIG,
+                    loc=urljoin(settings.DOMAIN, os.path.join('download', versioned_guid, '?format=pdf')),
+                    lastmod=preprint_date,
+                ))
+        except Exception as e:
+            errors += 1
+            logger.info(f'Error on PREPRINT, {preprint_id}:')
+            logger.exception(e)
+    return urls, errors
+
+
+def get_digest(urls):
+    return hashlib.sha256(json.dumps(urls, sort_keys=True).encode()).hexdigest()
+
+
+class SitemapFile:
+    """Streams `<url>` entries to a sitemap xml file and its gzipped copy in one pass.
+
+    Both files are written under a temporary name and moved into place on close, so
+    a sitemap being served is never seen half written.
+    """
+
+    def __init__(self, sitemap_dir, name):
+        self.name = name
+        self.path = os.path.join(sitemap_dir, name)
+        self.url_count = 0
+        self.xml_file = open(self.path + '.partial', 'wb')
+        self.gz_file = gzip.open(self.path + '.gz.partial', 'wb')
+        self.write(f'<?xml version="1.0" encoding="utf-8"?>\n<urlset xmlns="{SITEMAP_NAMESPACE}">\n')
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self.xml_file.write(data)
+        self.gz_file.write(data)
+
+    def add_url(self, config):
+        tags = ''.join(f'    <{k}>{escape(v)}</{k}>\n' for k, v in config.items())
+        self.write(f'  <url>\n{tags}  </url>\n')
+        self.url_count += 1
+
+    def close(self):
+        self.write('</urlset>\n')
+        self.xml_file.close()
+        self.gz_file.close()
+        os.replace(self.path + '.partial', self.path)
+        os.replace(self.path + '.gz.partial', self.path + '.gz')
+
+
+def write_shard(sitemap_dir, section, shard, urls):
+    """Writes the shard's urls, `SITEMAP_URL_MAX` per file, and returns the file names."""
+    names = []
+    for part, offset in enumerate(range(0, len(urls), settings.SITEMAP_URL_MAX)):
+        sitemap_file = SitemapFile(sitemap_dir, f'sitemap_{section}_{shard}_{part}.xml')
+        for config in urls[offset:offset + settings.SITEMAP_URL_MAX]:
+            sitemap_file.add_url(config)
+        sitemap_file.close()
+        names.append(sitemap_file.name)
+    return names
+
+
+def build_shard(sitemap_dir, section, shard, shard_size, previous=None):
+    """Generates one shard, skipping the write when its urls match the `previous`
+    manifest entry. Returns the new manifest entry, whether it was written, and the
+    number of rows that failed.
+    """
+    urls, errors = get_shard_urls(section, shard, shard_size)
+    digest = get_digest(urls)
+    if previous and previous['digest'] == digest:
+        return previous, False, errors
+    entry = {
+        'digest': digest,
+        'files': write_shard(sitemap_dir, section, shard, urls),
+        'url_count': len(urls),
+        'lastmod': datetime.date.today().strftime('%Y-%m-%d'),
+    }
+    return entry, True, errors
+
 
 class Sitemap:
-    def __init__(self):
-        self.sitemap_count = 0
+    def __init__(self, shard_size=None, workers=1, force=False):
+        self.shard_size = shard_size or settings.SITEMAP_SHARD_SIZE
+        self.workers = workers
+        self.force = force
         self.errors = 0
-        self.new_doc()
+        self.written = {}  # files of each rewritten shard, by shard key
+        self.stale_files = []  # names to delete from s3 once the new index is up
         if not settings.SITEMAP_TO_S3:
             self.sitemap_dir = os.path.join(settings.STATIC_FOLDER, 'sitemaps')
             if not os.path.exists(self.sitemap_dir):
                 print(f'Creating sitemap directory at `{self.sitemap_dir}`')
-                os.makedirs(self.sitemap_dir)
+                os.makedirs(self.sitemap_dir, exist_ok=True)
         else:
             self.sitemap_dir = tempfile.mkdtemp()
             assert settings.SITEMAP_AWS_BUCKET, 'SITEMAP_AWS_BUCKET must be set for sitemap files to be sent to S3'
@@ -50,213 +227,199 @@ class Sitemap:
                 aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
                 region_name='us-east-1'
             )
+        self.manifest = {} if force else self.load_manifest()
 
     def cleanup(self):
         if settings.SITEMAP_TO_S3:
             shutil.rmtree(self.sitemap_dir)
 
-    def new_doc(self):
-        """Creates new sitemap document and resets the url_count."""
-        self.doc = xml.dom.minidom.Document()
-        self.urlset = self.doc.createElement('urlset')
-        self.urlset.setAttribute('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        self.doc.appendChild(self.urlset)
-        self.url_count = 0
-
-    def add_tag(self, name, text):
-        """Adds a tag to the current url"""
-        tag = self.doc.createElement(name)
-        self.url.appendChild(tag)
-        tag_text = self.doc.createTextNode(text)
-        tag.appendChild(tag_text)
-
-    def add_url(self, config):
-        """Adds a url to the current urlset"""
-        if self.url_count >= settings.SITEMAP_URL_MAX:
-            self.write_doc()
-            self.new_doc()
-        self.url = self.doc.createElement('url')
-        self.urlset.appendChild(self.url)
-
-        for k, v in config.items():
-            self.add_tag(k, v)
-        self.url_count += 1
-
-    def write_doc(self):
-        """Writes and gzips each sitemap xml file"""
-        file_name = f'sitemap_{str(self.sitemap_count)}.xml'
-        file_path = os.path.join(self.sitemap_dir, file_name)
-        zip_file_name = file_name + '.gz'
-        zip_file_path = file_path + '.gz'
-        print(f'Writing and gzipping `{file_path}`: url_count = {str(self.url_count)}')
-
-        xml_str = self.doc.toprettyxml(indent='  ', encoding='utf-8')
-        with open(file_path, 'wb') as f:
-            f.write(xml_str)
-
-        # Write zipped file
-        with open(file_path, 'rb') as f_in, gzip.open(zip_file_path, 'wb') as f_out:
-            shutil.copyfileobj(f_in, f_out)
+    def load_manifest(self):
+        """Loads the digests and file names recorded by the previous run."""
+        try:
+            if settings.SITEMAP_TO_S3:
+                body = self.s3.Object(settings.SITEMAP_AWS_BUCKET, f'sitemaps/{MANIFEST_NAME}').get()['Body'].read()
+                manifest = json.loads(body)
+            else:
+                with open(os.path.join(self.sitemap_dir, MANIFEST_NAME)) as f:
+                    manifest = json.load(f)
+        except Exception:
+            logger.info('No usable sitemap manifest found, regenerating every shard')
+            return {}
+        if manifest.get('shard_size') != self.shard_size:
+            return {}
+        if not settings.SITEMAP_TO_S3:
+            # Files removed by hand have to be regenerated even if their urls did not change
+            for key, entry in list(manifest['shards'].items()):
+                if not all(os.path.exists(os.path.join(self.sitemap_dir, name)) for name in entry['files']):
+                    del manifest['shards'][key]
+        return manifest['shards']
+
+    def write_manifest(self):
+        file_path = os.path.join(self.sitemap_dir, MANIFEST_NAME)
+        with open(file_path, 'w') as f:
+            json.dump({'shard_size': self.shard_size, 'shards': self.manifest}, f, indent=2, sort_keys=True)
         if settings.SITEMAP_TO_S3:
-            self.ship_to_s3(file_name, file_path)
-            self.ship_to_s3(zip_file_name, zip_file_path)
-        self.sitemap_count += 1
+            self.ship_to_s3(MANIFEST_NAME, file_path)
 
     def ship_to_s3(self, name, path):
-        data = open(path, 'rb')
+        """Uploads one file, returning whether it worked."""
         try:
-            self.s3.Bucket(settings.SITEMAP_AWS_BUCKET).put_object(Key=f'sitemaps/{name}', Body=data)
+            with open(path, 'rb') as data:
+                self.s3.meta.client.put_object(Bucket=settings.SITEMAP_AWS_BUCKET, Key=f'sitemaps/{name}', Body=data)
         except Exception as e:
             logger.info('Error sending data to s3 via boto3')
             logger.exception(e)
             sentry.log_message('ERROR: Sitemaps could not be uploaded to s3, see `generate_sitemap` logs')
-        data.close()
+            return False
+        return True
+
+    def ship_written_to_s3(self):
+        """Uploads the files of every rewritten shard, several at a time. Shards with a file
+        that failed to upload are dropped from the manifest, so the next run writes them again.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {
+                executor.submit(self.ship_to_s3, name, os.path.join(self.sitemap_dir, name)): key
+                for key, files in self.written.items()
+                for file_name in files
+                for name in (file_name, file_name + '.gz')
+            }
+            failed_keys = {futures[future] for future in concurrent.futures.as_completed(futures) if not future.result()}
+        for key in failed_keys:
+            logger.info(f'Dropping shard {key} from the manifest, since its files were not all uploaded')
+            self.manifest.pop(key, None)
+
+    def remove_stale_files(self, previous, entry):
+        if not previous:
+            return
+        stale_names = [
+            path
+            for name in set(previous['files']) - set(entry['files'])
+            for path in (name, name + '.gz')
+        ]
+        if settings.SITEMAP_TO_S3:
+            # the index in s3 still points at them until the new one is uploaded
+            self.stale_files.extend(stale_names)
+            return
+        for path in stale_names:
+            try:
+                os.remove(os.path.join(self.sitemap_dir, path))
+            except FileNotFoundError:
+                pass
+
+    def delete_stale_from_s3(self):
+        for offset in range(0, len(self.stale_files), 1000):  # s3 deletes at most 1000 keys per request
+            names = self.stale_files[offset:offset + 1000]
+            try:
+                self.s3.meta.client.delete_objects(
+                    Bucket=settings.SITEMAP_AWS_BUCKET,
+                    Delete={'Objects': [{'Key': f'sitemaps/{name}'} for name in names]},
+                )
+            except Exception as e:
+                logger.info('Error deleting stale sitemaps from s3 via boto3')
+                logger.exception(e)
+
+    def record_shard(self, key, entry, written, errors):
+        previous = self.manifest.get(key)
+        if written:
+            self.remove_stale_files(previous, entry)
+            self.written[key] = entry['files']
+        self.manifest[key] = entry
+        if errors:
+            self.log_errors(key, errors)
 
     def write_sitemap_index(self):
         """Writes the index file for all of the sitemap files"""
-        doc = xml.dom.minidom.Document()
-        sitemap_index = self.doc.createElement('sitemapindex')
-        sitemap_index.setAttribute('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        doc.appendChild(sitemap_index)
-
-        for f in range(self.sitemap_count):
-            sitemap = doc.createElement('sitemap')
-            sitemap_index.appendChild(sitemap)
-
-            loc = doc.createElement('loc')
-            sitemap.appendChild(loc)
-            loc_text = self.doc.createTextNode(urljoin(settings.DOMAIN, f'sitemaps/sitemap_{str(f)}.xml'))
-            loc.appendChild(loc_text)
-
-            datemod = doc.createElement('lastmod')
-            sitemap.appendChild(datemod)
-            datemod_text = self.doc.createTextNode(datetime.datetime.now().strftime('%Y-%m-%d'))
-            datemod.appendChild(datemod_text)
-
         print('Writing `sitemap_index.xml`')
         file_name = 'sitemap_index.xml'
         file_path = os.path.join(self.sitemap_dir, file_name)
-        xml_str = doc.toprettyxml(indent='  ', encoding='utf-8')
-        with open(file_path, 'wb') as f:
-            f.write(xml_str)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(f'<?xml version="1.0" encoding="utf-8"?>\n<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n')
+            for key in self.sorted_shard_keys():
+                entry = self.manifest[key]
+                for name in entry['files']:
+                    loc = escape(urljoin(settings.DOMAIN, f'sitemaps/{name}'))
+                    f.write(f'  <sitemap>\n    <loc>{loc}</loc>\n    <lastmod>{entry["lastmod"]}</lastmod>\n  </sitemap>\n')
+            f.write('</sitemapindex>\n')
         if settings.SITEMAP_TO_S3:
             self.ship_to_s3(file_name, file_path)
 
-    def log_errors(self, obj, obj_id, error):
+    def sorted_shard_keys(self):
+        def sort_key(key):
+            section, shard = key.rsplit('_', 1)
+            return SECTIONS.index(section), int(shard)
+        return sorted(self.manifest, key=sort_key)
+
+    def log_errors(self, shard_key, count):
         if not self.errors:
             script_utils.add_file_logger(logger, __file__)
-        self.errors += 1
-        logger.info(f'Error on {obj}, {obj_id}:')
-        logger.exception(error)
+        self.errors += count
+        logger.info(f'{count} errors in shard {shard_key}')
 
         if self.errors <= 10:
-            sentry.log_message(f'Sitemap Error: {error}')
+            sentry.log_message(f'Sitemap Error: {count} errors in shard {shard_key}')
 
-        if self.errors == 1000:
-            sentry.log_message('ERROR: generate_sitemap stopped execution after reaching 1000 errors. See logs for details.')
+        if self.errors >= MAX_ERRORS:
+            sentry.log_message(f'ERROR: generate_sitemap stopped execution after reaching {MAX_ERRORS} errors. See logs for details.')
             raise Exception('Too many errors generating sitemap.')
 
-    def generate(self):
-        print('Generating Sitemap')
+    def get_shards(self):
+        shards = []
+        for section in SECTIONS:
+            count = get_shard_count(section, self.shard_size)
+            shards.extend((section, shard) for shard in range(count))
+        return shards
 
-        # Progress bar
+    def build_shards(self, shards):
         progress = script_utils.Progress(precision=0)
-
-        # Static urls
-        progress.start(len(settings.SITEMAP_STATIC_URLS), 'STAT: ')
-        for config in settings.SITEMAP_STATIC_URLS:
-            config['loc'] = urljoin(settings.DOMAIN, config['loc'])
-            self.add_url(config)
-            progress.increment()
+        progress.start(len(shards), 'SHARDS: ')
+        if self.workers > 1:
+            # Each worker opens its own database connection after the fork
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+                futures = {
+                    executor.submit(
+                        build_shard, self.sitemap_dir, section, shard, self.shard_size,
+                        self.manifest.get(f'{section}_{shard}'),
+                    ): f'{section}_{shard}'
+                    for section, shard in shards
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    self.record_shard(futures[future], *future.result())
+                    progress.increment()
+        else:
+            for section, shard in shards:
+                key = f'{section}_{shard}'
+                self.record_shard(key, *build_shard(self.sitemap_dir, section, shard, self.shard_size, self.manifest.get(key)))
+                progress.increment()
         progress.stop()
 
-        # # User urls
-        # objs = OSFUser.objects.filter(is_active=True).exclude(date_confirmed__isnull=True).values_list('guids___id', flat=True)
-        # progress.start(objs.count(), 'USER: ')
-        # for obj in objs:
-        #     try:
-        #         config = settings.SITEMAP_USER_CONFIG
-        #         config['loc'] = urljoin(settings.DOMAIN, f'/{obj}/')
-        #         self.add_url(config)
-        #     except Exception as e:
-        #         self.log_errors('USER', obj, e)
-        #     progress.increment()
-        # progress.stop()
-
-        # AbstractNode urls (Nodes and Registrations, no Collections)
-        objs = (AbstractNode.objects
-            .filter(is_public=True, is_deleted=False, retraction_id__isnull=True)
-            .exclude(type__in=['osf.collection'], spam_status__in=[SpamStatus.SPAM, SpamStatus.FLAGGED])
-            .values('guids___id', 'modified'))
-        progress.start(objs.count(), 'NODE: ')
-        for obj in objs:
-            try:
-                config = settings.SITEMAP_NODE_CONFIG
-                config['loc'] = urljoin(settings.DOMAIN, '/{}/overview'.format(obj['guids___id']))
-                config['lastmod'] = obj['modified'].strftime('%Y-%m-%d')
-                self.add_url(config)
-            except Exception as e:
-                self.log_errors('NODE', obj['guids___id'], e)
-            progress.increment()
-        progress.stop()
-        objs = Preprint.objects.filter(
-            date_published__isnull=False).exclude(spam_status__in=[SpamStatus.SPAM, SpamStatus.FLAGGED]).annotate(
-            most_recent_non_withdrawn=Subquery(
-                Preprint.objects.filter(
-                    guids=OuterRef('guids')
-                ).order_by('-versioned_guids__version').values('versioned_guids__version')[:1]
-            )
-        ).order_by(
-            'versioned_guids__guid_id',
-            '-is_published',
-            '-versioned_guids__version'
-        ).distinct('versioned_guids__guid_id')
-
-        progress.start(len(objs) * 2, 'PREP: ')
-        for obj in objs:
-            try:
-                preprint_date = obj.modified.strftime('%Y-%m-%d')
-                config = settings.SITEMAP_PREPRINT_CONFIG
-                preprint_url = os.path.join('preprints', obj.provider._id, obj._id)
-                config['loc'] = urljoin(settings.DOMAIN, preprint_url)
-                config['lastmod'] = preprint_date
-                self.add_url(config)
-
-                # Preprint file urls
-                if not obj.is_retracted:
-                    # Withdrawn preprints may be viewed but not downloaded
-                    try:
-                        file_config = settings.SITEMAP_PREPRINT_FILE_CONFIG
-                        file_config['loc'] = urljoin(
-                            settings.DOMAIN,
-                            os.path.join(
-                                'download',
-                                obj._id,
-                                '?format=pdf'
-                            )
-                        )
-                        file_config['lastmod'] = preprint_date
-                        self.add_url(file_config)
-                    except Exception as e:
-                        self.log_errors(obj.primary_file, obj.primary_file._id, e)
+    def generate(self):
+        print('Generating Sitemap')
 
-            except Exception as e:
-                self.log_errors(obj, obj._id, e)
-            progress.increment(2)
-        progress.stop()
+        shards = self.get_shards()
+        # Shards past the current maximum id no longer have any urls
+        for key in set(self.manifest) - {f'{section}_{shard}' for section, shard in shards}:
+            self.remove_stale_files(self.manifest.pop(key), {'files': []})
+        self.build_shards(shards)
 
-        # Final write
-        self.write_doc()
+        if settings.SITEMAP_TO_S3:
+            self.ship_written_to_s3()
+        self.write_manifest()
         # Create index file
         self.write_sitemap_index()
+        if settings.SITEMAP_TO_S3:
+            self.delete_stale_from_s3()
 
         # TODO: once the sitemap is validated add a ping to google with sitemap index file location
-        # TODO: server side cursor query wrapper might be useful as the index gets larger.
         # Sitemap indexable limit check
-        if self.sitemap_count > settings.SITEMAP_INDEX_MAX * .90:  # 10% of urls remaining
+        sitemap_count = sum(len(entry['files']) for entry in self.manifest.values())
+        if sitemap_count > settings.SITEMAP_INDEX_MAX * .90:  # 10% of urls remaining
             sentry.log_message('WARNING: Max sitemaps nearly reached.')
-        print(f'Total url_count = {(self.sitemap_count - 1) * settings.SITEMAP_URL_MAX + self.url_count}')
-        print(f'Total sitemap_count = {str(self.sitemap_count)}')
+        print(f'Total url_count = {sum(entry["url_count"] for entry in self.manifest.values())}')
+        print(f'Total sitemap_count = {sitemap_count}')
+        print(f'Rewritten sitemap_count = {sum(len(files) for files in self.written.values())}')
         if self.errors:
             sentry.log_message('WARNING: Generate sitemap encountered errors. See logs for details.')
             print(f'Total errors = {str(self.errors)}')
@@ -264,12 +427,16 @@ class Sitemap:
             print('No errors')
 
 @celery_app.task(name='scripts.generate_sitemap')
-def main():
+def main(workers=None, force=False):
     init_app(routes=False)  # Sets the storage backends on all models
-    sitemap = Sitemap()
+    sitemap = Sitemap(workers=workers or settings.SITEMAP_WORKERS, force=force)
     sitemap.generate()
     sitemap.cleanup()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=settings.SITEMAP_WORKERS, help='Number of processes generating shards')
+    parser.add_argument('--force', action='store_true', help='Regenerate every shard, ignoring the manifest')
+    args = parser.parse_args()
     init_app(set_backends=True, routes=False)
-    main()
+    main(workers=args.workers, force=args.force)
@@ -1117,6 +1117,67 @@ class TestCheckAuth(OsfTestCase):
         assert views._check_resource_permissions(component, Auth(user=self.user), 'copyfrom')
 
 
+@mock.patch('website.settings.WATERBUTLER_AUTH_CACHE_TIMEOUT', 30)
+class TestCheckAuthCache(OsfTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = AuthUserFactory()
+        self.node = ProjectFactory(creator=self.user)
+
+    def test_permission_is_reused(self):
+        assert views._check_resource_permissions(self.node, Auth(user=self.user), 'upload')
+        with mock.patch.object(self.node, 'can_edit') as mock_can_edit:
+            assert views._check_resource_permissions(self.node, Auth(user=self.user), 'upload')
+        assert not mock_can_edit.called
+
+    def test_removing_contributor_drops_permission(self):
+        contrib = AuthUserFactory()
+        self.node.add_contributor(contrib, permissions=WRITE, auth=Auth(self.user), save=True)
+        assert views._check_resource_permissions(self.node, Auth(user=contrib), 'upload')
+
+        self.node.remove_contributor(contrib, auth=Auth(self.user))
+        with self.assertRaises(HTTPError) as exc_info:
+            views._check_resource_permissions(self.node, Auth(user=contrib), 'upload')
+        assert exc_info.exception.code == 403
+
+    def test_lowering_permission_drops_permission(self):
+        contrib = AuthUserFactory()
+        self.node.add_contributor(contrib, permissions=WRITE, auth=Auth(self.user), save=True)
+        assert views._check_resource_permissions(self.node, Auth(user=contrib), 'upload')
+
+        self.node.update_contributor(contrib, READ, True, auth=Auth(self.user), save=True)
+        with self.assertRaises(HTTPError) as exc_info:
+            views._check_resource_permissions(self.node, Auth(user=contrib), 'upload')
+        assert exc_info.exception.code == 403
+        assert views._check_resource_permissions(self.node, Auth(user=contrib), 'download')
+
+    def test_view_only_links_are_not_cached(self):
+        link = new_private_link('cached link', self.user, [self.node], anonymous=False)
+        auth = Auth(private_key=link.key)
+        assert views._check_resource_permissions(self.node, auth, 'download')
+        with mock.patch.object(self.node, 'can_view_files', return_value=False) as mock_can_view:
+            with self.assertRaises(HTTPError):
+                views._check_resource_permissions(self.node, auth, 'download')
+        assert mock_can_view.called
+
+    def test_making_private_drops_permission(self):
+        self.node.is_public = True
+        self.node.save()
+        assert views._check_resource_permissions(self.node, Auth(), 'download')
+
+        self.node.is_public = False
+        self.node.save()
+        with self.assertRaises(HTTPError):
+            views._check_resource_permissions(self.node, Auth(), 'download')
+
+    def test_osfstorage_settings_are_reused(self):
+        first = views._get_waterbutler_configs(self.node, 'osfstorage', None)
+        with mock.patch.object(self.node, 'serialize_waterbutler_settings') as mock_serialize:
+            assert views._get_waterbutler_configs(self.node, 'osfstorage', None) == first
+        assert not mock_serialize.called
+
+
 class TestCheckOAuth(OsfTestCase):
 
     def setUp(self):
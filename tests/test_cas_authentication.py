@@ -226,6 +226,88 @@ class TestCASClient(OsfTestCase):
         assert 0
 
 
+@mock.patch('website.settings.CAS_TOKEN_CACHE_TIMEOUT', 60)
+class TestCASTokenCache(OsfTestCase):
+
+    def setUp(self):
+        OsfTestCase.setUp(self)
+        cas.get_token_cache().clear()
+        self.client = cas.CasClient('http://accounts.test.test')
+        self.token = fake.md5()
+        self.profile_url = self.client.get_profile_url()
+
+    @responses.activate
+    def test_profile_is_reused(self):
+        responses.add(responses.GET, self.profile_url, json={'id': 'abcde', 'scope': ['osf.full_read']})
+
+        first = cas.get_cached_profile(self.client, self.token)
+        second = cas.get_cached_profile(self.client, self.token)
+
+        assert len(responses.calls) == 1
+        assert second.user == first.user == 'abcde'
+        assert second.attributes['accessTokenScope'] == {'osf.full_read'}
+        assert second.attributes['accessToken'] == self.token
+
+    @responses.activate
+    def test_profile_is_kept_until_token_expires(self):
+        responses.add(responses.GET, self.profile_url, json={'id': 'abcde', 'expires_in': 5})
+
+        with mock.patch.object(cas.get_token_cache(), 'set', wraps=cas.get_token_cache().set) as mock_set:
+            cas.get_cached_profile(self.client, self.token)
+        assert mock_set.call_args[0][-1] == 5
+        assert 'accessTokenExpiresIn' not in cas.get_cached_profile(self.client, self.token).attributes
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_expired_token_is_not_cached(self):
+        responses.add(responses.GET, self.profile_url, json={'id': 'abcde', 'expires_in': 0})
+
+        cas.get_cached_profile(self.client, self.token)
+        cas.get_cached_profile(self.client, self.token)
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_rejected_token_is_remembered(self):
+        responses.add(responses.GET, self.profile_url, status=401)
+
+        for _ in range(2):
+            with pytest.raises(cas.CasHTTPError) as e:
+                cas.get_cached_profile(self.client, self.token)
+            assert e.value.code == 401
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_server_errors_are_not_cached(self):
+        responses.add(responses.GET, self.profile_url, status=500)
+
+        for _ in range(2):
+            with pytest.raises(cas.CasHTTPError):
+                cas.get_cached_profile(self.client, self.token)
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_revoking_token_drops_cached_profile(self):
+        responses.add(responses.GET, self.profile_url, json={'id': 'abcde'})
+        responses.add(responses.POST, self.client.get_auth_token_revocation_url(), status=204)
+
+        cas.get_cached_profile(self.client, self.token)
+        self.client.revoke_tokens({'token': self.token})
+        cas.get_cached_profile(self.client, self.token)
+
+        assert len([call for call in responses.calls if call.request.method == 'GET']) == 2
+
+    @responses.activate
+    def test_revoking_application_drops_every_cached_profile(self):
+        responses.add(responses.GET, self.profile_url, json={'id': 'abcde'})
+        responses.add(responses.POST, self.client.get_auth_token_revocation_url(), status=204)
+
+        cas.get_cached_profile(self.client, self.token)
+        self.client.revoke_application_tokens('fake_id', 'fake_secret')
+        cas.get_cached_profile(self.client, self.token)
+
+        assert len([call for call in responses.calls if call.request.method == 'GET']) == 2
+
+
 class TestCASTicketAuthentication(OsfTestCase):
 
     def setUp(self):
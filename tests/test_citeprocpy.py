@@ -4,7 +4,7 @@ import json
 from django.utils import timezone
 import pytest
 
-from api.citations.utils import render_citation
+from api.citations.utils import get_citation_style, render_citation, render_citations
 from osf.models import OSFUser
 from osf_tests.factories import UserFactory, PreprintFactory
 from tests.base import OsfTestCase
@@ -163,3 +163,28 @@ class TestCiteprocpyMLA(OsfTestCase):
                 self.preprint.title,
                 self.preprint.provider.name,
                 self.formated_date)
+
+
+class TestRenderCitations(OsfTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory(fullname='John Tordoff')
+        self.preprints = [PreprintFactory(creator=self.user, title=f'My Preprint {i}') for i in range(2)]
+
+    def test_style_is_parsed_once(self):
+        get_citation_style.cache_clear()
+        render_citation(self.preprints[0], 'apa')
+        render_citation(self.preprints[1], 'apa')
+        assert get_citation_style.cache_info().misses == 1
+
+    def test_render_citations_matches_render_citation(self):
+        citations = render_citations(self.preprints, 'modern-language-association')
+        assert citations == {
+            preprint._id: render_citation(preprint, 'modern-language-association')
+            for preprint in self.preprints
+        }
+
+    def test_render_citations_unknown_style(self):
+        with pytest.raises(ValueError):
+            render_citations(self.preprints, 'not-a-style')
@@ -0,0 +1,44 @@
+import pytest
+
+from framework.postcommit_tasks.handlers import PostcommitExecutor, get_dedup_key
+from osf.models import OSFUser
+
+
+def task(*args, **kwargs):
+    pass
+
+
+def failing_task():
+    raise ValueError('nope')
+
+
+class TestDedupKey:
+
+    def test_same_model_instance_same_key(self):
+        assert get_dedup_key(task, (OSFUser(id=1),), {}) == get_dedup_key(task, (OSFUser(id=1),), {})
+
+    def test_different_model_instance_different_key(self):
+        assert get_dedup_key(task, (OSFUser(id=1),), {}) != get_dedup_key(task, (OSFUser(id=2),), {})
+
+    def test_unhashable_arguments(self):
+        key = get_dedup_key(task, ([1, {'a': [2]}],), {'b': {3}})
+        assert key == get_dedup_key(task, ([1, {'a': [2]}],), {'b': {3}})
+        assert key != get_dedup_key(task, ([1, {'a': [3]}],), {'b': {3}})
+
+
+class TestPostcommitExecutor:
+
+    def test_records_calls(self):
+        executor = PostcommitExecutor(size=2, timeout=1, slow_threshold=10)
+        executor.run([task, task, task])
+
+        metrics = executor.metrics['tests.test_postcommit_tasks.task']
+        assert metrics['calls'] == 3
+        assert metrics['failures'] == 0
+
+    def test_records_and_raises_failures(self):
+        executor = PostcommitExecutor(size=2, timeout=1, slow_threshold=10)
+        with pytest.raises(ValueError):
+            executor.run([failing_task])
+
+        assert executor.metrics['tests.test_postcommit_tasks.failing_task']['failures'] == 1
@@ -102,6 +102,19 @@ class TestFileNodeObj(FilesTestCase):
                                              target=self.node)
         assert created.get_guid()._id in file_guids
 
+    def test_get_file_guids_only_for_provider(self):
+        created = TestFile.get_or_create(self.node, 'Path')
+        created.materialized_path = '/Path'
+        created.get_guid(create=True)
+        created.save()
+        other = S3File.create(_path='/Path', name='Path', target=self.node, materialized_path='/Path')
+        other.save()
+        other.get_guid(create=True)
+        file_guids = BaseFileNode.get_file_guids(materialized_path='/Path',
+                                                 provider=created.provider,
+                                                 target=self.node)
+        assert file_guids == [created.get_guid()._id]
+
     def test_get_file_guids_with_folder_path(self):
         created = TestFile.get_or_create(self.node, 'folder/Path')
         created.name = 'kerp'
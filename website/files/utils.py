@@ -15,6 +15,9 @@ def copy_files(src, target_node, parent=None, name=None, **version_filters):
     cloned.target = target_node
     cloned.name = name or cloned.name
     cloned.copied_from = src
+    # Version pointers are recomputed as versions are attached to the clone below
+    cloned.latest_version = None
+    cloned.earliest_version = None
 
     cloned.save()
     if src.is_file and src.versions.exists():
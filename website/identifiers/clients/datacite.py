@@ -33,6 +33,7 @@ class DataCiteClient(AbstractIdentifierClient):
                 osf_item=node,
                 format_key='datacite-xml',
                 serializer_config={'doi_value': doi_value},
+                cached=False,  # sent to datacite, so don't risk stale related metadata
             )
             return metadata_file.serialized_metadata
         else:
@@ -40,6 +41,7 @@ class DataCiteClient(AbstractIdentifierClient):
                 osf_item=node,
                 format_key='datacite-json',
                 serializer_config={'doi_value': doi_value},
+                cached=False,  # sent to datacite, so don't risk stale related metadata
             )
 
     def build_doi(self, object):
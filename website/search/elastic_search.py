@@ -1,19 +1,25 @@
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 import copy
 import functools
+import hashlib
+import json
 import logging
 import math
 import re
+import threading
+import time
 import unicodedata
 from framework import sentry
 
 from django.apps import apps
 from django.core.paginator import Paginator
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
+from django.db import connection
+from django.db.models import QuerySet
 from elasticsearch2 import (ConnectionError, Elasticsearch, NotFoundError,
                             RequestError, TransportError, helpers)
 from framework.celery_tasks import app as celery_app
-from framework.database import paginated
 from osf.models import AbstractNode
 from osf.models import OSFUser
 from osf.models import BaseFileNode
@@ -103,6 +109,146 @@ def client():
     return CLIENT
 
 
+_recently_indexed = OrderedDict()
+_recently_indexed_lock = threading.Lock()
+
+
+def _document_digest(body):
+    return hashlib.md5(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def is_recently_indexed(index, doc_type, doc_id, body):
+    """Whether this exact document was sent to the index in the last ELASTIC_DEBOUNCE_SECONDS,
+    so repeated saves of an unchanged object skip the round trip.
+    """
+    if not settings.ELASTIC_DEBOUNCE_SECONDS:
+        return False
+    with _recently_indexed_lock:
+        previous = _recently_indexed.get((index, doc_type, doc_id))
+    return (
+        previous is not None
+        and previous[0] == _document_digest(body)
+        and time.monotonic() - previous[1] < settings.ELASTIC_DEBOUNCE_SECONDS
+    )
+
+
+def mark_indexed(index, doc_type, doc_id, body):
+    """Record that this document was sent successfully, for is_recently_indexed."""
+    if not settings.ELASTIC_DEBOUNCE_SECONDS:
+        return
+    key = (index, doc_type, doc_id)
+    digest = _document_digest(body)
+    with _recently_indexed_lock:
+        _recently_indexed.pop(key, None)
+        _recently_indexed[key] = (digest, time.monotonic())
+        while len(_recently_indexed) > settings.ELASTIC_DEBOUNCE_MAX_DOCUMENTS:
+            _recently_indexed.popitem(last=False)
+
+
+def forget_indexed(index, doc_type, doc_id):
+    with _recently_indexed_lock:
+        _recently_indexed.pop((index, doc_type, doc_id), None)
+
+
+def forget_index(index):
+    with _recently_indexed_lock:
+        for key in [key for key in _recently_indexed if key[0] == index]:
+            del _recently_indexed[key]
+
+
+def index_document(index, doc_type, doc_id, body):
+    """Index a single document unless the same document was just sent."""
+    if is_recently_indexed(index, doc_type, doc_id, body):
+        return
+    try:
+        client().index(index=index, doc_type=doc_type, id=doc_id, body=body, refresh=True)
+    except Exception:
+        forget_indexed(index, doc_type, doc_id)
+        raise
+    mark_indexed(index, doc_type, doc_id, body)
+
+
+def iter_chunks(objects, chunk_size):
+    if isinstance(objects, QuerySet):
+        objects = objects.iterator(chunk_size=chunk_size)
+    chunk = []
+    for obj in objects:
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def serialize_in_chunks(serialize, objects, chunk_size=None, workers=None):
+    """Yield (object, serialized) pairs, reading ``objects`` a chunk at a time.
+
+    With more than one worker, chunks are serialized on a thread pool, at most two chunks
+    per worker ahead of the consumer. Each worker uses its own database connection, so
+    only use workers for objects committed before the call.
+    """
+    chunk_size = chunk_size or settings.ELASTIC_BULK_CHUNK_SIZE
+    workers = workers or settings.ELASTIC_SERIALIZE_WORKERS
+    chunks = iter_chunks(objects, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            for obj in chunk:
+                yield obj, serialize(obj)
+        return
+
+    def serialize_chunk(chunk):
+        try:
+            return [(obj, serialize(obj)) for obj in chunk]
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(serialize_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def stream_bulk(actions, refresh=False, raise_on_error=True, ignore_statuses=()):
+    """Send ``actions`` with streaming_bulk, so they are never all held in memory.
+    Documents are recorded for is_recently_indexed only once Elasticsearch accepts them.
+    Returns the number of successful actions and a list of errors, like helpers.bulk.
+    """
+    sent = {}
+
+    def remember(actions):
+        for action in actions:
+            body = action.get('_source', action.get('doc'))
+            if body is not None:
+                sent[(action['_index'], action['_type'], action['_id'])] = body
+            yield action
+
+    success, errors = 0, []
+    for ok, item in helpers.streaming_bulk(
+        client(),
+        remember(actions),
+        chunk_size=settings.ELASTIC_BULK_CHUNK_SIZE,
+        raise_on_error=raise_on_error,
+        refresh=refresh,
+    ):
+        result = list(item.values())[0]
+        key = (result.get('_index'), result.get('_type'), result.get('_id'))
+        body = sent.pop(key, None)
+        if ok:
+            success += 1
+            if body is not None:
+                mark_indexed(*key, body)
+            continue
+        forget_indexed(*key)
+        if result.get('status') not in ignore_statuses:
+            errors.append(item)
+    return success, errors
+
+
 def requires_search(func):
     def wrapped(*args, **kwargs):
         if client() is not None:
@@ -477,8 +623,7 @@ def serialize_group(group, category):
 def update_node(node, index=None, bulk=False, async_update=False):
     from addons.osfstorage.models import OsfStorageFile
     index = index or INDEX
-    for file_ in paginated(OsfStorageFile, Q(target_content_type=ContentType.objects.get_for_model(type(node)), target_object_id=node.id)):
-        file_.update_search()
+    bulk_update_files(OsfStorageFile.objects.filter(target_content_type=ContentType.objects.get_for_model(type(node)), target_object_id=node.id), index=index)
 
     is_qa_node = bool(set(settings.DO_NOT_INDEX_LIST['tags']).intersection(node.tags.all().values_list('name', flat=True))) or any(substring in node.title for substring in settings.DO_NOT_INDEX_LIST['titles'])
     if node.is_deleted or not node.is_public or node.archiving or node.is_spam or (node.spam_status == SpamStatus.FLAGGED and settings.SPAM_FLAGGED_REMOVE_FROM_SEARCH) or is_qa_node:
@@ -489,14 +634,13 @@ def update_node(node, index=None, bulk=False, async_update=False):
         if bulk:
             return elastic_document
         else:
-            client().index(index=index, doc_type=category, id=node._id, body=elastic_document, refresh=True)
+            index_document(index, category, node._id, elastic_document)
 
 @requires_search
 def update_preprint(preprint, index=None, bulk=False, async_update=False):
     from addons.osfstorage.models import OsfStorageFile
     index = index or INDEX
-    for file_ in paginated(OsfStorageFile, Q(target_content_type=ContentType.objects.get_for_model(type(preprint)), target_object_id=preprint.id)):
-        file_.update_search()
+    bulk_update_files(OsfStorageFile.objects.filter(target_content_type=ContentType.objects.get_for_model(type(preprint)), target_object_id=preprint.id), index=index)
 
     is_qa_preprint = bool(set(settings.DO_NOT_INDEX_LIST['tags']).intersection(preprint.tags.all().values_list('name', flat=True))) or any(substring in preprint.title for substring in settings.DO_NOT_INDEX_LIST['titles'])
     if not preprint.verified_publishable or preprint.is_spam or (preprint.spam_status == SpamStatus.FLAGGED and settings.SPAM_FLAGGED_REMOVE_FROM_SEARCH) or is_qa_preprint:
@@ -507,7 +651,7 @@ def update_preprint(preprint, index=None, bulk=False, async_update=False):
         if bulk:
             return elastic_document
         else:
-            client().index(index=index, doc_type=category, id=preprint._id, body=elastic_document, refresh=True)
+            index_document(index, category, preprint._id, elastic_document)
 
 @requires_search
 def update_group(group, index=None, bulk=False, async_update=False, deleted_id=None):
@@ -521,31 +665,37 @@ def update_group(group, index=None, bulk=False, async_update=False, deleted_id=N
         if bulk:
             return elastic_document
         else:
-            client().index(index=index, doc_type=category, id=group._id, body=elastic_document, refresh=True)
+            index_document(index, category, group._id, elastic_document)
 
-def bulk_update_nodes(serialize, nodes, index=None, category=None):
+def bulk_update_nodes(serialize, nodes, index=None, category=None, refresh=False, workers=None):
     """Updates the list of input projects
 
     :param function Node-> dict serialize:
-    :param Node[] nodes: Projects, components, registrations, or preprints
+    :param Node[] nodes: Projects, components, registrations, or preprints; querysets are read in chunks
     :param str index: Index of the nodes
-    :return:
+    :param bool refresh: Refresh the index once the updates are sent
+    :param int workers: Number of threads serializing nodes, defaults to ELASTIC_SERIALIZE_WORKERS
+    :return: Number of documents updated and a list of errors
     """
     index = index or INDEX
-    actions = []
-    for node in nodes:
-        serialized = serialize(node)
-        if serialized:
-            actions.append({
+
+    def actions():
+        for node, serialized in serialize_in_chunks(serialize, nodes, workers=workers):
+            if not serialized:
+                continue
+            doc_type = category or get_doctype_from_node(node)
+            if is_recently_indexed(index, doc_type, node._id, serialized):
+                continue
+            yield {
                 '_op_type': 'update',
                 '_index': index,
                 '_id': node._id,
-                '_type': category or get_doctype_from_node(node),
+                '_type': doc_type,
                 'doc': serialized,
                 'doc_as_upsert': True,
-            })
-    if actions:
-        return helpers.bulk(client(), actions, refresh=True)
+            }
+
+    return stream_bulk(actions(), refresh=refresh)
 
 
 def serialize_collection_submission_contributor(contrib):
@@ -675,20 +825,12 @@ def update_user(user, index=None):
 
     client().index(index=index, doc_type='user', body=user_doc, id=user._id, refresh=True)
 
-@requires_search
-def update_file(file_, index=None, delete=False):
-    index = index or INDEX
+def serialize_file(file_):
+    """The search document for ``file_``, or None if it should not be in the index."""
     target = file_.target
 
-    if not file_.should_update_search or delete:
-        client().delete(
-            index=index,
-            doc_type='file',
-            id=file_._id,
-            refresh=True,
-            ignore=[404]
-        )
-        return
+    if not file_.should_update_search:
+        return None
 
     # We build URLs manually here so that this function can be
     # run outside of a Flask request context (e.g. in a celery task)
@@ -721,13 +863,54 @@ def update_file(file_, index=None, delete=False):
         'extra_search_terms': clean_splitters(file_.name),
     }
 
-    client().index(
-        index=index,
-        doc_type='file',
-        body=file_doc,
-        id=file_._id,
-        refresh=True
-    )
+    return file_doc
+
+
+@requires_search
+def update_file(file_, index=None, delete=False):
+    index = index or INDEX
+    file_doc = None if delete else serialize_file(file_)
+
+    if file_doc is None:
+        forget_indexed(index, 'file', file_._id)
+        client().delete(
+            index=index,
+            doc_type='file',
+            id=file_._id,
+            refresh=True,
+            ignore=[404]
+        )
+        return
+
+    index_document(index, 'file', file_._id, file_doc)
+
+
+@requires_search
+def bulk_update_files(files, index=None, refresh=False):
+    """Index or remove ``files`` with streaming bulk requests instead of one request per file.
+    Each file is also sent to SHARE, as BaseFileNode.update_search does.
+    Raises BulkUpdateError once the files are sent if any of them failed to index.
+    """
+    from api.share.utils import update_share
+    index = index or INDEX
+
+    def serialize(file_):
+        update_share(file_)
+        return serialize_file(file_)
+
+    def actions():
+        for file_, file_doc in serialize_in_chunks(serialize, files, workers=1):
+            if file_doc is None:
+                forget_indexed(index, 'file', file_._id)
+                yield {'_op_type': 'delete', '_index': index, '_type': 'file', '_id': file_._id}
+            elif not is_recently_indexed(index, 'file', file_._id, file_doc):
+                yield {'_op_type': 'index', '_index': index, '_type': 'file', '_id': file_._id, '_source': file_doc}
+
+    success, errors = stream_bulk(actions(), refresh=refresh, raise_on_error=False, ignore_statuses=(404,))
+    if errors:
+        logger.error('Failed to index %d of %d files: %s', len(errors), success + len(errors), errors)
+        raise exceptions.BulkUpdateError(errors)
+    return success, errors
 
 @requires_search
 def update_institution(institution, index=None):
@@ -788,6 +971,7 @@ def delete_all():
 
 @requires_search
 def delete_index(index):
+    forget_index(index)
     client().indices.delete(index, ignore=[404])
 
 
@@ -879,11 +1063,13 @@ def delete_doc(elastic_document_id, node, index=None, category=None):
             category = 'registration'
         else:
             category = node.project_or_component
+    forget_indexed(index, category, elastic_document_id)
     client().delete(index=index, doc_type=category, id=elastic_document_id, refresh=True, ignore=[404])
 
 @requires_search
 def delete_group_doc(deleted_id, index=None):
     index = index or INDEX
+    forget_indexed(index, 'group', deleted_id)
     client().delete(index=index, doc_type='group', id=deleted_id, refresh=True, ignore=[404])
 
 @requires_search
@@ -918,21 +1104,30 @@ def search_contributor(query, page=0, size=10, exclude=None, current_user=None):
     pages = math.ceil(results['counts'].get('user', 0) / size)
     validate_page_num(page, pages)
 
+    # Load every hit and count projects in common for the whole page at once
+    users_by_id = {
+        user._id: user
+        for user in OSFUser.objects.filter(guids___id__in=[doc['id'] for doc in docs])
+    }
+    if current_user:
+        n_projects_by_pk = current_user.n_projects_in_common_by_user(users_by_id.values())
+
     users = []
     for doc in docs:
         # TODO: use utils.serialize_user
-        user = OSFUser.load(doc['id'])
+        user = users_by_id.get(doc['id'])
+
+        if user is None:
+            logger.error(f"Could not load user {doc['id']}")
+            continue
 
         if current_user and current_user._id == user._id:
             n_projects_in_common = -1
         elif current_user:
-            n_projects_in_common = current_user.n_projects_in_common(user)
+            n_projects_in_common = n_projects_by_pk.get(user.pk, 0)
         else:
             n_projects_in_common = 0
 
-        if user is None:
-            logger.error(f"Could not load user {doc['id']}")
-            continue
         if user.is_active:  # exclude merged, unregistered, etc.
             current_employment = None
             education = None
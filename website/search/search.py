@@ -79,9 +79,9 @@ def update_group(group, index=None, bulk=False, async_update=True, saved_fields=
         return search_engine.update_group(group, **kwargs)
 
 @requires_search
-def bulk_update_nodes(serialize, nodes, index=None, category=None):
+def bulk_update_nodes(serialize, nodes, index=None, category=None, refresh=False, workers=None):
     index = index or settings.ELASTIC_INDEX
-    search_engine.bulk_update_nodes(serialize, nodes, index=index, category=category)
+    return search_engine.bulk_update_nodes(serialize, nodes, index=index, category=category, refresh=refresh, workers=workers)
 
 @requires_search
 def delete_node(node, index=None):
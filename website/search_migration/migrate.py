@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """Migration script for Search-enabled Models."""
 from math import ceil
-import functools
 import logging
 
 from django.db import connection
@@ -19,7 +18,7 @@ from osf.models import OSFUser, Institution, AbstractNode, BaseFileNode, Preprin
 from website import settings
 from website.app import init_app
 from website.search.elastic_search import client as es_client
-from website.search.elastic_search import bulk_update_collection_submission
+from website.search.elastic_search import bulk_update_collection_submission, serialize_file
 from website.search.search import update_institution, bulk_update_collection_submissions
 
 
@@ -102,12 +101,9 @@ def migrate_preprints(index, delete):
 def migrate_preprint_files(index, delete):
     logger.info(f'Migrating preprint files to index: {index}')
     valid_preprints = Preprint.objects.all()
-    valid_preprint_files = BaseFileNode.objects.filter(preprint__in=valid_preprints)
-    paginator = Paginator(valid_preprint_files, 500)
-    serialize = functools.partial(search.update_file, index=index)
-    for page_number in paginator.page_range:
-        logger.info(f'Updating page {page_number} / {paginator.num_pages}')
-        search.bulk_update_nodes(serialize, paginator.page(page_number).object_list, index=index, category='file')
+    valid_preprint_files = BaseFileNode.objects.filter(preprint__in=valid_preprints).order_by('id')
+    total_files, errors = search.bulk_update_nodes(serialize_file, valid_preprint_files, index=index, category='file', workers=settings.ELASTIC_SERIALIZE_WORKERS) or (0, [])
+    logger.info(f'{total_files} preprint files migrated ({len(errors)} errors)')
 
 def migrate_files(index, delete, increment=10000):
     logger.info(f'Migrating files to index: {index}')
@@ -117,6 +117,13 @@ ELASTIC8_USERNAME = os.environ.get('ELASTIC8_USERNAME', 'elastic')
 ELASTIC8_SECRET = os.environ.get('ELASTIC8_SECRET')
 ELASTIC_TIMEOUT = 10
 ELASTIC_INDEX = 'website'
+# Documents per bulk request when indexing many objects
+ELASTIC_BULK_CHUNK_SIZE = 500
+# Threads serializing objects for bulk indexing; each holds its own db connection
+ELASTIC_SERIALIZE_WORKERS = 1
+# Skip re-sending a document identical to one sent this many seconds ago (0 disables)
+ELASTIC_DEBOUNCE_SECONDS = 5
+ELASTIC_DEBOUNCE_MAX_DOCUMENTS = 10000
 ELASTIC_KWARGS = {
     # 'use_ssl': False,
     # 'verify_certs': True,
@@ -377,6 +384,12 @@ SHARE_URL = 'https://share.osf.io/'
 SHARE_API_TOKEN = None  # Required to send project updates to SHARE
 
 CAS_SERVER_URL = 'http://localhost:8080'
+# Seconds to reuse a CAS profile lookup for the same bearer token (capped at the token's expiry); 0 to always
+# ask CAS. Only enable with the 'cas_token' cache pointed at a backend shared by every api and web process
+# (e.g. django_redis); with a per-process cache, a revoked token keeps working on the other workers
+CAS_TOKEN_CACHE_TIMEOUT = 0
+# Seconds to remember that CAS rejected a bearer token
+CAS_TOKEN_NEGATIVE_CACHE_TIMEOUT = 10
 MFR_SERVER_URL = 'http://localhost:7778'
 
 ###### ARCHIVER ###########
@@ -760,6 +773,10 @@ WATERBUTLER_JWE_SECRET = 'CirclesAre4Squares'
 WATERBUTLER_JWT_SECRET = 'ILiekTrianglesALot'
 WATERBUTLER_JWT_ALGORITHM = 'HS256'
 WATERBUTLER_JWT_EXPIRATION = 15
+# Seconds to reuse permission decisions and osfstorage settings for WaterButler auth checks; 0 to disable.
+# Only enable with the 'waterbutler_auth' cache pointed at a backend shared by the api and web processes
+# (e.g. django_redis); with a per-process cache, revoked access is only forgotten where it was revoked
+WATERBUTLER_AUTH_CACHE_TIMEOUT = 0
 
 SENSITIVE_DATA_SALT = 'yusaltydough'
 SENSITIVE_DATA_SECRET = 'TrainglesAre5Squares'
@@ -771,11 +788,55 @@ assert (DRAFT_REGISTRATION_APPROVAL_PERIOD > EMBARGO_END_DATE_MIN), 'The draft r
 ENABLE_INSTITUTIONS = True
 
 ENABLE_STORAGE_USAGE_CACHE = True
+# Read storage usage from the per-target osfstorage ledger. Run the reconcile_storage_usage
+# management command after enabling; targets the ledger doesn't track fall back to the cache.
+ENABLE_STORAGE_USAGE_LEDGER = False
+
+# Guid rows kept per process by osf.models.base.guid_resolver; 0 to always query.
+# Other processes only see a guid repointed or deleted here once GUID_RESOLVER_TIMEOUT passes.
+GUID_RESOLVER_MAX_ENTRIES = 0
+# Seconds a resolved guid row is trusted; rows repointed by another process may be stale this long
+GUID_RESOLVER_TIMEOUT = 60
+# Optional Django cache alias to share resolved guid rows between processes
+GUID_RESOLVER_CACHE_NAME = None
+
+# Seconds to reuse serialized metadata records, and gathered metadata, for an item that has not
+# been saved or logged since; changes to related items (e.g. contributor names) may be stale this long.
+# 0 to always gather
+METADATA_CACHE_TIMEOUT = 15 * 60
+# Items whose gathered metadata is kept per process, for reuse across formats and osfmap partitions
+METADATA_GATHER_MEMO_MAX_ENTRIES = 64
+# Threads for running an item's gatherers concurrently (many wait on storage, funder or addon apis).
+# Each thread uses its own db connections, so gathering sees only committed data. 0 to gather serially
+METADATA_GATHER_MAX_WORKERS = 0
+
+# Answer descendant/ancestor/root lookups from the osf_nodeclosure table instead of recursive
+# queries. The table is maintained regardless; run the rebuild_node_closure command before enabling.
+ENABLE_NODE_CLOSURE = False
+
+# Answer implicit (admin on a parent project) read checks from the osf_implicitnoderead index
+# instead of a recursive query. Run the rebuild_implicit_read_index command before enabling.
+ENABLE_IMPLICIT_READ_INDEX = False
+
+# Postcommit tasks run on a pool shared by all requests in a process; each greenlet holds a db connection
+POSTCOMMIT_CONCURRENCY = 30
+# Seconds a request waits for its postcommit tasks before returning
+POSTCOMMIT_TIMEOUT = 5.0
+# Postcommit tasks slower than this many seconds are logged
+POSTCOMMIT_SLOW_TASK_SECONDS = 1.0
 
 ENABLE_VARNISH = False
 ENABLE_ESI = False
 VARNISH_SERVERS = []  # This should be set in local.py or cache invalidation won't work
 ESI_MEDIA_TYPES = {'application/vnd.api+json', 'application/json'}
+# Bans issued within this many seconds of each other in a process are sent together
+VARNISH_BAN_COALESCE_WINDOW = 0.05
+# Maximum number of paths combined into a single regex ban. Combined bans are sent to / with the regex
+# in VARNISH_BAN_PATTERN_HEADER, so only raise this once the deployed VCL honours that header (see
+# tests/test_files/varnish.vcl); a VCL that bans by req.url would flush the whole cache.
+VARNISH_BAN_BATCH_SIZE = 1
+VARNISH_BAN_PATTERN_HEADER = 'X-Ban-Url'
+VARNISH_BAN_TIMEOUT = 0.3  # seconds
 
 # Used for gathering meta information about the current build
 GITHUB_API_TOKEN = None
@@ -2021,6 +2082,9 @@ SITEMAP_TO_S3 = False
 SITEMAP_AWS_BUCKET = None
 SITEMAP_URL_MAX = 25000
 SITEMAP_INDEX_MAX = 50000
+# Ids per sitemap shard; each shard is regenerated only when its urls change
+SITEMAP_SHARD_SIZE = 10000
+SITEMAP_WORKERS = 1
 SITEMAP_STATIC_URLS = [
     OrderedDict([('loc', ''), ('changefreq', 'yearly'), ('priority', '0.5')]),
     OrderedDict([('loc', 'preprints'), ('changefreq', 'yearly'), ('priority', '0.5')]),